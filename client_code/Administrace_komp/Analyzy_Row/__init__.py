@@ -27,6 +27,6 @@ class Analyzy_Row(Analyzy_RowTemplate):
         Utils.zapsat_info(f"Kliknutí na zoom pro analýzu: {analyza_id}")
         
         # Nastavení aktivní analýzy ve správci stavu
-        self.spravce.nastav_aktivni_analyzu(analyza_id, False)
+        self.spravce.nastav_aktivni_analyzu(analyza_id, False, self.item.get('hash_dat'))
         
-        self.parent.raise_event('x-zobraz-vystup', analyza_id=analyza_id)
\ No newline at end of file
+        self.parent.raise_event('x-zobraz-vystup', analyza_id=analyza_id, hash_dat=self.item.get('hash_dat'))
\ No newline at end of file
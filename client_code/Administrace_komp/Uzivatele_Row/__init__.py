@@ -39,17 +39,9 @@ class Uzivatele_Row(Uzivatele_RowTemplate):
             if Utils.zobraz_potvrzovaci_dialog(f"Opravdu chcete odstranit uživatele {email} a všechny jeho analýzy?"):
                 Utils.zapsat_info(f"Mazání uživatele: {email}")
                 
-                # Zavolání serverové funkce pro smazání
-                result = anvil.server.call('smaz_uzivatele', email)
-                
-                if result:
-                    # Vyčistíme zobrazení analýz
-                    self.parent.raise_event('x-vycisti-analyzy')
-                    # Vyvoláme událost pro obnovení seznamu uživatelů
-                    self.parent.raise_event('x-refresh')
-                    
-                    # Informujeme administrátora
-                    alert(f"Uživatel {email} byl úspěšně smazán včetně všech jeho analýz.")
+                # Mazání běží na pozadí, průběh sleduje formulář administrace
+                uloha = anvil.server.call('spust_mazani_uzivatele', email)
+                self.parent.raise_event('x-mazani-spusteno', uloha=uloha, email=email)
                 
         except Exception as e:
             Utils.zapsat_chybu(f"Chyba při mazání uživatele: {str(e)}")
@@ -24,6 +24,11 @@ class Administrace_komp(Administrace_kompTemplate):
         self.repeating_panel_uzvatele.set_event_handler('x-refresh', self.nacti_uzivatele)
         self.repeating_panel_uzvatele.set_event_handler('x-vycisti-analyzy', self.vycisti_analyzy)
         self.repeating_panel_analyzy.set_event_handler('x-zobraz-vystup', self.zobraz_vystup_analyzy)
+        self.repeating_panel_uzvatele.set_event_handler('x-mazani-spusteno', self.sleduj_mazani_uzivatele)
+        
+        # Právě sledované mazání uživatele na pozadí
+        self._uloha_mazani = None
+        self._email_mazani = None
         
         # Inicializace stavu analýz - na začátku není vybrán žádný uživatel
         self.data_grid_analyzy.visible = False
@@ -43,7 +48,8 @@ class Administrace_komp(Administrace_kompTemplate):
                 return
 
             Utils.zapsat_info("Načítám seznam uživatelů")
-            uzivatele = anvil.server.call('nacti_vsechny_uzivatele')
+            # Uživatelé i počty analýz jedním voláním serveru
+            uzivatele = anvil.server.call('nacti_uzivatele_s_poctem_analyz')
             
             if not uzivatele:
                 self.label_zadni_uzivatele.visible = True
@@ -57,12 +63,12 @@ class Administrace_komp(Administrace_kompTemplate):
             # Formátování dat pro repeating panel
             self.repeating_panel_uzvatele.items = [
                 {
-                    'id': u.get_id(),
+                    'id': u['id'],
                     'email': u['email'],
                     'vytvoreni': u['signed_up'].strftime("%d.%m.%Y") if u['signed_up'] else '',
                     'prihlaseni': u['last_login'].strftime("%d.%m.%Y") if u['last_login'] else '',
                     'role': 'admin' if u['role'] == 'admin' else 'uživatel',
-                    'pocet_analyz': anvil.server.call('vrat_pocet_analyz_pro_uzivatele', u)
+                    'pocet_analyz': u['pocet_analyz']
                 } 
                 for u in uzivatele
             ]
@@ -98,7 +104,7 @@ class Administrace_komp(Administrace_kompTemplate):
         
             self.repeating_panel_analyzy.items = [
                 {
-                    'id': a.get_id(),
+                    'id': a['id'],
                     'nazev': a['nazev'],
                     'popis': a['popis'],
                     'datum_vytvoreni': a['datum_vytvoreni'].strftime("%d.%m.%Y") if a['datum_vytvoreni'] else '',
@@ -112,20 +118,21 @@ class Administrace_komp(Administrace_kompTemplate):
             Utils.zapsat_chybu(f"Chyba při načítání analýz: {str(e)}")
             alert(f"Chyba při načítání analýz: {str(e)}")
 
-    def zobraz_vystup_analyzy(self, sender, analyza_id, **event_args):
+    def zobraz_vystup_analyzy(self, sender, analyza_id, hash_dat=None, **event_args):
         """
         Zobrazí výstup zvolené analýzy.
         
         Args:
             sender: Komponenta, která událost vyvolala
             analyza_id: ID zvolené analýzy
+            hash_dat: Hash dat analýzy ze seznamu analýz
             event_args: Další argumenty události
         """
         try:
             Utils.zapsat_info(f"Zobrazuji výstup analýzy: {analyza_id}")
             
             # Nastavení aktivní analýzy ve správci stavu
-            self.spravce.nastav_aktivni_analyzu(analyza_id, False)
+            self.spravce.nastav_aktivni_analyzu(analyza_id, False, hash_dat)
             
             # Přesměrování na stránku s výstupem analýzy
             from .. import Navigace
@@ -143,6 +150,56 @@ class Administrace_komp(Administrace_kompTemplate):
         self.repeating_panel_analyzy.items = []
         Utils.zapsat_info("Vyčištěno zobrazení analýz")
 
+    def sleduj_mazani_uzivatele(self, uloha, email, **event_args):
+        """
+        Začne sledovat mazání uživatele běžící na pozadí.
+        
+        Args:
+            uloha: Úloha na pozadí ze spust_mazani_uzivatele
+            email: Email mazaného uživatele
+        """
+        self._uloha_mazani = uloha
+        self._email_mazani = email
+        self.vycisti_analyzy()
+        self.label_mazani.text = f"Mažu uživatele {email}..."
+        self.label_mazani.visible = True
+        self.timer_mazani.interval = 1
+
+    def timer_mazani_tick(self, **event_args):
+        """Zobrazí průběh mazání uživatele a po jeho dokončení obnoví seznam."""
+        if not self._uloha_mazani:
+            self.timer_mazani.interval = 0
+            return
+        
+        try:
+            stav = self._uloha_mazani.get_state() or {}
+            ukonceni = self._uloha_mazani.get_termination_status()
+            
+            if ukonceni is None:
+                if 'celkem' in stav:
+                    self.label_mazani.text = (f"Mažu uživatele {self._email_mazani}: "
+                                              f"smazáno {stav.get('smazano', 0)} z {stav['celkem']} analýz")
+                return
+            
+            # Úloha skončila - přestaneme ji sledovat
+            self.timer_mazani.interval = 0
+            self._uloha_mazani = None
+            self.label_mazani.visible = False
+            self.nacti_uzivatele()
+            
+            if ukonceni == 'completed':
+                alert(f"Uživatel {self._email_mazani} byl úspěšně smazán včetně všech jeho analýz.")
+            else:
+                Utils.zapsat_chybu(f"Mazání uživatele {self._email_mazani} skončilo stavem {ukonceni}")
+                alert(f"Mazání uživatele {self._email_mazani} se nepodařilo dokončit. "
+                      "Již smazané analýzy zůstanou smazány, mazání lze spustit znovu.")
+                
+        except Exception as e:
+            self.timer_mazani.interval = 0
+            self._uloha_mazani = None
+            Utils.zapsat_chybu(f"Chyba při sledování mazání uživatele: {str(e)}")
+            alert(f"Chyba při sledování mazání uživatele: {str(e)}")
+
     def button_pridat_uzivatele_click(self, **event_args):
         """Handler pro tlačítko přidání nového uživatele."""     
         pridej_form = Pridej_uzivatele_form()
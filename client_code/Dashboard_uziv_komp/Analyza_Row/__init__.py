@@ -6,7 +6,7 @@ import anvil.users
 import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
-from ... import Navigace, Spravce_stavu, Utils
+from ... import Navigace, Registr_metod, Spravce_stavu, Utils
 
 
 class Analyza_Row(Analyza_RowTemplate):
@@ -61,7 +61,7 @@ class Analyza_Row(Analyza_RowTemplate):
         """
         try:
             # Nastavíme ID aktivní analýzy
-            self.spravce.nastav_aktivni_analyzu(self.item['id'], False)
+            self.spravce.nastav_aktivni_analyzu(self.item['id'], False, self.item.get('hash_dat'))
             
             # Zobrazí dialog pro výběr metody analýzy
             self.zobraz_dialog_vyberu_metody()
@@ -75,15 +75,8 @@ class Analyza_Row(Analyza_RowTemplate):
         Zobrazí dialog pro výběr metody analýzy.
         """
         try:
-            # Definice dostupných metod
-            dostupne_metody = [
-                ("Simple Additive Weighting (SAW/WSM)", "saw"),
-                ("Weighted Sum Model (WSM)", "wsm"),
-                ("Weighted Product Model (WPM)", "wpm"),
-                ("TOPSIS (Technique for Order of Preference by Similarity to Ideal Solution)", "topsis"),
-                ("ELECTRE (Elimination Et Choix Traduisant la Réalité)", "electre"),
-                ("MABAC (Multi-Attributive Border Approximation area Comparison)", "mabac")
-            ]
+            # Dostupné metody z registru metod
+            dostupne_metody = Registr_metod.polozky_vyberu()
             
             # Vytvoření komponenty pro výběr
             dropdown = DropDown(items=[m[0] for m in dostupne_metody])
@@ -128,19 +121,10 @@ class Analyza_Row(Analyza_RowTemplate):
         try:
             analyza_id = self.item['id']
             
-            # Přesměrování podle metody
-            if metoda_kod == "saw":
-                Navigace.go('vystup_saw', analyza_id=analyza_id)
-            elif metoda_kod == "wsm":
-                Navigace.go('vystup_wsm', analyza_id=analyza_id)
-            elif metoda_kod == "wpm":
-                Navigace.go('vystup_wpm', analyza_id=analyza_id)
-            elif metoda_kod == "topsis":
-                Navigace.go('vystup_topsis', analyza_id=analyza_id)
-            elif metoda_kod == "electre":
-                Navigace.go('vystup_electre', analyza_id=analyza_id)
-            elif metoda_kod == "mabac":
-                Navigace.go('vystup_mabac', analyza_id=analyza_id)
+            # Přesměrování na výstupní stránku metody podle registru metod
+            metoda = Registr_metod.METODY.get(metoda_kod)
+            if metoda:
+                Navigace.go(metoda['stranka'], analyza_id=analyza_id)
             else:
                 alert(f"Metoda '{metoda_kod}' ještě není implementována")
                 
@@ -6,7 +6,7 @@ import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
 import anvil.users
-from .. import Navigace, Spravce_stavu, Utils
+from .. import Konstanty, Navigace, Spravce_stavu, Utils
 
 
 class Dashboard_uziv_komp(Dashboard_uziv_kompTemplate):
@@ -15,6 +15,9 @@ class Dashboard_uziv_komp(Dashboard_uziv_kompTemplate):
         # Inicializace správce stavu
         self.spravce = Spravce_stavu.Spravce_stavu()
         
+        # Kurzor další stránky seznamu analýz (None = žádná další stránka)
+        self._kurzor = None
+        
         # Nastavení handleru pro aktualizaci seznamu analýz
         self.repeating_panel_dashboard.set_event_handler('x-refresh', self.nahraj_analyzy)
         
@@ -31,41 +34,89 @@ class Dashboard_uziv_komp(Dashboard_uziv_kompTemplate):
     
     def nahraj_analyzy(self, **event_args):
         """
-        Načte seznam analýz ze serveru a zobrazí je v UI.
+        Načte ze serveru první stránku analýz a zobrazí ji v UI.
         """
         Utils.zapsat_info("Načítám seznam analýz")
+        self._kurzor = None
+        self.repeating_panel_dashboard.items = []
+        self._nacti_stranku()
+
+    def button_nacist_dalsi_click(self, **event_args):
+        """
+        Připojí k seznamu další stránku analýz.
+        """
+        self._nacti_stranku()
+
+    def text_box_hledat_pressed_enter(self, **event_args):
+        """
+        Načte seznam znovu podle hledaného názvu.
+        """
+        self.nahraj_analyzy()
+
+    def _nacti_stranku(self):
+        """
+        Načte ze serveru stránku analýz navazující na aktuální kurzor a připojí ji k seznamu.
+        """
         try:
-            # Načtení analýz z nového serverového modulu
-            analyzy = anvil.server.call('nacti_analyzy_uzivatele')
-            
-            if not analyzy:
-                # Žádné analýzy k zobrazení
-                self.label_no_analyzy.visible = True
-                self.repeating_panel_dashboard.visible = False
-                Utils.zapsat_info("Žádné analýzy nenalezeny")
-                return
-            
-            # Máme analýzy k zobrazení
-            self.label_no_analyzy.visible = False
-            self.repeating_panel_dashboard.visible = True
+            stranka = anvil.server.call(
+                'nacti_stranku_analyz',
+                Konstanty.VELIKOST_STRANKY_ANALYZ,
+                self._kurzor,
+                self.text_box_hledat.text
+            )
+            analyzy = stranka['analyzy']
+            self._kurzor = stranka['kurzor']
+            self.button_nacist_dalsi.visible = self._kurzor is not None
             
             # Formátování dat pro repeating panel
-            self.repeating_panel_dashboard.items = [
+            polozky = list(self.repeating_panel_dashboard.items or []) + [
                 {
                     'id': a['id'],
                     'nazev': a['nazev'],
                     'popis': a.get('popis', ''),
+                    'souhrn': self._souhrn_analyzy(a),
                     'datum_vytvoreni': a['datum_vytvoreni'].strftime("%d.%m.%Y") if a['datum_vytvoreni'] else "",
                     'datum_upravy': a['datum_upravy'].strftime("%d.%m.%Y") if a['datum_upravy'] else ""
                 } for a in analyzy
             ]
             
-            Utils.zapsat_info(f"Načteno {len(analyzy)} analýz")
+            if not polozky:
+                # Žádné analýzy k zobrazení
+                self.label_no_analyzy.text = ("Žádná analýza neodpovídá hledanému názvu."
+                                              if self.text_box_hledat.text else "Zatím nemáte žádné analýzy.")
+                self.label_no_analyzy.visible = True
+                self.repeating_panel_dashboard.visible = False
+                Utils.zapsat_info("Žádné analýzy nenalezeny")
+                return
+            
+            # Máme analýzy k zobrazení
+            self.label_no_analyzy.visible = False
+            self.repeating_panel_dashboard.visible = True
+            self.repeating_panel_dashboard.items = polozky
+            
+            Utils.zapsat_info(f"Načteno {len(analyzy)} analýz (celkem zobrazeno {len(polozky)})")
             
         except Exception as e:
             Utils.zapsat_chybu(f"Chyba při načítání analýz: {str(e)}")
             alert(f"Chyba při načítání analýz: {str(e)}")
 
+    def _souhrn_analyzy(self, analyza):
+        """
+        Sestaví krátký souhrn analýzy ze souhrnných sloupců (bez načtení dat).
+        
+        Args:
+            analyza: Položka seznamu analýz ze serveru
+            
+        Returns:
+            str: Text souhrnu, prázdný u analýz bez doplněného souhrnu
+        """
+        if analyza.get('pocet_variant') is None:
+            return ""
+        souhrn = f"{analyza['pocet_variant']} variant, {analyza['pocet_kriterii']} kritérií"
+        if analyza.get('posledni_vitez'):
+            souhrn += f" | Nejlepší varianta ({analyza['posledni_metoda'].upper()}): {analyza['posledni_vitez']}"
+        return souhrn
+
     def button_pridat_analyzu_click(self, **event_args):
         """
         Přechod na stránku pro přidání nové analýzy.
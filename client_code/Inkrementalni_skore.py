@@ -0,0 +1,162 @@
+# -------------------------------------------------------
+# Modul: Inkrementalni_skore
+#
+# Průběžný přepočet WSM skóre při změně jedné buňky hodnotící matice.
+# Drží statistiky sloupců (min, max, součet, součet čtverců) a dílčí součty
+# jednotlivých variant, takže změna jedné hodnoty stojí O(1), případně O(m),
+# pokud se změní extrém sloupce. Umožňuje živý náhled pořadí ve Wizardu.
+# -------------------------------------------------------
+from . import Vypocty
+
+
+class Inkrementalni_skore:
+    """
+    Inkrementální výpočet WSM skóre nad min-max normalizovanou maticí.
+
+    Normalizovaná vážená hodnota je v každém sloupci lineární funkcí původní hodnoty
+    (a_j * x + b_j), proto skóre varianty = dílčí součet sum_j(a_j * x_ij) + konstanta sum_j(b_j).
+    Změna hodnoty posune jen dílčí součet jedné varianty, změna extrému sloupce
+    změní koeficient a_j a vyžádá si jeden průchod sloupcem.
+    """
+
+    def __init__(self, matice, typy_kriterii, vahy, varianty, kriteria):
+        """
+        Args:
+            matice: 2D list s hodnotami [varianty][kriteria]
+            typy_kriterii: List typů kritérií ("max" nebo "min")
+            vahy: List vah kritérií
+            varianty: List názvů variant
+            kriteria: List názvů kritérií
+        """
+        self._matice = [list(radek) for radek in matice]
+        self._vahy = [float(v) for v in vahy]
+        self._minimalizacni = [t.lower() in ("min", "cost") for t in typy_kriterii]
+        self._varianty = list(varianty)
+        self._index_variant = {nazev: i for i, nazev in enumerate(varianty)}
+        self._index_kriterii = {nazev: j for j, nazev in enumerate(kriteria)}
+        self.prepocitej()
+
+    @classmethod
+    def z_dat_analyzy(cls, analyza_data):
+        """
+        Vytvoří inkrementální výpočet z dat analýzy ve formátu data_json.
+
+        Args:
+            analyza_data: Slovník s klíči 'kriteria' a 'varianty'
+
+        Returns:
+            Inkrementalni_skore: Nová instance
+        """
+        matice, typy_kriterii, varianty, kriteria, vahy = Vypocty.priprav_data_z_json(analyza_data)
+        return cls(matice, typy_kriterii, vahy, varianty, kriteria)
+
+    def prepocitej(self):
+        """Kompletně přepočítá statistiky sloupců a dílčí součty variant."""
+        statistiky = Vypocty.vypocitej_statistiky_sloupcu(self._matice)
+        self._min = statistiky['min']
+        self._max = statistiky['max']
+        self._soucet = statistiky['soucet']
+        self._soucet_ctvercu = statistiky['soucet_ctvercu']
+
+        self._koeficienty = [self._koeficienty_sloupce(j) for j in range(len(self._vahy))]
+        self._konstanta = sum(b for _, b in self._koeficienty)
+        self._dilci_soucty = [
+            sum(self._koeficienty[j][0] * hodnota for j, hodnota in enumerate(radek))
+            for radek in self._matice
+        ]
+
+    def _koeficienty_sloupce(self, j):
+        """
+        Vrátí koeficienty (a_j, b_j) lineárního příspěvku sloupce ke skóre.
+
+        Args:
+            j: Index kritéria
+
+        Returns:
+            tuple: (a_j, b_j)
+        """
+        rozsah = self._max[j] - self._min[j]
+        vaha = self._vahy[j]
+        if rozsah == 0:
+            return 0.0, vaha  # Všechny hodnoty jsou stejné - normalizovaná hodnota 1
+        if self._minimalizacni[j]:
+            return -vaha / rozsah, vaha * self._max[j] / rozsah
+        return vaha / rozsah, -vaha * self._min[j] / rozsah
+
+    def _prepocitej_sloupec(self, j):
+        """Přepočítá extrémy sloupce a posune dílčí součty všech variant - O(m)."""
+        sloupec = [radek[j] for radek in self._matice]
+        self._min[j] = min(sloupec)
+        self._max[j] = max(sloupec)
+
+        stary_a, stary_b = self._koeficienty[j]
+        novy_a, novy_b = self._koeficienty_sloupce(j)
+        self._koeficienty[j] = (novy_a, novy_b)
+        self._konstanta += novy_b - stary_b
+
+        rozdil_a = novy_a - stary_a
+        if rozdil_a != 0:
+            for i, hodnota in enumerate(sloupec):
+                self._dilci_soucty[i] += rozdil_a * hodnota
+
+    def zmen_hodnotu(self, nazev_varianty, nazev_kriteria, hodnota):
+        """
+        Zapíše novou hodnotu buňky a aktualizuje skóre.
+
+        Args:
+            nazev_varianty: Název varianty
+            nazev_kriteria: Název kritéria
+            hodnota: Nová hodnota (neplatná hodnota se počítá jako 0)
+        """
+        i = self._index_variant.get(nazev_varianty)
+        j = self._index_kriterii.get(nazev_kriteria)
+        if i is None or j is None:
+            return
+
+        try:
+            hodnota = float(hodnota)
+        except (ValueError, TypeError):
+            hodnota = 0.0
+
+        stara = self._matice[i][j]
+        if hodnota == stara:
+            return
+        self._matice[i][j] = hodnota
+
+        self._soucet[j] += hodnota - stara
+        self._soucet_ctvercu[j] += hodnota * hodnota - stara * stara
+        self._dilci_soucty[i] += self._koeficienty[j][0] * (hodnota - stara)
+
+        # Extrém sloupce se mohl změnit - jen v tom případě je potřeba projít sloupec
+        if (stara == self._min[j] or stara == self._max[j] or
+                hodnota < self._min[j] or hodnota > self._max[j]):
+            self._prepocitej_sloupec(j)
+
+    def skore(self):
+        """
+        Vrátí aktuální skóre variant v původním pořadí.
+
+        Returns:
+            list: Skóre každé varianty
+        """
+        return [dilci + self._konstanta for dilci in self._dilci_soucty]
+
+    def vysledky(self):
+        """
+        Vrátí aktuální výsledky ve stejném formátu jako Vypocty.wsm_vypocet.
+
+        Returns:
+            dict: Výsledky WSM (results, nejlepší/nejhorší varianta, rozdíl skóre)
+        """
+        skore = self.skore()
+        serazene = sorted(zip(self._varianty, skore), key=lambda x: x[1], reverse=True)
+        results = [(varianta, poradi, hodnota) for poradi, (varianta, hodnota) in enumerate(serazene, 1)]
+
+        return {
+            'results': results,
+            'nejlepsi_varianta': results[0][0],
+            'nejlepsi_skore': results[0][2],
+            'nejhorsi_varianta': results[-1][0],
+            'nejhorsi_skore': results[-1][2],
+            'rozdil_skore': results[0][2] - results[-1][2]
+        }
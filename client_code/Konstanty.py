@@ -1,4 +1,5 @@
 import anvil.server
+from . import Registr_metod
 # -------------------------------------------------------
 # Modul: konstanty
 # Obsahuje sdílené konstanty používané napříč aplikací
@@ -18,11 +19,8 @@ STAV_ANALYZY = {
     'ULOZENY': 'saved'
 }
 
-# Metody analýzy
-METODA_ANALYZY = {
-    'SAW': 'SAW',
-    'AHP': 'AHP'
-}
+# Metody analýzy - odvozeno z registru metod (Registr_metod.METODY)
+METODA_ANALYZY = {kod.upper(): metoda['zkratka'] for kod, metoda in Registr_metod.METODY.items()}
 
 # Typy kritérií
 TYP_KRITERIA = {
@@ -30,6 +28,29 @@ TYP_KRITERIA = {
     'MINIMALIZACNI': 'min'
 }
 
+# Dílčí úpravy dat analýzy pro server (CRUD_analyzy.uprav_analyzu_zmenami)
+OPERACE_UPRAVY = {
+    'NASTAV_HODNOTU': 'nastav_hodnotu',
+    'PRIDEJ_KRITERIUM': 'pridej_kriterium',
+    'UPRAV_KRITERIUM': 'uprav_kriterium',
+    'ODEBER_KRITERIUM': 'odeber_kriterium',
+    'PRIDEJ_VARIANTU': 'pridej_variantu',
+    'UPRAV_VARIANTU': 'uprav_variantu',
+    'ODEBER_VARIANTU': 'odeber_variantu',
+    'NASTAV_POPIS': 'nastav_popis'
+}
+
+# Zacházení s nekladnými hodnotami u metody WPM (logaritmus vyžaduje kladné hodnoty)
+WPM_NEKLADNE_HODNOTY = {
+    'NAHRADIT': 'nahradit',  # Nekladná hodnota se nahradí malou kladnou hodnotou
+    'POSUNOUT': 'posunout',  # Sloupec s nekladnými hodnotami se posune do kladných čísel
+    'CHYBA': 'chyba'         # Nekladná hodnota vyvolá chybu
+}
+WPM_NAHRADNI_HODNOTA = 0.001
+
+# Počet analýz na jedné stránce přehledu (Sprava_uzivatelu.nacti_stranku_analyz)
+VELIKOST_STRANKY_ANALYZ = 20
+
 # Validační konstanty
 VALIDACE = {
     'MAX_DELKA_NAZEV': 100,
@@ -0,0 +1,271 @@
+# -------------------------------------------------------
+# Modul: Matice_analyzy
+#
+# Kompaktní reprezentace hodnotící matice analýzy. Místo slovníku slovníků
+# z data_json ("varianty" -> {kriterium -> hodnota}) drží názvy variant
+# a kritérií v tuple, mapy název -> index a hodnoty v jednom plochém bufferu
+# (array('d') na serveru, list čísel v prohlížeči) po řádcích variant.
+#
+# Z JSON se převádí jednou (z_json), zpět při ukládání (do_json).
+# Třída je portable_class, takže ji lze předávat mezi klientem a serverem.
+# Přijímají ji výpočty (Vypocty, Vypocetni_jadro.priprav_data_z_json),
+# zobrazení vstupních dat i validace dat analýzy.
+# -------------------------------------------------------
+import anvil
+import anvil.server
+
+if anvil.is_server_side():
+    from array import array
+
+    def _plochy_buffer(hodnoty):
+        """Vytvoří plochý buffer hodnot typu double."""
+        return array('d', hodnoty)
+else:
+    # Skulpt nemá úsporné pole, čísla v listu jsou přímo čísla JavaScriptu
+    def _plochy_buffer(hodnoty):
+        """Vytvoří plochý buffer hodnot jako list čísel."""
+        return [float(h) for h in hodnoty]
+
+
+@anvil.server.portable_class
+class Matice_analyzy:
+    """
+    Hodnotící matice analýzy s kritérii, vahami a popisy variant.
+
+    Hodnota varianty i v kritériu j leží v hodnoty[i * pocet_kriterii + j].
+    Chybějící nebo neplatné hodnoty se ukládají jako 0 (stejně jako při
+    výpočtech z data_json) a jejich pozice si matice pamatuje v množině,
+    navenek seřazené jako 'chybejici'.
+    """
+    __slots__ = ('popis_analyzy', 'kriteria', 'typy_kriterii', 'vahy', 'varianty',
+                 'popisy_variant', 'hodnoty', '_chybejici', '_index_kriterii', '_index_variant')
+
+    def __init__(self, kriteria, typy_kriterii, vahy, varianty, hodnoty=None,
+                 popisy_variant=None, popis_analyzy="", chybejici=()):
+        """
+        Args:
+            kriteria: Názvy kritérií
+            typy_kriterii: Typy kritérií ("max" nebo "min")
+            vahy: Váhy kritérií
+            varianty: Názvy variant
+            hodnoty: Plochý seznam hodnot po řádcích variant (výchozí samé nuly)
+            popisy_variant: Popisy variant ve stejném pořadí (volitelné)
+            popis_analyzy: Popis analýzy
+            chybejici: Dvojice (i, j) hodnot, které ve vstupních datech chyběly
+        """
+        self.popis_analyzy = popis_analyzy
+        self.kriteria = tuple(kriteria)
+        self.typy_kriterii = tuple(typy_kriterii)
+        self.vahy = tuple(float(v) for v in vahy)
+        self.varianty = tuple(varianty)
+        self.popisy_variant = tuple(popisy_variant) if popisy_variant is not None else ("",) * len(self.varianty)
+        velikost = len(self.varianty) * len(self.kriteria)
+        self.hodnoty = _plochy_buffer(hodnoty if hodnoty is not None else [0.0] * velikost)
+        if len(self.hodnoty) != velikost:
+            raise ValueError("Počet hodnot neodpovídá počtu variant a kritérií.")
+        self._chybejici = {tuple(pozice) for pozice in chybejici}
+        self._index_kriterii = {nazev: j for j, nazev in enumerate(self.kriteria)}
+        self._index_variant = {nazev: i for i, nazev in enumerate(self.varianty)}
+
+    @classmethod
+    def z_json(cls, analyza_data):
+        """
+        Převede data analýzy ve formátu data_json na matici.
+
+        Args:
+            analyza_data: Slovník s klíči 'kriteria' a 'varianty' nebo už hotová matice
+
+        Returns:
+            Matice_analyzy: Matice analýzy (u matice na vstupu ta samá instance)
+        """
+        if isinstance(analyza_data, Matice_analyzy):
+            return analyza_data
+        return cls(*cls._argumenty_z_json(analyza_data))
+
+    @staticmethod
+    def _argumenty_z_json(analyza_data):
+        """Vrátí argumenty konstruktoru pro data ve formátu data_json."""
+        kriteria_dict = analyza_data.get('kriteria', {})
+        kriteria = list(kriteria_dict.keys())
+        typy_kriterii = [kriteria_dict[k]['typ'] for k in kriteria]
+        vahy = [float(kriteria_dict[k]['vaha']) for k in kriteria]
+
+        varianty_dict = analyza_data.get('varianty', {})
+        hodnoty = []
+        popisy_variant = []
+        chybejici = []
+        for i, var_data in enumerate(varianty_dict.values()):
+            popisy_variant.append(var_data.get('popis_varianty', ""))
+            for j, krit_nazev in enumerate(kriteria):
+                # Chybějící nebo neplatná hodnota je 0, pozici si zapamatujeme pro validaci
+                try:
+                    hodnoty.append(float(var_data[krit_nazev]))
+                except (KeyError, ValueError, TypeError):
+                    hodnoty.append(0.0)
+                    chybejici.append((i, j))
+
+        return (kriteria, typy_kriterii, vahy, list(varianty_dict.keys()), hodnoty,
+                popisy_variant, analyza_data.get('popis_analyzy', ""), chybejici)
+
+    def do_json(self):
+        """
+        Převede matici zpět na data analýzy ve formátu data_json.
+
+        Returns:
+            dict: Slovník s klíči 'popis_analyzy', 'kriteria' a 'varianty'
+        """
+        varianty = {}
+        for i, nazev_var in enumerate(self.varianty):
+            # Chybějící hodnoty se neukládají, aby je validace i Wizard dál poznaly
+            var_data = {nazev_krit: self.hodnota(i, j) for j, nazev_krit in enumerate(self.kriteria)
+                        if (i, j) not in self._chybejici}
+            var_data['popis_varianty'] = self.popisy_variant[i]
+            varianty[nazev_var] = var_data
+
+        return {
+            'popis_analyzy': self.popis_analyzy,
+            'kriteria': {nazev: {'typ': typ, 'vaha': vaha}
+                         for nazev, typ, vaha in zip(self.kriteria, self.typy_kriterii, self.vahy)},
+            'varianty': varianty
+        }
+
+    def __serialize__(self, global_data):
+        return self.do_json()
+
+    def __deserialize__(self, data, global_data):
+        self.__init__(*Matice_analyzy._argumenty_z_json(data))
+
+    @property
+    def pocet_variant(self):
+        return len(self.varianty)
+
+    @property
+    def pocet_kriterii(self):
+        return len(self.kriteria)
+
+    @property
+    def chybejici(self):
+        """Seřazené dvojice (i, j) chybějících hodnot (pro uložení a validaci)."""
+        return tuple(sorted(self._chybejici))
+
+    def je_chybejici(self, i, j):
+        """Vrátí True, pokud hodnota varianty i v kritériu j ve vstupních datech chyběla."""
+        return (i, j) in self._chybejici
+
+    def index_varianty(self, nazev):
+        """Vrátí index varianty podle názvu (KeyError, pokud neexistuje)."""
+        return self._index_variant[nazev]
+
+    def index_kriteria(self, nazev):
+        """Vrátí index kritéria podle názvu (KeyError, pokud neexistuje)."""
+        return self._index_kriterii[nazev]
+
+    def hodnota(self, i, j):
+        """Vrátí hodnotu varianty i v kritériu j."""
+        return self.hodnoty[i * len(self.kriteria) + j]
+
+    def nastav_hodnotu(self, i, j, hodnota):
+        """Nastaví hodnotu varianty i v kritériu j."""
+        self.hodnoty[i * len(self.kriteria) + j] = float(hodnota)
+        self._chybejici.discard((i, j))
+
+    def radek(self, i):
+        """Vrátí hodnoty varianty i jako list."""
+        n = len(self.kriteria)
+        return list(self.hodnoty[i * n:(i + 1) * n])
+
+    def radky(self):
+        """
+        Vrátí hodnoty jako 2D list [varianty][kriteria] pro výpočty nad listy.
+
+        Returns:
+            list: Seznam řádků variant
+        """
+        return [self.radek(i) for i in range(len(self.varianty))]
+
+    # === Úpravy struktury (používá je uprav_analyzu_zmenami) ===
+
+    def _nastav_kriteria(self, kriteria, typy_kriterii, vahy):
+        """Nastaví kritéria a přestaví mapu názvů na indexy."""
+        self.kriteria = tuple(kriteria)
+        self.typy_kriterii = tuple(typy_kriterii)
+        self.vahy = tuple(float(v) for v in vahy)
+        self._index_kriterii = {nazev: j for j, nazev in enumerate(self.kriteria)}
+
+    def _nastav_varianty(self, varianty, popisy_variant):
+        """Nastaví varianty a přestaví mapu názvů na indexy."""
+        self.varianty = tuple(varianty)
+        self.popisy_variant = tuple(popisy_variant)
+        self._index_variant = {nazev: i for i, nazev in enumerate(self.varianty)}
+
+    def uprav_kriterium(self, j, novy_nazev=None, typ=None, vaha=None):
+        """
+        Přejmenuje kritérium j nebo změní jeho typ či váhu (None = beze změny).
+        """
+        kriteria = list(self.kriteria)
+        typy_kriterii = list(self.typy_kriterii)
+        vahy = list(self.vahy)
+        if novy_nazev is not None:
+            kriteria[j] = novy_nazev
+        if typ is not None:
+            typy_kriterii[j] = typ
+        if vaha is not None:
+            vahy[j] = vaha
+        self._nastav_kriteria(kriteria, typy_kriterii, vahy)
+
+    def pridej_kriterium(self, nazev, typ, vaha):
+        """
+        Přidá kritérium na konec. Jeho hodnoty jsou u všech variant chybějící.
+        """
+        n = len(self.kriteria)
+        hodnoty = []
+        for i in range(len(self.varianty)):
+            hodnoty.extend(self.hodnoty[i * n:(i + 1) * n])
+            hodnoty.append(0.0)
+        self.hodnoty = _plochy_buffer(hodnoty)
+        self._chybejici.update((i, n) for i in range(len(self.varianty)))
+        self._nastav_kriteria(self.kriteria + (nazev,), self.typy_kriterii + (typ,), self.vahy + (vaha,))
+
+    def odeber_kriterium(self, j):
+        """
+        Odebere kritérium j včetně jeho hodnot u všech variant.
+        """
+        n = len(self.kriteria)
+        self.hodnoty = _plochy_buffer(
+            hodnota for k, hodnota in enumerate(self.hodnoty) if k % n != j
+        )
+        self._chybejici = {(i, k if k < j else k - 1) for i, k in self._chybejici if k != j}
+        self._nastav_kriteria(self.kriteria[:j] + self.kriteria[j + 1:],
+                              self.typy_kriterii[:j] + self.typy_kriterii[j + 1:],
+                              self.vahy[:j] + self.vahy[j + 1:])
+
+    def uprav_variantu(self, i, novy_nazev=None, popis_varianty=None):
+        """
+        Přejmenuje variantu i nebo změní její popis (None = beze změny).
+        """
+        varianty = list(self.varianty)
+        popisy_variant = list(self.popisy_variant)
+        if novy_nazev is not None:
+            varianty[i] = novy_nazev
+        if popis_varianty is not None:
+            popisy_variant[i] = popis_varianty
+        self._nastav_varianty(varianty, popisy_variant)
+
+    def pridej_variantu(self, nazev, popis_varianty=""):
+        """
+        Přidá variantu na konec. Její hodnoty jsou ve všech kritériích chybějící.
+        """
+        i = len(self.varianty)
+        self.hodnoty.extend([0.0] * len(self.kriteria))
+        self._chybejici.update((i, j) for j in range(len(self.kriteria)))
+        self._nastav_varianty(self.varianty + (nazev,), self.popisy_variant + (popis_varianty,))
+
+    def odeber_variantu(self, i):
+        """
+        Odebere variantu i včetně jejích hodnot.
+        """
+        n = len(self.kriteria)
+        del self.hodnoty[i * n:(i + 1) * n]
+        self._chybejici = {(k if k < i else k - 1, j) for k, j in self._chybejici if k != i}
+        self._nastav_varianty(self.varianty[:i] + self.varianty[i + 1:],
+                              self.popisy_variant[:i] + self.popisy_variant[i + 1:])
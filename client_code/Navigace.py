@@ -13,7 +13,7 @@ import anvil.server
 import anvil.users
 from anvil import *
 
-from . import Konstanty, Spravce_stavu, Utils
+from . import Konstanty, Registr_metod, Spravce_stavu, Utils
 from .Administrace_komp import Administrace_komp
 from .Wizard_komp import Wizard_komp
 from .Info_komp import Info_komp
@@ -93,44 +93,27 @@ KONFIGURACE_NAVIGACE = {
         'vyzaduje_prihlaseni': True,
         'oznaceni_nav': None,
         'kontrola_rozpracovane': False
-    },
-    'vystup_saw': {
-        'komponenta': Vystup_saw_komp,
-        'vyzaduje_prihlaseni': True,
-        'oznaceni_nav': None,
-        'kontrola_rozpracovane': False
-    },
-    'vystup_wsm': {
-        'komponenta': Vystup_wsm_komp,
-        'vyzaduje_prihlaseni': True,
-        'oznaceni_nav': None,
-        'kontrola_rozpracovane': False
-    },
-    'vystup_wpm': {
-        'komponenta': Vystup_wpm_komp,
-        'vyzaduje_prihlaseni': True,
-        'oznaceni_nav': None,
-        'kontrola_rozpracovane': False
-    },
-    'vystup_topsis': {
-        'komponenta': Vystup_topsis_komp,
-        'vyzaduje_prihlaseni': True,
-        'oznaceni_nav': None,
-        'kontrola_rozpracovane': False
-    },
-    'vystup_electre': {
-        'komponenta': Vystup_electre_komp,
-        'vyzaduje_prihlaseni': True,
-        'oznaceni_nav': None,
-        'kontrola_rozpracovane': False
-    },
-    'vystup_mabac': {
-        'komponenta': Vystup_mabac_komp,
+    }
+}
+
+# Výstupní formuláře metod podle názvu komponenty v registru metod
+KOMPONENTY_VYSTUPU = {
+    'Vystup_saw_komp': Vystup_saw_komp,
+    'Vystup_wsm_komp': Vystup_wsm_komp,
+    'Vystup_wpm_komp': Vystup_wpm_komp,
+    'Vystup_topsis_komp': Vystup_topsis_komp,
+    'Vystup_electre_komp': Vystup_electre_komp,
+    'Vystup_mabac_komp': Vystup_mabac_komp
+}
+
+# Výstupní stránky metod se doplní z registru metod
+for _metoda in Registr_metod.METODY.values():
+    KONFIGURACE_NAVIGACE[_metoda['stranka']] = {
+        'komponenta': KOMPONENTY_VYSTUPU[_metoda['komponenta']],
         'vyzaduje_prihlaseni': True,
         'oznaceni_nav': None,
         'kontrola_rozpracovane': False
     }
-}
 
 def go(stranka, **parametry):
     """
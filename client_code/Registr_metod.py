@@ -0,0 +1,127 @@
+# -------------------------------------------------------
+# Modul: Registr_metod
+#
+# Jediný seznam metod vícekriteriální analýzy, ze kterého vychází výběr metody
+# v Analyza_Row, výstupní stránky v Navigace, Konstanty.METODA_ANALYZY
+# i serverový dávkový výpočet, cache a analýza robustnosti.
+# Modul neobsahuje žádné závislosti, importuje ho klient i server.
+#
+# Každá metoda deklaruje:
+# - nazev, zkratka: Popis pro uživatele
+# - stranka: Klíč výstupní stránky v Navigace.KONFIGURACE_NAVIGACE
+# - komponenta: Název výstupního formuláře
+# - normalizace: Normalizace vstupní matice ('minmax', 'vektorova') nebo None pro původní hodnoty
+# - skore: Kód výpočtu skóre ve Vypocetni_jadro.VYPOCTY_SKORE (metody se stejnou
+#          normalizací a skóre se počítají jen jednou, např. SAW a WSM)
+# - schopnosti: davkovy (skóre po variantách v dávce), inkrementalni (živý přepočet
+#               při změně buňky), surova_matice (pracuje s původními hodnotami),
+#               linearni_ve_vahach (skóre nebo jeho logaritmus je lineární ve vahách)
+#
+# Funkce:
+# - ziskej_metodu: Popis metody podle kódu
+# - metody_se_schopnosti: Kódy metod s danou schopností
+# - polozky_vyberu: Položky pro výběr metody v UI
+# -------------------------------------------------------
+
+# Schopnosti metod
+SCHOPNOST_DAVKOVY = 'davkovy'
+SCHOPNOST_INKREMENTALNI = 'inkrementalni'
+SCHOPNOST_SUROVA_MATICE = 'surova_matice'
+SCHOPNOST_LINEARNI_VE_VAHACH = 'linearni_ve_vahach'
+
+# Pořadí položek určuje pořadí v nabídce metod
+METODY = {
+    'saw': {
+        'nazev': "Simple Additive Weighting (SAW/WSM)",
+        'zkratka': 'SAW',
+        'stranka': 'vystup_saw',
+        'komponenta': 'Vystup_saw_komp',
+        'normalizace': 'minmax',
+        'skore': 'wsm',
+        'schopnosti': (SCHOPNOST_DAVKOVY, SCHOPNOST_INKREMENTALNI, SCHOPNOST_LINEARNI_VE_VAHACH)
+    },
+    'wsm': {
+        'nazev': "Weighted Sum Model (WSM)",
+        'zkratka': 'WSM',
+        'stranka': 'vystup_wsm',
+        'komponenta': 'Vystup_wsm_komp',
+        'normalizace': 'minmax',
+        'skore': 'wsm',
+        'schopnosti': (SCHOPNOST_DAVKOVY, SCHOPNOST_INKREMENTALNI, SCHOPNOST_LINEARNI_VE_VAHACH)
+    },
+    'wpm': {
+        'nazev': "Weighted Product Model (WPM)",
+        'zkratka': 'WPM',
+        'stranka': 'vystup_wpm',
+        'komponenta': 'Vystup_wpm_komp',
+        'normalizace': None,
+        'skore': 'wpm',
+        'schopnosti': (SCHOPNOST_DAVKOVY, SCHOPNOST_SUROVA_MATICE, SCHOPNOST_LINEARNI_VE_VAHACH)
+    },
+    'topsis': {
+        'nazev': "TOPSIS (Technique for Order of Preference by Similarity to Ideal Solution)",
+        'zkratka': 'TOPSIS',
+        'stranka': 'vystup_topsis',
+        'komponenta': 'Vystup_topsis_komp',
+        'normalizace': 'vektorova',
+        'skore': 'topsis',
+        'schopnosti': (SCHOPNOST_DAVKOVY,)
+    },
+    'electre': {
+        'nazev': "ELECTRE (Elimination Et Choix Traduisant la Réalité)",
+        'zkratka': 'ELECTRE',
+        'stranka': 'vystup_electre',
+        'komponenta': 'Vystup_electre_komp',
+        'normalizace': None,
+        'skore': None,  # Párové srovnání variant, počítá modul Electre
+        'schopnosti': (SCHOPNOST_SUROVA_MATICE,)
+    },
+    'mabac': {
+        'nazev': "MABAC (Multi-Attributive Border Approximation area Comparison)",
+        'zkratka': 'MABAC',
+        'stranka': 'vystup_mabac',
+        'komponenta': 'Vystup_mabac_komp',
+        'normalizace': 'minmax',
+        'skore': 'mabac',
+        'schopnosti': (SCHOPNOST_DAVKOVY,)
+    }
+}
+
+def ziskej_metodu(kod):
+    """
+    Vrátí popis metody podle kódu.
+
+    Args:
+        kod: Kód metody (nezáleží na velikosti písmen)
+
+    Returns:
+        dict: Popis metody z METODY
+
+    Raises:
+        ValueError: Pokud metoda není registrována
+    """
+    metoda = METODY.get(str(kod).lower())
+    if metoda is None:
+        raise ValueError(f"Metoda '{kod}' není podporována.")
+    return metoda
+
+def metody_se_schopnosti(schopnost):
+    """
+    Vrátí kódy metod, které mají danou schopnost.
+
+    Args:
+        schopnost: Jedna z konstant SCHOPNOST_*
+
+    Returns:
+        tuple: Kódy metod v pořadí registru
+    """
+    return tuple(kod for kod, metoda in METODY.items() if schopnost in metoda['schopnosti'])
+
+def polozky_vyberu():
+    """
+    Vrátí položky pro výběr metody v uživatelském rozhraní.
+
+    Returns:
+        list: Dvojice (nazev, kod) v pořadí registru
+    """
+    return [(metoda['nazev'], kod) for kod, metoda in METODY.items()]
@@ -4,7 +4,8 @@
 
 import anvil.server
 import anvil.users
-from . import Utils
+from . import Konstanty, Ulohy, Utils
+from .Inkrementalni_skore import Inkrementalni_skore
 
 class Spravce_stavu:
     """
@@ -41,6 +42,16 @@ class Spravce_stavu:
             "varianty": {}
         }
         
+        # Inkrementální výpočet pro živý náhled pořadí (vytváří se až na vyžádání)
+        self._nahled_skore = None
+        
+        # Dílčí změny uložené analýzy od načtení (None = změny se nesledují)
+        self._zmeny = None
+        
+        # Hash dat aktivní analýzy vrácený serverem a výsledky výpočtů pro tento hash
+        self._hash_dat = None
+        self._vysledky = {}
+        
         Utils.zapsat_info("Spravce_stavu inicializován s novou strukturou dat")
     
     # === Metody pro práci s uživatelem ===
@@ -106,16 +117,18 @@ class Spravce_stavu:
     
     # === Metody pro práci s analýzou ===
     
-    def nastav_aktivni_analyzu(self, analyza_id, rezim_upravy=False):
+    def nastav_aktivni_analyzu(self, analyza_id, rezim_upravy=False, hash_dat=None):
         """
         Nastaví ID aktivní analýzy a její režim.
         
         Args:
             analyza_id (str): ID analýzy
             rezim_upravy (bool): Zda je analýza v režimu úprav
+            hash_dat (str): Hash dat analýzy ze seznamu analýz (volitelný)
         """
         self._aktivni_analyza_id = analyza_id
         self._rezim_upravy = rezim_upravy
+        self._nastav_hash_dat(hash_dat)
         Utils.zapsat_info(f"Aktivní analýza nastavena: {analyza_id}, režim úprav: {rezim_upravy}")
     
     def ziskej_aktivni_analyzu(self):
@@ -168,10 +181,32 @@ class Spravce_stavu:
             "kriteria": {},
             "varianty": {}
         }
+        self._nahled_skore = None
+        self._zmeny = None
+        self._nastav_hash_dat(None)
         Utils.zapsat_info("Data analýzy vyčištěna")
     
     # === Metody pro práci s daty analýzy ===
     
+    def zacni_sledovat_zmeny(self):
+        """
+        Začne zaznamenávat změny dat analýzy načtené ze serveru.
+        Uložení pak pošle jen tyto změny (uprav_analyzu_zmenami) místo celých dat.
+        """
+        self._zmeny = []
+    
+    def _zaznamenej_zmenu(self, operace, **udaje):
+        """
+        Zaznamená dílčí změnu dat, pokud se změny sledují.
+        
+        Args:
+            operace (str): Jedna z hodnot Konstanty.OPERACE_UPRAVY
+            **udaje: Údaje operace (viz CRUD_analyzy.proved_zmenu)
+        """
+        if self._zmeny is not None:
+            udaje["operace"] = operace
+            self._zmeny.append(udaje)
+    
     def uloz_zakladni_data_analyzy(self, nazev, popis):
         """
         Uloží základní údaje analýzy.
@@ -180,6 +215,8 @@ class Spravce_stavu:
             nazev (str): Název analýzy
             popis (str): Popis analýzy
         """
+        if popis != self._data_analyzy["popis_analyzy"]:
+            self._zaznamenej_zmenu(Konstanty.OPERACE_UPRAVY['NASTAV_POPIS'], popis_analyzy=popis)
         self._data_analyzy["nazev"] = nazev
         self._data_analyzy["popis_analyzy"] = popis
         Utils.zapsat_info(f"Uložena základní data analýzy: {nazev}")
@@ -193,10 +230,17 @@ class Spravce_stavu:
             typ (str): Typ kritéria (max nebo min)
             vaha (float): Váha kritéria
         """
+        if nazev_kriteria in self._data_analyzy["kriteria"]:
+            self._zaznamenej_zmenu(Konstanty.OPERACE_UPRAVY['UPRAV_KRITERIUM'],
+                                   nazev=nazev_kriteria, typ=typ, vaha=vaha)
+        else:
+            self._zaznamenej_zmenu(Konstanty.OPERACE_UPRAVY['PRIDEJ_KRITERIUM'],
+                                   nazev=nazev_kriteria, typ=typ, vaha=vaha)
         self._data_analyzy["kriteria"][nazev_kriteria] = {
             "typ": typ,
             "vaha": vaha
         }
+        self._nahled_skore = None
         Utils.zapsat_info(f"Přidáno kritérium: {nazev_kriteria}")
     
     def uprav_kriterium(self, stary_nazev, novy_nazev, typ, vaha):
@@ -209,6 +253,10 @@ class Spravce_stavu:
             typ (str): Typ kritéria (max nebo min)
             vaha (float): Váha kritéria
         """
+        self._zaznamenej_zmenu(Konstanty.OPERACE_UPRAVY['UPRAV_KRITERIUM'], nazev=stary_nazev,
+                               novy_nazev=novy_nazev if novy_nazev != stary_nazev else None,
+                               typ=typ, vaha=vaha)
+        
         # Pokud se název nezměnil, jen aktualizujeme
         if stary_nazev == novy_nazev:
             self._data_analyzy["kriteria"][novy_nazev] = {
@@ -230,6 +278,7 @@ class Spravce_stavu:
                     var_data[novy_nazev] = hodnota
                     del var_data[stary_nazev]
         
+        self._nahled_skore = None
         Utils.zapsat_info(f"Upraveno kritérium: {novy_nazev}")
     
     def smaz_kriterium(self, nazev_kriteria):
@@ -240,6 +289,7 @@ class Spravce_stavu:
             nazev_kriteria (str): Název kritéria k odstranění
         """
         if nazev_kriteria in self._data_analyzy["kriteria"]:
+            self._zaznamenej_zmenu(Konstanty.OPERACE_UPRAVY['ODEBER_KRITERIUM'], nazev=nazev_kriteria)
             del self._data_analyzy["kriteria"][nazev_kriteria]
             
             # Odstraníme kritérium i ze všech variant
@@ -247,6 +297,7 @@ class Spravce_stavu:
                 if nazev_kriteria in var_data:
                     del var_data[nazev_kriteria]
                     
+            self._nahled_skore = None
             Utils.zapsat_info(f"Smazáno kritérium: {nazev_kriteria}")
     
     def pridej_variantu(self, nazev_varianty, popis_varianty=""):
@@ -257,8 +308,14 @@ class Spravce_stavu:
             nazev_varianty (str): Název varianty
             popis_varianty (str): Popis varianty
         """
+        # Existující variantu nahrazujeme i s hodnotami, na serveru tedy odebrat a přidat
+        if nazev_varianty in self._data_analyzy["varianty"]:
+            self._zaznamenej_zmenu(Konstanty.OPERACE_UPRAVY['ODEBER_VARIANTU'], nazev=nazev_varianty)
+        self._zaznamenej_zmenu(Konstanty.OPERACE_UPRAVY['PRIDEJ_VARIANTU'],
+                               nazev=nazev_varianty, popis_varianty=popis_varianty)
         varianta = {"popis_varianty": popis_varianty}
         self._data_analyzy["varianty"][nazev_varianty] = varianta
+        self._nahled_skore = None
         Utils.zapsat_info(f"Přidána varianta: {nazev_varianty}")
     
     def uprav_variantu(self, stary_nazev, novy_nazev, popis_varianty):
@@ -272,6 +329,9 @@ class Spravce_stavu:
         """
         # Získáme původní data varianty
         if stary_nazev in self._data_analyzy["varianty"]:
+            self._zaznamenej_zmenu(Konstanty.OPERACE_UPRAVY['UPRAV_VARIANTU'], nazev=stary_nazev,
+                                   novy_nazev=novy_nazev if novy_nazev != stary_nazev else None,
+                                   popis_varianty=popis_varianty)
             var_data = self._data_analyzy["varianty"][stary_nazev].copy()
             
             # Aktualizujeme popis
@@ -285,6 +345,7 @@ class Spravce_stavu:
                 # Jinak jen aktualizujeme
                 self._data_analyzy["varianty"][novy_nazev] = var_data
                 
+            self._nahled_skore = None
             Utils.zapsat_info(f"Upravena varianta: {novy_nazev}")
     
     def smaz_variantu(self, nazev_varianty):
@@ -295,7 +356,9 @@ class Spravce_stavu:
             nazev_varianty (str): Název varianty k odstranění
         """
         if nazev_varianty in self._data_analyzy["varianty"]:
+            self._zaznamenej_zmenu(Konstanty.OPERACE_UPRAVY['ODEBER_VARIANTU'], nazev=nazev_varianty)
             del self._data_analyzy["varianty"][nazev_varianty]
+            self._nahled_skore = None
             Utils.zapsat_info(f"Smazána varianta: {nazev_varianty}")
     
     def uloz_hodnotu_varianty(self, nazev_varianty, nazev_kriteria, hodnota):
@@ -308,9 +371,38 @@ class Spravce_stavu:
             hodnota (float): Hodnota kritéria pro danou variantu
         """
         if nazev_varianty in self._data_analyzy["varianty"]:
+            # Wizard při uložení zapisuje všechny buňky, zaznamenáme jen skutečné změny
+            if self._data_analyzy["varianty"][nazev_varianty].get(nazev_kriteria) != hodnota:
+                self._zaznamenej_zmenu(Konstanty.OPERACE_UPRAVY['NASTAV_HODNOTU'], varianta=nazev_varianty,
+                                       kriterium=nazev_kriteria, hodnota=hodnota)
             self._data_analyzy["varianty"][nazev_varianty][nazev_kriteria] = hodnota
+            
+            # Náhled pořadí aktualizujeme jen o změněnou buňku
+            if self._nahled_skore is not None:
+                self._nahled_skore.zmen_hodnotu(nazev_varianty, nazev_kriteria, hodnota)
             Utils.zapsat_info(f"Uložena hodnota pro variantu {nazev_varianty}, kritérium {nazev_kriteria}: {hodnota}")
     
+    def ziskej_nahled_poradi(self):
+        """
+        Vrátí průběžné WSM pořadí variant pro živý náhled ve Wizardu.
+        Při prvním volání se výpočet sestaví z cache, další změny hodnot
+        přes uloz_hodnotu_varianty ho už jen inkrementálně aktualizují.
+        
+        Returns:
+            dict: Výsledky ve formátu Vypocty.wsm_vypocet nebo None, pokud chybí data
+        """
+        if not self._data_analyzy["kriteria"] or not self._data_analyzy["varianty"]:
+            return None
+        
+        try:
+            if self._nahled_skore is None:
+                self._nahled_skore = Inkrementalni_skore.z_dat_analyzy(self._data_analyzy)
+            return self._nahled_skore.vysledky()
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při výpočtu náhledu pořadí: {str(e)}")
+            self._nahled_skore = None
+            return None
+    
     def ziskej_nazev(self):
         """
         Vrátí název analýzy.
@@ -347,9 +439,68 @@ class Spravce_stavu:
         """
         return self._data_analyzy.get("varianty", {})
     
+    def ziskej_hash_dat(self):
+        """
+        Vrátí hash dat aktivní analýzy, jak ho uložil server.
+        Odpovídá hashi, pod kterým server ukládá výsledky metod do cache.
+        
+        Returns:
+            str: Hash dat nebo None
+        """
+        return self._hash_dat
+    
+    def _nastav_hash_dat(self, hash_dat):
+        """
+        Nastaví hash dat aktivní analýzy. Při změně hashe zahodí zapamatované
+        výsledky, protože patří k předchozím datům.
+        
+        Args:
+            hash_dat (str): Nový hash dat nebo None, pokud není znám
+        """
+        if hash_dat != self._hash_dat or hash_dat is None:
+            self._vysledky = {}
+        self._hash_dat = hash_dat
+    
+    def ziskej_vysledky(self, analyza_id, typ_ulohy, parametry=None, pri_prubehu=None):
+        """
+        Vrátí výsledek výpočtu analýzy (Ulohy.vypocitej). U aktivní analýzy
+        se známým hashem dat si výsledek pamatuje, takže přepínání mezi
+        výstupy metod nevolá server znovu, dokud se data nezmění.
+        
+        Args:
+            analyza_id (str): ID analýzy
+            typ_ulohy (str): Typ úlohy pro Ulohy.vypocitej
+            parametry (dict): Parametry výpočtu (volitelné)
+            pri_prubehu: Volitelná funkce volaná s průběhem úlohy
+            
+        Returns:
+            Výsledek výpočtu
+        """
+        if analyza_id != self._aktivni_analyza_id or self._hash_dat is None:
+            return Ulohy.vypocitej(typ_ulohy, analyza_id, parametry, pri_prubehu)
+        
+        klic = (typ_ulohy, repr(sorted((parametry or {}).items())))
+        if klic not in self._vysledky:
+            self._vysledky[klic] = Ulohy.vypocitej(typ_ulohy, analyza_id, parametry, pri_prubehu)
+        return self._vysledky[klic]
+    
+    def _data_k_ulozeni(self):
+        """
+        Vrátí data analýzy ve formátu data_json pro uložení na server.
+        
+        Returns:
+            dict: Slovník s popisem, kritérii a variantami
+        """
+        return {
+            "popis_analyzy": self._data_analyzy.get("popis_analyzy", ""),
+            "kriteria": self._data_analyzy.get("kriteria", {}),
+            "varianty": self._data_analyzy.get("varianty", {})
+        }
+    
     def uloz_analyzu_na_server(self):
         """
-        Uloží kompletní analýzu na server.
+        Uloží analýzu na server. U analýzy načtené ze serveru se sledovanými
+        změnami posílá jen seznam změn, jinak kompletní data.
         
         Returns:
             bool: True pokud uložení proběhlo úspěšně, jinak False
@@ -359,31 +510,32 @@ class Spravce_stavu:
             je_nova = not self._aktivni_analyza_id or self._aktivni_analyza_id == "temp_id"
             
             if je_nova:
-                # Vytvoření nové analýzy
-                analyza_id = anvil.server.call('vytvor_analyzu', 
-                                               self._data_analyzy.get("nazev", ""), 
-                                               self._data_analyzy.get("popis_analyzy", ""))
+                # Vytvoření nové analýzy i s daty jedním voláním serveru
+                vysledek = anvil.server.call('vytvor_analyzu_s_daty',
+                                             self._data_analyzy.get("nazev", ""),
+                                             self._data_k_ulozeni())
                 
-                if not analyza_id:
-                    Utils.zapsat_chybu("Nepodařilo se vytvořit novou analýzu")
-                    return False
-                    
-                # Uložení ID do správce stavu
-                self._aktivni_analyza_id = analyza_id
-                Utils.zapsat_info(f"Vytvořena nová analýza s ID: {analyza_id}")
+                # Uložení ID a hashe dat do správce stavu
+                self._aktivni_analyza_id = vysledek['id']
+                self._nastav_hash_dat(vysledek['hash_dat'])
+                Utils.zapsat_info(f"Vytvořena nová analýza s ID: {vysledek['id']}")
+                return True
             
-            # Příprava dat pro uložení/aktualizaci
-            data = {
-                "popis_analyzy": self._data_analyzy.get("popis_analyzy", ""),
-                "kriteria": self._data_analyzy.get("kriteria", {}),
-                "varianty": self._data_analyzy.get("varianty", {})
-            }
+            if self._zmeny is not None:
+                # Dílčí uložení - jen změny od načtení analýzy
+                self._nastav_hash_dat(anvil.server.call('uprav_analyzu_zmenami',
+                                                        self._aktivni_analyza_id,
+                                                        self._zmeny,
+                                                        self._data_analyzy.get("nazev", "")))
+                self._zmeny = []
+                Utils.zapsat_info(f"Změny analýzy úspěšně uloženy: {self._aktivni_analyza_id}")
+                return True
             
-            # Uložení/aktualizace dat analýzy
-            anvil.server.call('uprav_analyzu', 
-                              self._aktivni_analyza_id,
-                              self._data_analyzy.get("nazev", ""),
-                              data)
+            # Aktualizace kompletních dat analýzy
+            self._nastav_hash_dat(anvil.server.call('uprav_analyzu',
+                                                    self._aktivni_analyza_id,
+                                                    self._data_analyzy.get("nazev", ""),
+                                                    self._data_k_ulozeni()))
             
             Utils.zapsat_info(f"Analýza úspěšně uložena: {self._aktivni_analyza_id}")
             return True
@@ -0,0 +1,63 @@
+# -------------------------------------------------------
+# Modul: Ulohy
+#
+# Výpočty analýzy na serveru jako úlohy na pozadí (serverový modul Ulohy_vypoctu).
+# Klient úlohu spustí a v intervalu INTERVAL_DOTAZU se ptá na její stav,
+# takže ani velký výpočet nenarazí na časový limit požadavku.
+#
+# Funkce:
+# - vypocitej: Spuštění úlohy a čekání na její výsledek
+# - popis_prubehu: Text průběhu úlohy pro zobrazení
+# -------------------------------------------------------
+import time
+import anvil.server
+
+# Interval dotazů na stav úlohy v sekundách
+INTERVAL_DOTAZU = 1
+
+
+def vypocitej(typ_ulohy, analyza_id, parametry=None, pri_prubehu=None):
+    """
+    Spustí výpočet na serveru a počká na jeho výsledek.
+
+    Args:
+        typ_ulohy: Typ úlohy ('wsm', 'topsis', 'mabac', 'electre', 'robustnost', 'vysledky_metod')
+        analyza_id: ID analýzy
+        parametry: Parametry výpočtu (volitelné)
+        pri_prubehu: Volitelná funkce volaná s průběhem úlohy při každém dotazu
+
+    Returns:
+        Výsledek výpočtu
+
+    Raises:
+        Exception: Pokud výpočet na serveru skončil chybou
+    """
+    stav = anvil.server.call('spust_ulohu_vypoctu', typ_ulohy, analyza_id, parametry)
+    id_ulohy = stav.get('id')
+
+    while stav['stav'] == 'bezi':
+        if pri_prubehu:
+            pri_prubehu(stav.get('prubeh', {}))
+        time.sleep(INTERVAL_DOTAZU)
+        # Dotaz bez indikátoru načítání, průběh zobrazuje formulář
+        stav = anvil.server.call_s('stav_ulohy_vypoctu', id_ulohy)
+
+    if stav['stav'] == 'chyba':
+        raise Exception(stav['chyba'])
+    return stav['vysledek']
+
+def popis_prubehu(prubeh):
+    """
+    Vrátí text průběhu úlohy.
+
+    Args:
+        prubeh: Průběh ze stav_ulohy_vypoctu (faze, případně zpracovano a celkem)
+
+    Returns:
+        str: Text pro zobrazení ve formuláři
+    """
+    if prubeh.get('celkem'):
+        return f"Probíhá výpočet na serveru: {100 * prubeh.get('zpracovano', 0) // prubeh['celkem']} %"
+    if prubeh.get('faze') == 'vypocet':
+        return "Probíhá výpočet na serveru..."
+    return "Výpočet čeká na spuštění..."
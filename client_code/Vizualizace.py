@@ -58,7 +58,8 @@ def vytvor_sloupovy_graf_vysledku(results, nejlepsi_varianta, nejhorsi_varianta,
                 },
                 'yaxis': {
                     'title': 'Skóre',
-                    'range': [0, max(skore) * 1.1] if skore else [0, 1]  # Trochu místa nad sloupci pro hodnoty
+                    # Trochu místa nad sloupci pro hodnoty, záporná skóre (ELECTRE, MABAC) pod osou
+                    'range': [min(0, min(skore)) * 1.1, max(0, max(skore)) * 1.1 or 1] if skore else [0, 1]
                 },
                 'showlegend': False,
                 'margin': {'t': 50, 'b': 100}  # Větší okraje pro popisky
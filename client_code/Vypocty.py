@@ -1,13 +1,60 @@
 # client_code/Vypocty.py - modul pro sdílené výpočty
 
+import math
 import anvil.server
 import anvil.users
 import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
 
+from . import Konstanty
+from .Matice_analyzy import Matice_analyzy
 
-def normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria):
+
+def vypocitej_statistiky_sloupcu(matice):
+    """
+    Spočítá statistiky každého sloupce (kritéria) matice jedním průchodem.
+    Výsledek sdílí všechny normalizační funkce, aby se sloupce neprocházely opakovaně.
+    
+    Args:
+        matice: 2D list s hodnotami [varianty][kriteria]
+    
+    Returns:
+        dict: Slovník se seznamy 'min', 'max', 'rozsah', 'soucet' a 'soucet_ctvercu'
+              (jedna hodnota pro každé kritérium)
+    """
+    if not matice:
+        return {'min': [], 'max': [], 'rozsah': [], 'soucet': [], 'soucet_ctvercu': []}
+    
+    pocet_kriterii = len(matice[0])
+    min_vals = list(matice[0])
+    max_vals = list(matice[0])
+    soucty = [0.0] * pocet_kriterii
+    soucty_ctvercu = [0.0] * pocet_kriterii
+    
+    for radek in matice:
+        for j in range(pocet_kriterii):
+            hodnota = radek[j]
+            if hodnota < min_vals[j]:
+                min_vals[j] = hodnota
+            elif hodnota > max_vals[j]:
+                max_vals[j] = hodnota
+            soucty[j] += hodnota
+            soucty_ctvercu[j] += hodnota * hodnota
+    
+    return {
+        'min': min_vals,
+        'max': max_vals,
+        'rozsah': [max_vals[j] - min_vals[j] for j in range(pocet_kriterii)],
+        'soucet': soucty,
+        'soucet_ctvercu': soucty_ctvercu
+    }
+
+def _je_minimalizacni(typ_kriteria):
+    """Vrátí True, pokud se kritérium minimalizuje ("min" nebo "cost")."""
+    return typ_kriteria.lower() in ("min", "cost")
+
+def normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria, statistiky=None):
     """
     Provede min-max normalizaci hodnot matice.
     
@@ -16,27 +63,29 @@ def normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria):
         typy_kriterii: List typů kritérií ("max" nebo "min")
         varianty: List názvů variant
         kriteria: List názvů kritérií
+        statistiky: Předem spočtené statistiky sloupců (volitelné)
     
     Returns:
         dict: Slovník obsahující normalizovanou matici a metadata
     """
+    if statistiky is None:
+        statistiky = vypocitej_statistiky_sloupcu(matice)
+    min_vals = statistiky['min']
+    max_vals = statistiky['max']
+    rozsahy = statistiky['rozsah']
+    minimalizacni = [_je_minimalizacni(t) for t in typy_kriterii]
+    
     norm_matice = []
-    for i in range(len(matice)):
+    for radek in matice:
         norm_radek = []
-        for j in range(len(matice[0])):
-            sloupec = [row[j] for row in matice]
-            min_val = min(sloupec)
-            max_val = max(sloupec)
-            
-            if max_val == min_val:
+        for j, hodnota in enumerate(radek):
+            if rozsahy[j] == 0:
                 norm_hodnota = 1.0  # Všechny hodnoty jsou stejné
-            else:
+            elif minimalizacni[j]:
                 # Pro MIN kritéria obrátíme normalizaci
-                if typy_kriterii[j].lower() in ("min", "cost"):
-                    norm_hodnota = (max_val - matice[i][j]) / (max_val - min_val)
-                else:
-                    norm_hodnota = (matice[i][j] - min_val) / (max_val - min_val)
-                
+                norm_hodnota = (max_vals[j] - hodnota) / rozsahy[j]
+            else:
+                norm_hodnota = (hodnota - min_vals[j]) / rozsahy[j]
             norm_radek.append(norm_hodnota)
         norm_matice.append(norm_radek)
     
@@ -46,6 +95,104 @@ def normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria):
         'normalizovana_matice': norm_matice
     }
 
+def normalizuj_matici_vektorove(matice, typy_kriterii, varianty, kriteria, statistiky=None):
+    """
+    Provede vektorovou (euklidovskou) normalizaci: hodnota / sqrt(součet čtverců sloupce).
+    Směr kritérií se nemění, zohledňuje ho až metoda (např. ideál u TOPSIS).
+    
+    Args:
+        matice: 2D list s hodnotami [varianty][kriteria]
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        statistiky: Předem spočtené statistiky sloupců (volitelné)
+    
+    Returns:
+        dict: Slovník obsahující normalizovanou matici a metadata
+    """
+    if statistiky is None:
+        statistiky = vypocitej_statistiky_sloupcu(matice)
+    normy = [s ** 0.5 for s in statistiky['soucet_ctvercu']]
+    
+    norm_matice = []
+    for radek in matice:
+        norm_matice.append([hodnota / normy[j] if normy[j] != 0 else 0.0
+                            for j, hodnota in enumerate(radek)])
+    
+    return {
+        'nazvy_variant': varianty,
+        'nazvy_kriterii': kriteria,
+        'normalizovana_matice': norm_matice
+    }
+
+def normalizuj_matici_max(matice, typy_kriterii, varianty, kriteria, statistiky=None):
+    """
+    Provede lineární normalizaci maximem.
+    Pro MAX kritéria hodnota / maximum, pro MIN kritéria minimum / hodnota.
+    
+    Args:
+        matice: 2D list s hodnotami [varianty][kriteria]
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        statistiky: Předem spočtené statistiky sloupců (volitelné)
+    
+    Returns:
+        dict: Slovník obsahující normalizovanou matici a metadata
+    """
+    if statistiky is None:
+        statistiky = vypocitej_statistiky_sloupcu(matice)
+    min_vals = statistiky['min']
+    max_vals = statistiky['max']
+    minimalizacni = [_je_minimalizacni(t) for t in typy_kriterii]
+    
+    norm_matice = []
+    for radek in matice:
+        norm_radek = []
+        for j, hodnota in enumerate(radek):
+            if minimalizacni[j]:
+                norm_hodnota = min_vals[j] / hodnota if hodnota != 0 else 0.0
+            else:
+                norm_hodnota = hodnota / max_vals[j] if max_vals[j] != 0 else 0.0
+            norm_radek.append(norm_hodnota)
+        norm_matice.append(norm_radek)
+    
+    return {
+        'nazvy_variant': varianty,
+        'nazvy_kriterii': kriteria,
+        'normalizovana_matice': norm_matice
+    }
+
+def normalizuj_matici_soucet(matice, typy_kriterii, varianty, kriteria, statistiky=None):
+    """
+    Provede normalizaci součtem: hodnota / součet sloupce.
+    Směr kritérií se nemění, zohledňuje ho až metoda.
+    
+    Args:
+        matice: 2D list s hodnotami [varianty][kriteria]
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        statistiky: Předem spočtené statistiky sloupců (volitelné)
+    
+    Returns:
+        dict: Slovník obsahující normalizovanou matici a metadata
+    """
+    if statistiky is None:
+        statistiky = vypocitej_statistiky_sloupcu(matice)
+    soucty = statistiky['soucet']
+    
+    norm_matice = []
+    for radek in matice:
+        norm_matice.append([hodnota / soucty[j] if soucty[j] != 0 else 0.0
+                            for j, hodnota in enumerate(radek)])
+    
+    return {
+        'nazvy_variant': varianty,
+        'nazvy_kriterii': kriteria,
+        'normalizovana_matice': norm_matice
+    }
+
 def vytvor_hodnoty_matici(analyza_data):
     """
     Vytvoří matici s hodnotami z dat analýzy.
@@ -91,7 +238,7 @@ def vypocitej_vazene_hodnoty(matice, vahy):
 
 # Specifické funkce pro jednotlivé metody
 
-def wsm_vypocet(norm_matice, vahy, varianty):
+def wsm_vypocet(norm_matice, vahy, varianty, vazene_hodnoty=None):
     """
     Provede výpočet metodou WSM (Weighted Sum Model).
     
@@ -99,11 +246,13 @@ def wsm_vypocet(norm_matice, vahy, varianty):
         norm_matice: 2D list normalizovaných hodnot
         vahy: List vah kritérií
         varianty: List názvů variant
+        vazene_hodnoty: Předem spočtená vážená matice (volitelné)
     
     Returns:
         dict: Výsledky analýzy metodou WSM
     """
-    vazene_hodnoty = vypocitej_vazene_hodnoty(norm_matice, vahy)
+    if vazene_hodnoty is None:
+        vazene_hodnoty = vypocitej_vazene_hodnoty(norm_matice, vahy)
     
     # Sečtení řádků (variant) pro získání skóre
     skore = []
@@ -127,44 +276,50 @@ def wsm_vypocet(norm_matice, vahy, varianty):
         'rozdil_skore': results[0][2] - results[-1][2]
     }
 
+def vysledky_ze_serveru(vysledky_metod, kod_metody, klic_skore='skore'):
+    """
+    Převede kompaktní výsledek metody ze serveru (vypocitej_vysledky_metod)
+    na formát výsledků wsm_vypocet pro zobrazení ve výstupních formulářích.
+    
+    Args:
+        vysledky_metod: Výsledek vypocitej_vysledky_metod ('varianty' a 'metody')
+        kod_metody: Kód metody v 'metody' (např. "wsm")
+        klic_skore: Zobrazované skóre ('skore', u WPM také 'log_skore')
+    
+    Returns:
+        dict: results (varianta, pořadí, skóre) seřazené podle pořadí a nejlepší/nejhorší varianta
+    """
+    varianty = vysledky_metod['varianty']
+    vysledek = vysledky_metod['metody'][kod_metody]
+    poradi = vysledek['poradi']
+    
+    results = sorted(((varianty[i], poradi[i], skore) for i, skore in enumerate(vysledek[klic_skore])),
+                     key=lambda r: r[1])
+    
+    return {
+        'results': results,
+        'nejlepsi_varianta': results[0][0],
+        'nejlepsi_skore': results[0][2],
+        'nejhorsi_varianta': results[-1][0],
+        'nejhorsi_skore': results[-1][2],
+        'rozdil_skore': results[0][2] - results[-1][2]
+    }
+
 def priprav_data_z_json(analyza_data):
     """
     Připraví data z JSON struktury pro výpočty.
     
     Args:
-        analyza_data: Slovník s daty analýzy v novém formátu
+        analyza_data: Slovník s daty analýzy v novém formátu nebo Matice_analyzy
         
     Returns:
         tuple: (matice, typy_kriterii, varianty, kriteria, vahy)
     """
     try:
-        # Získání seznamu kritérií a jejich typů
-        kriteria_dict = analyza_data.get('kriteria', {})
-        kriteria = list(kriteria_dict.keys())
-        typy_kriterii = [kriteria_dict[k]['typ'] for k in kriteria]
-        vahy = [float(kriteria_dict[k]['vaha']) for k in kriteria]
-        
-        # Získání seznamu variant
-        varianty_dict = analyza_data.get('varianty', {})
-        varianty = list(varianty_dict.keys())
-        
-        # Vytvoření matice hodnot
-        matice = []
-        for var_nazev in varianty:
-            var_data = varianty_dict[var_nazev]
-            radek = []
-            for krit_nazev in kriteria:
-                # Získáme hodnotu pro kritérium, výchozí je 0 pokud chybí
-                hodnota = 0
-                if krit_nazev in var_data:
-                    try:
-                        hodnota = float(var_data[krit_nazev])
-                    except (ValueError, TypeError):
-                        hodnota = 0
-                radek.append(hodnota)
-            matice.append(radek)
-            
-        return matice, typy_kriterii, varianty, kriteria, vahy
+        # Chybějící nebo neplatné hodnoty převádí Matice_analyzy na 0
+        matice = Matice_analyzy.z_json(analyza_data)
+        return (matice.radky(), list(matice.typy_kriterii), list(matice.varianty),
+                list(matice.kriteria), list(matice.vahy))
         
     except Exception as e:
         raise ValueError(f"Chyba při přípravě dat pro výpočet: {str(e)}")
@@ -238,15 +393,20 @@ def vypocitej_analyzu_citlivosti(norm_matice, vahy, varianty, kriteria, vyber_kr
     except Exception as e:
         raise ValueError(f"Chyba při výpočtu analýzy citlivosti: {str(e)}")
 
-def topsis_vypocet(norm_matice, vahy, varianty, kriteria):
+def topsis_vypocet(norm_matice, vahy, varianty, kriteria, typy_kriterii=None):
     """
     Vypočítá výsledky metodou TOPSIS (Technique for Order of Preference by Similarity to Ideal Solution).
     
+    Při zadaných typech kritérií je ideál pro minimalizační kritéria minimum sloupce
+    (vhodné pro vektorovou normalizaci, která směr nemění). Bez typů se všechna
+    kritéria berou jako maximalizační (min-max normalizace už směr otočila).
+    
     Args:
         norm_matice: 2D list normalizovaných hodnot
         vahy: List vah kritérií
         varianty: List názvů variant
         kriteria: List názvů kritérií
+        typy_kriterii: List typů kritérií ("max" nebo "min"), volitelný
     
     Returns:
         dict: Výsledky analýzy metodou TOPSIS
@@ -265,8 +425,12 @@ def topsis_vypocet(norm_matice, vahy, varianty, kriteria):
         anti_ideal = []
         for j in range(len(kriteria)):
             sloupec = [vazena_matice[i][j] for i in range(len(varianty))]
-            ideal.append(max(sloupec))
-            anti_ideal.append(min(sloupec))
+            if typy_kriterii is not None and _je_minimalizacni(typy_kriterii[j]):
+                ideal.append(min(sloupec))
+                anti_ideal.append(max(sloupec))
+            else:
+                ideal.append(max(sloupec))
+                anti_ideal.append(min(sloupec))
         
         # Výpočet vzdáleností od ideálního a anti-ideálního řešení
         dist_ideal = []
@@ -305,14 +469,114 @@ def topsis_vypocet(norm_matice, vahy, varianty, kriteria):
             'nejhorsi_skore': results[-1][2],
             'ideal': ideal,
             'anti_ideal': anti_ideal,
-            'vazena_matice': vazena_matice
+            'vazena_matice': vazena_matice,
+            'vzdalenost_ideal': dist_ideal,
+            'vzdalenost_anti_ideal': dist_anti_ideal
         }
     except Exception as e:
         raise ValueError(f"Chyba při výpočtu TOPSIS: {str(e)}")
 
-def wpm_vypocet(matice, vahy, typy_kriterii, varianty, kriteria):
+def mabac_vypocet(norm_matice, vahy, varianty, kriteria):
+    """
+    Vypočítá výsledky metodou MABAC (Multi-Attributive Border Approximation area Comparison).
+    
+    Args:
+        norm_matice: 2D list min-max normalizovaných hodnot
+        vahy: List vah kritérií
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+    
+    Returns:
+        dict: Výsledky analýzy metodou MABAC
+    """
+    try:
+        # Vážená matice v_ij = w_j * (n_ij + 1)
+        vazena_matice = [[vahy[j] * (radek[j] + 1) for j in range(len(kriteria))]
+                         for radek in norm_matice]
+        
+        # Hranice aproximační oblasti - geometrický průměr sloupce přes průměr logaritmů
+        hranice = []
+        for j in range(len(kriteria)):
+            sloupec = [radek[j] for radek in vazena_matice]
+            if min(sloupec) <= 0:
+                hranice.append(0.0)  # Nulová váha - nulový sloupec
+            else:
+                hranice.append(math.exp(sum(math.log(v) for v in sloupec) / len(sloupec)))
+        
+        # Vzdálenosti od hranice a skóre variant
+        vzdalenosti = [[radek[j] - hranice[j] for j in range(len(kriteria))] for radek in vazena_matice]
+        skore = [sum(radek) for radek in vzdalenosti]
+        
+        serazene = sorted(zip(varianty, skore), key=lambda x: x[1], reverse=True)
+        results = []
+        for poradi, (varianta, hodnota) in enumerate(serazene, 1):
+            results.append((varianta, poradi, hodnota))
+        
+        return {
+            'results': results,
+            'nejlepsi_varianta': results[0][0],
+            'nejlepsi_skore': results[0][2],
+            'nejhorsi_varianta': results[-1][0],
+            'nejhorsi_skore': results[-1][2],
+            'hranice': hranice,
+            'vazena_matice': vazena_matice,
+            'vzdalenosti': vzdalenosti
+        }
+    except Exception as e:
+        raise ValueError(f"Chyba při výpočtu MABAC: {str(e)}")
+
+def uprav_nekladne_hodnoty(matice, nekladne_hodnoty=Konstanty.WPM_NEKLADNE_HODNOTY['NAHRADIT'],
+                           nahradni_hodnota=Konstanty.WPM_NAHRADNI_HODNOTA):
+    """
+    Připraví matici pro WPM podle zvolené politiky pro nekladné hodnoty.
+    Logaritmus i mocnina se zápornou vahou vyžadují kladné hodnoty.
+    
+    Args:
+        matice: 2D list původních hodnot [varianty][kriteria]
+        nekladne_hodnoty: Politika z Konstanty.WPM_NEKLADNE_HODNOTY
+            - 'nahradit': nekladná hodnota se nahradí hodnotou nahradni_hodnota
+            - 'posunout': sloupec s nekladnou hodnotou se posune tak,
+              aby jeho minimum bylo rovno nahradni_hodnota
+            - 'chyba': nekladná hodnota vyvolá ValueError
+        nahradni_hodnota: Kladná hodnota použitá při nahrazení nebo posunu
+    
+    Returns:
+        list: Nová 2D matice s kladnými hodnotami
+    
+    Raises:
+        ValueError: Při neznámé politice nebo nekladné hodnotě s politikou 'chyba'
+    """
+    if nekladne_hodnoty not in Konstanty.WPM_NEKLADNE_HODNOTY.values():
+        raise ValueError(f"Neznámá politika pro nekladné hodnoty: {nekladne_hodnoty}")
+    if nahradni_hodnota <= 0:
+        raise ValueError("Náhradní hodnota pro WPM musí být kladná.")
+    
+    if nekladne_hodnoty == Konstanty.WPM_NEKLADNE_HODNOTY['NAHRADIT']:
+        return [[hodnota if hodnota > 0 else nahradni_hodnota for hodnota in radek] for radek in matice]
+    
+    if nekladne_hodnoty == Konstanty.WPM_NEKLADNE_HODNOTY['CHYBA']:
+        for i, radek in enumerate(matice):
+            for j, hodnota in enumerate(radek):
+                if hodnota <= 0:
+                    raise ValueError(f"WPM vyžaduje kladné hodnoty (varianta {i + 1}, kritérium {j + 1}: {hodnota}).")
+        return [list(radek) for radek in matice]
+    
+    # Posun: jen sloupce, jejichž minimum není kladné
+    posuny = [0.0] * (len(matice[0]) if matice else 0)
+    for j in range(len(posuny)):
+        minimum = min(radek[j] for radek in matice)
+        if minimum <= 0:
+            posuny[j] = nahradni_hodnota - minimum
+    return [[hodnota + posuny[j] for j, hodnota in enumerate(radek)] for radek in matice]
+
+def wpm_vypocet(matice, vahy, typy_kriterii, varianty, kriteria,
+                nekladne_hodnoty=Konstanty.WPM_NEKLADNE_HODNOTY['NAHRADIT'],
+                nahradni_hodnota=Konstanty.WPM_NAHRADNI_HODNOTA):
     """
     Vypočítá výsledky metodou WPM (Weighted Product Model).
+    Součin mocnin se počítá jako vážený součet logaritmů, takže nedochází
+    k podtečení ani přetečení ani při mnoha kritériích. Pořadí se určuje
+    podle logaritmického skóre.
     
     Args:
         matice: 2D list původních hodnot
@@ -320,46 +584,48 @@ def wpm_vypocet(matice, vahy, typy_kriterii, varianty, kriteria):
         typy_kriterii: List typů kritérií ("max" nebo "min")
         varianty: List názvů variant
         kriteria: List názvů kritérií
+        nekladne_hodnoty: Politika pro nekladné hodnoty (viz uprav_nekladne_hodnoty)
+        nahradni_hodnota: Kladná hodnota pro nahrazení nebo posun
     
     Returns:
-        dict: Výsledky analýzy metodou WPM
+        dict: Výsledky analýzy metodou WPM, 'results' s lineárním skóre
+              (None, pokud přeteče) a 'results_log' s logaritmickým skóre
     """
     try:
         # Pro WPM používáme přímo původní hodnoty, nikoliv normalizované
-        # Inicializace výsledných hodnot na 1 pro násobení
-        skore = [1.0] * len(varianty)
+        kladna_matice = uprav_nekladne_hodnoty(matice, nekladne_hodnoty, nahradni_hodnota)
         
-        for i in range(len(varianty)):
-            for j in range(len(kriteria)):
-                hodnota = matice[i][j]
-                
-                # Kontrola, že hodnoty nejsou nulové nebo záporné
-                if hodnota <= 0:
-                    hodnota = 0.001  # Malá kladná hodnota
-                
-                # Pro minimalizační kritéria používáme 1/hodnota
-                if typy_kriterii[j].lower() in ("min", "cost"):
-                    hodnota = 1 / hodnota
-                
-                # Umocníme hodnotu na váhu a vynásobíme dosavadní skóre
-                skore[i] *= hodnota ** vahy[j]
+        # Minimalizační kritéria převrátíme záporným exponentem (log(1/x) = -log(x))
+        exponenty = [-vahy[j] if _je_minimalizacni(typy_kriterii[j]) else vahy[j]
+                     for j in range(len(kriteria))]
+        log_skore = [sum(exponenty[j] * math.log(radek[j]) for j in range(len(kriteria)))
+                     for radek in kladna_matice]
         
-        # Seřazení variant podle skóre (sestupně)
-        skore_varianty = [(varianty[i], skore[i]) for i in range(len(varianty))]
-        serazene = sorted(skore_varianty, key=lambda x: x[1], reverse=True)
+        # Seřazení variant podle logaritmického skóre (sestupně), exp je monotónní
+        serazene = sorted(zip(varianty, log_skore), key=lambda x: x[1], reverse=True)
         
-        # Vytvoření seznamu výsledků s pořadím
         results = []
+        results_log = []
         for poradi, (varianta, hodnota) in enumerate(serazene, 1):
-            results.append((varianta, poradi, hodnota))
+            results.append((varianta, poradi, _exp_bez_preteceni(hodnota)))
+            results_log.append((varianta, poradi, hodnota))
         
         return {
             'results': results,
+            'results_log': results_log,
             'nejlepsi_varianta': results[0][0],
             'nejlepsi_skore': results[0][2],
             'nejhorsi_varianta': results[-1][0],
             'nejhorsi_skore': results[-1][2],
-            'rozdil_skore': results[0][2] - results[-1][2] if len(results) > 1 else 0
+            'rozdil_skore': (None if results[0][2] is None else
+                             results[0][2] - results[-1][2] if len(results) > 1 else 0)
         }
     except Exception as e:
-        raise ValueError(f"Chyba při výpočtu WPM: {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Chyba při výpočtu WPM: {str(e)}")
+
+def _exp_bez_preteceni(hodnota):
+    """Vrátí exp(hodnota), při přetečení None (jako Vypocetni_jadro.linearni_skore_wpm)."""
+    try:
+        return math.exp(hodnota)
+    except OverflowError:
+        return None
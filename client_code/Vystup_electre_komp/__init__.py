@@ -5,11 +5,239 @@ import anvil.users
 import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
+from .. import Spravce_stavu, Ulohy, Utils, Vizualizace
+
+# Maximální počet variant v tabulce pořadí (graf a matici převyšování omezuje už server)
+MAX_ZOBRAZENYCH_VARIANT = 50
 
 
 class Vystup_electre_komp(Vystup_electre_kompTemplate):
-  def __init__(self, **properties):
-    # Set Form properties and Data Bindings.
-    self.init_components(**properties)
+    """
+    Formulář pro zobrazení výsledků analýzy metodou ELECTRE
+    (Elimination Et Choix Traduisant la Réalité) ve variantě I nebo III.
+    Relace převyšování se počítá na serveru jako úloha (Ulohy_vypoctu).
+    """
+    def __init__(self, analyza_id=None, **properties):
+        self.init_components(**properties)
+        # Inicializace správce stavu
+        self.spravce = Spravce_stavu.Spravce_stavu()
+
+        # Použijeme ID z parametrů nebo z aktivní analýzy ve správci
+        self.analyza_id = analyza_id or self.spravce.ziskej_aktivni_analyzu()
+
+        # Výsledky podle varianty metody - každá varianta se počítá jen jednou
+        self._vysledky_variant = {}
+
+        # Aktualizace nadpisu
+        if hasattr(self, 'headline_1'):
+            self.headline_1.text = "Analýza metodou ELECTRE"
+
+        self.drop_down_varianta.items = [("ELECTRE I (prahy souhlasu a nesouhlasu)", "I"),
+                                         ("ELECTRE III (pseudokritéria a věrohodnost)", "III")]
+        self.drop_down_varianta.selected_value = "I"
+
+    def form_show(self, **event_args):
+        """Načte data analýzy a výsledky ELECTRE při zobrazení formuláře."""
+        if not self.analyza_id:
+            self._zobraz_prazdny_formular()
+            return
+
+        try:
+            Utils.zapsat_info(f"Načítám data analýzy ID: {self.analyza_id}")
+
+            # Hodnotící matici formulář nezobrazuje, stačí název a popis analýzy
+            souhrn = anvil.server.call('nacti_souhrn_analyzy', self.analyza_id)
+
+            varianta_metody = self.drop_down_varianta.selected_value
+            self._zobraz_variantu(varianta_metody)
+            self._zobraz_vstupni_data(souhrn, self._vysledky_variant[varianta_metody])
+
+            Utils.zapsat_info("Výsledky ELECTRE analýzy úspěšně zobrazeny")
+
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při načítání analýzy: {str(e)}")
+            alert(f"Chyba při načítání analýzy: {str(e)}")
+
+    def drop_down_varianta_change(self, **event_args):
+        """Přepočítá a zobrazí výsledky pro zvolenou variantu metody."""
+        try:
+            self._zobraz_variantu(self.drop_down_varianta.selected_value)
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při výpočtu ELECTRE: {str(e)}")
+            alert(f"Chyba při výpočtu ELECTRE: {str(e)}")
+
+    def _zobraz_prubeh(self, prubeh):
+        """Zobrazí průběh výpočtu na serveru místo výsledků."""
+        self.rich_text_vysledek.content = Ulohy.popis_prubehu(prubeh)
+
+    def _zobraz_prazdny_formular(self):
+        """Zobrazí prázdný formulář s informací o chybějících datech."""
+        Utils.zapsat_info("Zobrazuji prázdný formulář ELECTRE - chybí ID analýzy")
+        self.rich_text_vstupni_data.content = "Nepřišlo žádné ID analýzy."
+        self.rich_text_postup.content = "Není co počítat."
+        self.rich_text_vysledek.content = "Není co počítat."
+        self.drop_down_varianta.visible = False
+        self.plot_electre_vysledek.visible = False
+        self.plot_electre_graf.visible = False
+
+    def _zobraz_variantu(self, varianta_metody):
+        """
+        Načte (nebo vezme z paměti formuláře) výsledky varianty metody a zobrazí je.
+
+        Args:
+            varianta_metody: "I" nebo "III"
+        """
+        vysledky = self._vysledky_variant.get(varianta_metody)
+        if vysledky is None:
+            vysledky = self.spravce.ziskej_vysledky(self.analyza_id, 'electre', {'varianta_metody': varianta_metody},
+                                                    pri_prubehu=self._zobraz_prubeh)
+            self._vysledky_variant[varianta_metody] = vysledky
+
+        self._zobraz_postup(vysledky)
+        self._zobraz_vysledky(vysledky)
+
+    def _zobraz_vstupni_data(self, souhrn, vysledky):
+        """
+        Zobrazí vstupní data analýzy v přehledné formě.
+        Kritéria a varianty bere z výsledku ze serveru, celá data analýzy se nenačítají.
+
+        Args:
+            souhrn: Název a popis analýzy (nacti_souhrn_analyzy)
+            vysledky: Výsledky metody ze serveru
+        """
+        try:
+            md = f"""
+### {souhrn['nazev']}
+
+#### Základní informace
+- Metoda: ELECTRE (Elimination Et Choix Traduisant la Réalité)
+- Popis: {souhrn['popis_analyzy'] or 'Bez popisu'}
+
+#### Kritéria
+| Název kritéria | Typ | Váha |
+|----------------|-----|------|
+"""
+            for nazev_krit, typ, vaha in zip(vysledky['kriteria'], vysledky['typy_kriterii'], vysledky['vahy']):
+                md += f"| {nazev_krit} | {typ.upper()} | {vaha:.3f} |\n"
+
+            varianty = vysledky['varianty']
+            md += f"\n#### Varianty\nPočet variant: {len(varianty)}\n"
+            if len(varianty) <= MAX_ZOBRAZENYCH_VARIANT:
+                for nazev_var in varianty:
+                    md += f"- {nazev_var}\n"
+
+            self.rich_text_vstupni_data.content = md
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při zobrazování vstupních dat: {str(e)}")
+            self.rich_text_vstupni_data.content = f"Chyba při zobrazování vstupních dat: {str(e)}"
+
+    def _zobraz_postup(self, vysledky):
+        """
+        Zobrazí použité prahy a princip zvolené varianty metody.
+
+        Args:
+            vysledky: Výsledky ELECTRE ze serveru
+        """
+        try:
+            parametry = vysledky['parametry']
+            md = f"### {parametry['metoda']}\n\n"
+
+            if parametry['metoda'] == 'ELECTRE I':
+                md += f"""
+#### Použité prahy
+- Práh souhlasu: {parametry['prah_souhlasu']:.2f}
+- Práh nesouhlasu: {parametry['prah_nesouhlasu']:.2f}
+
+#### Princip metody ELECTRE I:
+
+1. **Index souhlasu C(a, b)** - součet vah kritérií, ve kterých varianta a není horší než b
+2. **Index nesouhlasu D(a, b)** - největší převaha varianty b v jednom kritériu, vztažená k rozsahu kritéria
+3. Varianta a **převyšuje** b, pokud C(a, b) ≥ práh souhlasu a D(a, b) ≤ práh nesouhlasu
+4. **Jádro** tvoří varianty, které se navzájem nepřevyšují a společně převyšují všechny ostatní
+"""
+            else:
+                prahy = parametry['prahy']
+                md += f"""
+#### Použité prahy (podíl rozsahu kritéria)
+- Práh indiference q: {prahy['indiference']}
+- Práh preference p: {prahy['preference']}
+- Práh veta v: {prahy['veto']}
+- Hranice věrohodnosti λ: {parametry['prah_lambda']:.2f}
+
+#### Princip metody ELECTRE III:
+
+1. **Dílčí souhlas** je 1, pokud je b lepší než a nejvýše o q, a klesá k 0 při převaze p
+2. **Dílčí nesouhlas** je 0 do převahy p a roste k 1 při převaze v (veto)
+3. **Věrohodnost** σ(a, b) je celkový souhlas oslabený kritérii se silným nesouhlasem
+4. Varianta a převyšuje b, pokud σ(a, b) ≥ λ; pořadí určuje rozdíl síly a slabosti (součtů σ)
+"""
+            self.rich_text_postup.content = md
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při zobrazování postupu: {str(e)}")
+            self.rich_text_postup.content = f"Chyba při zobrazování postupu: {str(e)}"
+
+    def _zobraz_vysledky(self, vysledky):
+        """
+        Zobrazí pořadí variant, jádro a graf převyšování.
+
+        Args:
+            vysledky: Výsledky ELECTRE ze serveru
+        """
+        try:
+            varianty = vysledky['varianty']
+            index_variant = {nazev: i for i, nazev in enumerate(varianty)}
+            prevysovane = vysledky['pocet_prevysovanych']
+            prevysujici = vysledky['pocet_prevysujicich']
+            zobrazene = vysledky['results'][:MAX_ZOBRAZENYCH_VARIANT]
+
+            md = f"### Výsledky analýzy {vysledky['parametry']['metoda']}\n\n"
+            md += "#### Pořadí variant\n"
+            md += "| Pořadí | Varianta | Převyšuje | Je převyšována | Čisté skóre |\n"
+            md += "|---------|----------|-----------|----------------|-------------|\n"
+            for varianta, poradi, skore in zobrazene:
+                i = index_variant[varianta]
+                md += f"| {poradi}. | {varianta} | {prevysovane[i]} | {prevysujici[i]} | {skore:.3f} |\n"
+            if len(zobrazene) < len(varianty):
+                md += f"\n*Zobrazeno {len(zobrazene)} nejlepších z {len(varianty)} variant.*\n"
+
+            if vysledky['jadro'] is None:
+                # Server graf s příliš mnoha hranami neukládá, jádro se pak neurčuje
+                jadro = "neurčeno (graf převyšování je příliš velký)"
+            else:
+                jadro = ', '.join(vysledky['jadro']) if vysledky['jadro'] else 'prázdné'
+
+            md += f"""
+#### Shrnutí výsledků
+
+- **Jádro (nepřevyšované varianty):** {jadro}
+- **Počet hran převyšování:** {vysledky['pocet_hran']}
+- **Nejlepší varianta podle čistého skóre:** {vysledky['nejlepsi_varianta']}
+- **Nejhorší varianta podle čistého skóre:** {vysledky['nejhorsi_varianta']}
+"""
+            if vysledky['v_cyklu']:
+                md += f"- **Varianty v cyklu převyšování (mimo jádro):** {', '.join(vysledky['v_cyklu'])}\n"
+
+            self.rich_text_vysledek.content = md
+
+            self.plot_electre_vysledek.figure = Vizualizace.vytvor_sloupovy_graf_vysledku(
+                zobrazene,
+                vysledky['nejlepsi_varianta'],
+                vysledky['nejhorsi_varianta'],
+                vysledky['parametry']['metoda']
+            )
+            self.plot_electre_vysledek.visible = True
+
+            detail = vysledky['detail']
+            self.plot_electre_graf.figure = Vizualizace.vytvor_heat_mapu(
+                detail['varianty'],
+                detail['varianty'],
+                detail['prevysovani'],
+                "převyšování (řádek převyšuje sloupec)"
+            )
+            self.plot_electre_graf.visible = True
 
-    # Any code you write here will run before the form opens.
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při zobrazování výsledků: {str(e)}")
+            self.rich_text_vysledek.content = f"Chyba při zobrazování výsledků: {str(e)}"
+            self.plot_electre_vysledek.visible = False
+            self.plot_electre_graf.visible = False
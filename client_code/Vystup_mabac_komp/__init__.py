@@ -5,11 +5,213 @@ import anvil.users
 import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
+from .. import Spravce_stavu, Ulohy, Utils, Vizualizace
+
+# Maximální počet variant v tabulkách pořadí (výsledky mohou mít desítky tisíc variant),
+# matice v tabulkách a teplotní mapě omezuje už server (Vypocty_analyzy.MAX_VARIANT_DETAILU)
+MAX_ZOBRAZENYCH_VARIANT = 50
 
 
 class Vystup_mabac_komp(Vystup_mabac_kompTemplate):
-  def __init__(self, **properties):
-    # Set Form properties and Data Bindings.
-    self.init_components(**properties)
+    """
+    Formulář pro zobrazení výsledků analýzy metodou MABAC
+    (Multi-Attributive Border Approximation area Comparison).
+    Výpočet probíhá na serveru jako úloha (Ulohy_vypoctu), formulář jen zobrazuje výsledky.
+    """
+    def __init__(self, analyza_id=None, **properties):
+        self.init_components(**properties)
+        # Inicializace správce stavu
+        self.spravce = Spravce_stavu.Spravce_stavu()
+
+        # Použijeme ID z parametrů nebo z aktivní analýzy ve správci
+        self.analyza_id = analyza_id or self.spravce.ziskej_aktivni_analyzu()
+
+        # Aktualizace nadpisu
+        if hasattr(self, 'headline_1'):
+            self.headline_1.text = "Analýza metodou MABAC"
+
+    def form_show(self, **event_args):
+        """Načte data analýzy a výsledky MABAC při zobrazení formuláře."""
+        if not self.analyza_id:
+            self._zobraz_prazdny_formular()
+            return
+
+        try:
+            Utils.zapsat_info(f"Načítám data analýzy ID: {self.analyza_id}")
+
+            # Hodnotící matici formulář nezobrazuje, stačí název a popis analýzy
+            souhrn = anvil.server.call('nacti_souhrn_analyzy', self.analyza_id)
+
+            mabac_vysledky = self.spravce.ziskej_vysledky(self.analyza_id, 'mabac', pri_prubehu=self._zobraz_prubeh)
+            self._zobraz_vstupni_data(souhrn, mabac_vysledky)
+            self._zobraz_normalizaci(mabac_vysledky)
+            self._zobraz_vysledky(mabac_vysledky)
+
+            Utils.zapsat_info("Výsledky MABAC analýzy úspěšně zobrazeny")
+
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při načítání analýzy: {str(e)}")
+            alert(f"Chyba při načítání analýzy: {str(e)}")
+
+    def _zobraz_prubeh(self, prubeh):
+        """Zobrazí průběh výpočtu na serveru místo výsledků."""
+        self.rich_text_vysledek.content = Ulohy.popis_prubehu(prubeh)
+
+    def _zobraz_prazdny_formular(self):
+        """Zobrazí prázdný formulář s informací o chybějících datech."""
+        Utils.zapsat_info("Zobrazuji prázdný formulář MABAC - chybí ID analýzy")
+        self.rich_text_vstupni_data.content = "Nepřišlo žádné ID analýzy."
+        self.rich_text_normalizace.content = "Není co počítat."
+        self.rich_text_vysledek.content = "Není co počítat."
+        self.plot_mabac_vysledek.visible = False
+        self.plot_mabac_vzdalenosti.visible = False
+
+    def _zobraz_vstupni_data(self, souhrn, vysledky):
+        """
+        Zobrazí vstupní data analýzy v přehledné formě.
+        Kritéria a varianty bere z výsledku ze serveru, celá data analýzy se nenačítají.
+
+        Args:
+            souhrn: Název a popis analýzy (nacti_souhrn_analyzy)
+            vysledky: Výsledky metody ze serveru
+        """
+        try:
+            md = f"""
+### {souhrn['nazev']}
+
+#### Základní informace
+- Metoda: MABAC (Multi-Attributive Border Approximation area Comparison)
+- Popis: {souhrn['popis_analyzy'] or 'Bez popisu'}
+
+#### Kritéria
+| Název kritéria | Typ | Váha |
+|----------------|-----|------|
+"""
+            for nazev_krit, typ, vaha in zip(vysledky['kriteria'], vysledky['typy_kriterii'], vysledky['vahy']):
+                md += f"| {nazev_krit} | {typ.upper()} | {vaha:.3f} |\n"
+
+            varianty = vysledky['varianty']
+            md += f"\n#### Varianty\nPočet variant: {len(varianty)}\n"
+            if len(varianty) <= MAX_ZOBRAZENYCH_VARIANT:
+                for nazev_var in varianty:
+                    md += f"- {nazev_var}\n"
+
+            self.rich_text_vstupni_data.content = md
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při zobrazování vstupních dat: {str(e)}")
+            self.rich_text_vstupni_data.content = f"Chyba při zobrazování vstupních dat: {str(e)}"
+
+    def _zobraz_normalizaci(self, mabac_vysledky):
+        """
+        Zobrazí normalizovanou a váženou matici a hranici aproximační oblasti.
+
+        Args:
+            mabac_vysledky: Výsledky MABAC ze serveru
+        """
+        try:
+            kriteria = mabac_vysledky['kriteria']
+            detail = mabac_vysledky['detail']
+            pocet_variant = len(mabac_vysledky['varianty'])
+
+            md = "### Normalizace hodnot metodou Min-Max\n\n"
+            if len(detail['varianty']) < pocet_variant:
+                md += f"*Zobrazeno {len(detail['varianty'])} nejlepších z {pocet_variant} variant.*\n\n"
+
+            md += "#### Normalizovaná matice\n"
+            md += "| Varianta / Krit. | " + " | ".join(kriteria) + " |\n"
+            md += "|" + "-|"*(len(kriteria)+1) + "\n"
+            for varianta, radek in zip(detail['varianty'], detail['normalizovana_matice']):
+                md += f"| {varianta} |" + "".join(f" {hodnota:.3f} |" for hodnota in radek) + "\n"
+
+            md += "\n#### Vážená matice v = váha × (normalizovaná hodnota + 1)\n"
+            md += "| Varianta / Krit. | " + " | ".join(kriteria) + " |\n"
+            md += "|" + "-|"*(len(kriteria)+1) + "\n"
+            for varianta, radek in zip(detail['varianty'], detail['vazena_matice']):
+                md += f"| {varianta} |" + "".join(f" {hodnota:.4f} |" for hodnota in radek) + "\n"
+
+            md += "\n#### Hranice aproximační oblasti (G)\n"
+            md += "| Kritérium | " + " | ".join(kriteria) + " |\n"
+            md += "|" + "-|"*(len(kriteria)+1) + "\n"
+            md += "| G |" + "".join(f" {hodnota:.4f} |" for hodnota in mabac_vysledky['hranice']) + "\n"
+
+            md += """
+#### Princip hranice aproximační oblasti:
+
+- Hranice kritéria je geometrický průměr vážených hodnot všech variant
+- Počítá se jako exponenciála průměru logaritmů, takže nepodtéká ani při velkém počtu variant
+- Varianty nad hranicí patří do horní (lepší) aproximační oblasti, varianty pod ní do dolní
+"""
+            self.rich_text_normalizace.content = md
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při zobrazování normalizace: {str(e)}")
+            self.rich_text_normalizace.content = f"Chyba při zobrazování normalizace: {str(e)}"
+
+    def _zobraz_vysledky(self, mabac_vysledky):
+        """
+        Zobrazí pořadí variant, shrnutí a grafy.
+
+        Args:
+            mabac_vysledky: Výsledky MABAC ze serveru
+        """
+        try:
+            varianty = mabac_vysledky['varianty']
+            zobrazene = mabac_vysledky['results'][:MAX_ZOBRAZENYCH_VARIANT]
+
+            md = "### Výsledky analýzy MABAC\n\n"
+            md += "#### Pořadí variant\n"
+            md += "| Pořadí | Varianta | Skóre (součet vzdáleností) | Oblast |\n"
+            md += "|---------|----------|----------------------------|--------|\n"
+            for varianta, poradi, skore in zobrazene:
+                oblast = "horní" if skore > 0 else "dolní" if skore < 0 else "hranice"
+                md += f"| {poradi}. | {varianta} | {skore:.4f} | {oblast} |\n"
+            if len(zobrazene) < len(varianty):
+                md += f"\n*Zobrazeno {len(zobrazene)} nejlepších z {len(varianty)} variant.*\n"
+
+            md += f"""
+#### Shrnutí výsledků
+
+- **Nejlepší varianta:** {mabac_vysledky['nejlepsi_varianta']} (skóre: {mabac_vysledky['nejlepsi_skore']:.4f})
+- **Nejhorší varianta:** {mabac_vysledky['nejhorsi_varianta']} (skóre: {mabac_vysledky['nejhorsi_skore']:.4f})
+
+#### O metodě MABAC
+
+MABAC porovnává varianty s hranicí aproximační oblasti, která představuje „průměrnou“ variantu.
+
+**Princip metody:**
+1. Min-max normalizace hodnot podle typu kritéria
+2. Vážená matice v = váha × (normalizovaná hodnota + 1)
+3. Hranice aproximační oblasti G jako geometrický průměr každého kritéria
+4. Vzdálenosti q = v - G a skóre varianty jako jejich součet (vyšší je lepší)
+
+**Výhody metody:**
+- Stabilní výsledky i při změně způsobu měření kritérií
+- Jednoduchý výpočet vhodný i pro velký počet variant
+- Ukazuje, v kterých kritériích je varianta nad nebo pod průměrem
+
+**Omezení metody:**
+- Hranice závisí na všech variantách - přidání varianty může změnit pořadí ostatních
+"""
+            self.rich_text_vysledek.content = md
+
+            self.plot_mabac_vysledek.figure = Vizualizace.vytvor_sloupovy_graf_vysledku(
+                zobrazene,
+                mabac_vysledky['nejlepsi_varianta'],
+                mabac_vysledky['nejhorsi_varianta'],
+                "MABAC"
+            )
+            self.plot_mabac_vysledek.visible = True
+
+            detail = mabac_vysledky['detail']
+            self.plot_mabac_vzdalenosti.figure = Vizualizace.vytvor_heat_mapu(
+                detail['varianty'],
+                mabac_vysledky['kriteria'],
+                detail['vzdalenosti'],
+                "MABAC (vzdálenosti od hranice aproximační oblasti)"
+            )
+            self.plot_mabac_vzdalenosti.visible = True
 
-    # Any code you write here will run before the form opens.
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při zobrazování výsledků: {str(e)}")
+            self.rich_text_vysledek.content = f"Chyba při zobrazování výsledků: {str(e)}"
+            self.plot_mabac_vysledek.visible = False
+            self.plot_mabac_vzdalenosti.visible = False
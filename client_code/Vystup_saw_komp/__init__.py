@@ -6,18 +6,22 @@ import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
 import anvil.users
-from .. import Spravce_stavu, Utils
+from .. import Spravce_stavu, Ulohy, Utils
+
+# Maximální počet variant v tabulce pořadí a grafu (výsledky mohou mít desítky tisíc variant),
+# normalizovanou a váženou matici omezuje už server (Vypocty_analyzy.MAX_VARIANT_DETAILU)
+MAX_ZOBRAZENYCH_VARIANT = 50
 
 
 class Vystup_saw_komp(Vystup_saw_kompTemplate):
     """
     Formulář pro zobrazení výsledků SAW analýzy.
     Zobrazuje kompletní přehled včetně:
-    - vstupních dat (kritéria, varianty, hodnotící matice)
+    - vstupních dat (kritéria a varianty)
     - normalizované matice
     - vážených hodnot
     - finálních výsledků
-    Upraveno pro novou JSON strukturu.
+    Výpočet (společný s WSM) probíhá na serveru, formulář jen zobrazuje výsledky.
     """
     def __init__(self, analyza_id=None, metoda=None, **properties):
         self.init_components(**properties)
@@ -42,11 +46,15 @@ class Vystup_saw_komp(Vystup_saw_kompTemplate):
         try:
             Utils.zapsat_info(f"Načítám výsledky analýzy ID: {self.analyza_id}")
             
-            # Načtení dat analýzy z nové JSON struktury
-            analyza_data = anvil.server.call('nacti_analyzu', self.analyza_id)
+            # Hodnotící matici formulář nezobrazuje, stačí název a popis analýzy
+            souhrn = anvil.server.call('nacti_souhrn_analyzy', self.analyza_id)
+            
+            # SAW je totožná s WSM, skóre i mezivýsledky počítá server a opakované
+            # zobrazení jen čte výsledek z cache
+            saw_vysledky = self.spravce.ziskej_vysledky(self.analyza_id, 'wsm', pri_prubehu=self._zobraz_prubeh)
             
             # Zobrazení výsledků
-            self._zobraz_kompletni_analyzu(analyza_data)
+            self._zobraz_kompletni_analyzu(souhrn, saw_vysledky)
             
             Utils.zapsat_info("Výsledky analýzy úspěšně zobrazeny")
             
@@ -54,6 +62,10 @@ class Vystup_saw_komp(Vystup_saw_kompTemplate):
             Utils.zapsat_chybu(f"Chyba při načítání analýzy: {str(e)}")
             alert(f"Chyba při načítání analýzy: {str(e)}")
 
+    def _zobraz_prubeh(self, prubeh):
+        """Zobrazí průběh výpočtu na serveru místo výsledků."""
+        self.rich_text_vysledek.content = Ulohy.popis_prubehu(prubeh)
+
     def _zobraz_prazdny_formular(self):
         """Zobrazí prázdný formulář s informací o chybějících datech."""
         Utils.zapsat_info("Zobrazuji prázdný formulář - chybí ID analýzy")
@@ -62,24 +74,20 @@ class Vystup_saw_komp(Vystup_saw_kompTemplate):
         self.rich_text_vysledek.content = "Není co počítat."
         self.plot_saw_vysledek.visible = False
 
-    def _zobraz_kompletni_analyzu(self, analyza_data):
+    def _zobraz_kompletni_analyzu(self, souhrn, saw_vysledky):
         """
         Zobrazí kompletní analýzu včetně všech výpočtů.
         
         Args:
-            analyza_data: Slovník s kompletními daty analýzy v novém formátu
+            souhrn: Název a popis analýzy (nacti_souhrn_analyzy)
+            saw_vysledky: Výsledky WSM ze serveru (vypocitej_wsm)
         """
         # Zobrazení vstupních dat
-        self._zobraz_vstupni_data(analyza_data)
+        self._zobraz_vstupni_data(souhrn, saw_vysledky)
         
-        # Provedení výpočtů
         try:
-            norm_vysledky = self._normalizuj_matici(analyza_data)
-            vazene_hodnoty = self._vypocitej_vazene_hodnoty(analyza_data, norm_vysledky)
-            saw_vysledky = self._vypocitej_saw_vysledky(analyza_data, vazene_hodnoty)
-            
             # Zobrazení výsledků
-            self._zobraz_normalizaci(norm_vysledky, vazene_hodnoty)
+            self._zobraz_normalizaci(saw_vysledky)
             self._zobraz_vysledky(saw_vysledky)
         except Exception as e:
             Utils.zapsat_chybu(f"Chyba při výpočtu výsledků: {str(e)}")
@@ -87,203 +95,75 @@ class Vystup_saw_komp(Vystup_saw_kompTemplate):
             self.rich_text_vysledek.content = f"Chyba při výpočtu: {str(e)}"
             self.plot_saw_vysledek.visible = False
 
-    def _zobraz_vstupni_data(self, analyza_data):
-        """Zobrazí vstupní data analýzy v přehledné formě."""
+    def _zobraz_vstupni_data(self, souhrn, vysledky):
+        """
+        Zobrazí vstupní data analýzy v přehledné formě.
+        Kritéria a varianty bere z výsledku ze serveru, celá data analýzy se nenačítají.
+        
+        Args:
+            souhrn: Název a popis analýzy (nacti_souhrn_analyzy)
+            vysledky: Výsledky WSM ze serveru
+        """
         try:
             md = f"""
-### {analyza_data['nazev']}
+### {souhrn['nazev']}
 
 #### Základní informace
 - Metoda: SAW
-- Popis: {analyza_data.get('popis_analyzy', 'Bez popisu')}
+- Popis: {souhrn['popis_analyzy'] or 'Bez popisu'}
 
 #### Kritéria
 | Název kritéria | Typ | Váha |
 |----------------|-----|------|
 """
             # Přidání kritérií
-            kriteria = analyza_data.get('kriteria', {})
-            for nazev_krit, krit_data in kriteria.items():
-                vaha = float(krit_data['vaha'])
-                md += f"| {nazev_krit} | {krit_data['typ'].upper()} | {vaha:.3f} |\n"
+            for nazev_krit, typ, vaha in zip(vysledky['kriteria'], vysledky['typy_kriterii'], vysledky['vahy']):
+                md += f"| {nazev_krit} | {typ.upper()} | {vaha:.3f} |\n"
 
             # Varianty
-            md += "\n#### Varianty\n"
-            varianty = analyza_data.get('varianty', {})
-            for nazev_var, var_data in varianty.items():
-                popis = f" - {var_data.get('popis_varianty', '')}" if var_data.get('popis_varianty') else ""
-                md += f"- {nazev_var}{popis}\n"
-
-            # Hodnotící matice
-            kriteria_nazvy = list(kriteria.keys())
-            varianty_nazvy = list(varianty.keys())
-            
-            md += "\n#### Hodnotící matice\n"
-            md += f"| Kritérium | {' | '.join(varianty_nazvy)} |\n"
-            md += f"|{'-' * 10}|{('|'.join('-' * 12 for _ in varianty_nazvy))}|\n"
-            
-            for nazev_krit in kriteria_nazvy:
-                radek = f"| {nazev_krit} |"
-                for nazev_var in varianty_nazvy:
-                    hodnota = varianty[nazev_var].get(nazev_krit, "N/A")
-                    hodnota = f" {hodnota:.2f} |" if isinstance(hodnota, (int, float)) else f" {hodnota} |"
-                    radek += hodnota
-                md += radek + "\n"
+            varianty = vysledky['varianty']
+            md += f"\n#### Varianty\nPočet variant: {len(varianty)}\n"
+            if len(varianty) <= MAX_ZOBRAZENYCH_VARIANT:
+                for nazev_var in varianty:
+                    md += f"- {nazev_var}\n"
 
             self.rich_text_vstupni_data.content = md
         except Exception as e:
             Utils.zapsat_chybu(f"Chyba při zobrazování vstupních dat: {str(e)}")
             self.rich_text_vstupni_data.content = f"Chyba při zobrazování vstupních dat: {str(e)}"
 
-    def _normalizuj_matici(self, analyza_data):
+    def _zobraz_normalizaci(self, saw_vysledky):
         """
-        Provede min-max normalizaci hodnot.
+        Zobrazí normalizovanou matici a vážené hodnoty nejlepších variant.
         
         Args:
-            analyza_data: Slovník obsahující data analýzy v novém formátu
-        
-        Returns:
-            dict: Slovník obsahující normalizovanou matici a metadata
+            saw_vysledky: Výsledky WSM ze serveru (matice jsou v 'detail')
         """
         try:
-            kriteria = analyza_data.get('kriteria', {})
-            varianty = analyza_data.get('varianty', {})
-            
-            # Seznamy pro názvy
-            kriteria_nazvy = list(kriteria.keys())
-            varianty_nazvy = list(varianty.keys())
-            
-            # Vytvoření původní matice
-            matice = []
-            for nazev_var in varianty_nazvy:
-                radek = []
-                var_data = varianty[nazev_var]
-                for nazev_krit in kriteria_nazvy:
-                    hodnota = float(var_data.get(nazev_krit, 0))
-                    radek.append(hodnota)
-                matice.append(radek)
-            
-            # Normalizace pomocí min-max pro každý sloupec (kritérium)
-            norm_matice = []
-            for i in range(len(matice)):
-                norm_radek = []
-                for j in range(len(matice[0])):
-                    sloupec = [row[j] for row in matice]
-                    min_val = min(sloupec)
-                    max_val = max(sloupec)
-                    
-                    if max_val == min_val:
-                        norm_hodnota = 1.0  # Všechny hodnoty jsou stejné
-                    else:
-                        # Pro MIN kritéria obrátíme normalizaci
-                        krit_typ = kriteria[kriteria_nazvy[j]]['typ'].lower()
-                        if krit_typ in ("min", "cost"):
-                            norm_hodnota = (max_val - matice[i][j]) / (max_val - min_val)
-                        else:
-                            norm_hodnota = (matice[i][j] - min_val) / (max_val - min_val)
-                    
-                    norm_radek.append(norm_hodnota)
-                norm_matice.append(norm_radek)
-            
-            return {
-                'nazvy_variant': varianty_nazvy,
-                'nazvy_kriterii': kriteria_nazvy,
-                'normalizovana_matice': norm_matice
-            }
-        except Exception as e:
-            Utils.zapsat_chybu(f"Chyba při normalizaci matice: {str(e)}")
-            raise
+            kriteria = saw_vysledky['kriteria']
+            detail = saw_vysledky['detail']
+            pocet_variant = len(saw_vysledky['varianty'])
 
-    def _vypocitej_vazene_hodnoty(self, analyza_data, norm_vysledky):
-        """
-        Vypočítá vážené hodnoty pro všechny varianty a kritéria.
-        
-        Args:
-            analyza_data: Slovník s daty analýzy v novém formátu
-            norm_vysledky: Výsledky normalizace
-            
-        Returns:
-            dict: Slovník vážených hodnot pro každou variantu a kritérium
-        """
-        try:
-            vazene_hodnoty = {}
-            kriteria = analyza_data.get('kriteria', {})
-            
-            for i, varianta in enumerate(norm_vysledky['nazvy_variant']):
-                vazene_hodnoty[varianta] = {}
-                for j, kriterium in enumerate(norm_vysledky['nazvy_kriterii']):
-                    norm_hodnota = norm_vysledky['normalizovana_matice'][i][j]
-                    vaha = float(kriteria[kriterium]['vaha'])
-                    vazene_hodnoty[varianta][kriterium] = norm_hodnota * vaha
-            
-            return vazene_hodnoty
-        except Exception as e:
-            Utils.zapsat_chybu(f"Chyba při výpočtu vážených hodnot: {str(e)}")
-            raise
-
-    def _vypocitej_saw_vysledky(self, analyza_data, vazene_hodnoty):
-        """
-        Vypočítá finální výsledky SAW analýzy.
-        
-        Args:
-            analyza_data: Slovník s daty analýzy v novém formátu
-            vazene_hodnoty: Slovník vážených hodnot
-            
-        Returns:
-            dict: Slovník obsahující seřazené výsledky a statistiky
-        """
-        try:
-            # Výpočet celkového skóre pro každou variantu
-            skore = {}
-            for varianta, hodnoty in vazene_hodnoty.items():
-                skore[varianta] = sum(hodnoty.values())
-            
-            # Seřazení variant podle skóre (sestupně)
-            serazene = sorted(skore.items(), key=lambda x: x[1], reverse=True)
-            
-            # Vytvoření seznamu výsledků s pořadím
-            results = []
-            for poradi, (varianta, hodnota) in enumerate(serazene, 1):
-                results.append((varianta, poradi, hodnota))
-            
-            return {
-                'results': results,
-                'nejlepsi_varianta': results[0][0],
-                'nejlepsi_skore': results[0][2],
-                'nejhorsi_varianta': results[-1][0],
-                'nejhorsi_skore': results[-1][2],
-                'rozdil_skore': results[0][2] - results[-1][2]
-            }
-        except Exception as e:
-            Utils.zapsat_chybu(f"Chyba při výpočtu SAW výsledků: {str(e)}")
-            raise
-
-    def _zobraz_normalizaci(self, norm_vysledky, vazene_hodnoty):
-        """
-        Zobrazí normalizovanou matici a vážené hodnoty.
-        
-        Args:
-            norm_vysledky: Výsledky normalizace
-            vazene_hodnoty: Vypočtené vážené hodnoty
-        """
-        try:
             md = "### Normalizace hodnot\n\n"
+            if len(detail['varianty']) < pocet_variant:
+                md += f"*Zobrazeno {len(detail['varianty'])} nejlepších z {pocet_variant} variant.*\n\n"
             
             # Normalizační tabulka
-            md += "| Varianta / Krit. | " + " | ".join(norm_vysledky['nazvy_kriterii']) + " |\n"
-            md += "|" + "-|"*(len(norm_vysledky['nazvy_kriterii'])+1) + "\n"
+            md += "| Varianta / Krit. | " + " | ".join(kriteria) + " |\n"
+            md += "|" + "-|"*(len(kriteria)+1) + "\n"
             
-            for i, var_name in enumerate(norm_vysledky['nazvy_variant']):
-                md += f"| {var_name} |"
-                for j in range(len(norm_vysledky['nazvy_kriterii'])):
-                    md += f" {norm_vysledky['normalizovana_matice'][i][j]:.3f} |"
-                md += "\n"
+            for var_name, radek in zip(detail['varianty'], detail['normalizovana_matice']):
+                md += f"| {var_name} |" + "".join(f" {hodnota:.3f} |" for hodnota in radek) + "\n"
 
             # Vysvětlení normalizace
             md += self._vytvor_vysvetleni_normalizace()
             
             # Tabulka vážených hodnot
-            md += self._vytvor_tabulku_vazenych_hodnot(vazene_hodnoty)
+            md += self._vytvor_tabulku_vazenych_hodnot(
+                detail['vazena_matice'],
+                detail['varianty'],
+                kriteria
+            )
             
             # Vysvětlení vážených hodnot
             md += self._vytvor_vysvetleni_vazenych_hodnot()
@@ -307,8 +187,12 @@ class Vystup_saw_komp(Vystup_saw_kompTemplate):
             md += "| Pořadí | Varianta | Skóre |\n"
             md += "|---------|----------|--------|\n"
             
-            for varianta, poradi, skore in saw_vysledky['results']:
+            pocet_variant = len(saw_vysledky['results'])
+            zobrazene = saw_vysledky['results'][:MAX_ZOBRAZENYCH_VARIANT]
+            for varianta, poradi, skore in zobrazene:
                 md += f"| {poradi}. | {varianta} | {skore:.3f} |\n"
+            if len(zobrazene) < pocet_variant:
+                md += f"\n*Zobrazeno {len(zobrazene)} nejlepších z {pocet_variant} variant.*\n"
 
             # Shrnutí výsledků
             md += f"""
@@ -331,7 +215,7 @@ class Vystup_saw_komp(Vystup_saw_kompTemplate):
             self.rich_text_vysledek.content = md
 
             # Přidání grafu
-            self.plot_saw_vysledek.figure = self._vytvor_graf_vysledku(saw_vysledky)
+            self.plot_saw_vysledek.figure = self._vytvor_graf_vysledku(saw_vysledky, zobrazene)
             self.plot_saw_vysledek.visible = True
         except Exception as e:
             Utils.zapsat_chybu(f"Chyba při zobrazování výsledků: {str(e)}")
@@ -358,35 +242,30 @@ Normalizací převedeme všechny hodnoty do intervalu [0,1].
 
 """
 
-    def _vytvor_tabulku_vazenych_hodnot(self, vazene_hodnoty):
+    def _vytvor_tabulku_vazenych_hodnot(self, vazene_matice, varianty, kriteria):
         """
         Vytvoří markdown tabulku vážených hodnot.
         
         Args:
-            vazene_hodnoty: Slovník vážených hodnot
+            vazene_matice: 2D list vážených hodnot [varianty][kriteria]
+            varianty: Seznam názvů variant
+            kriteria: Seznam názvů kritérií
             
         Returns:
             str: Markdown formátovaná tabulka
         """
         try:
-            varianty = list(vazene_hodnoty.keys())
             if not varianty:
                 return ""
-                
-            kriteria = list(vazene_hodnoty[varianty[0]].keys())
             
             md = "\n#### Vážené hodnoty\n\n"
             md += "| Varianta | " + " | ".join(kriteria) + " | Součet |\n"
             md += "|" + "----|"*(len(kriteria)+2) + "\n"
             
-            for var in varianty:
+            for var, radek in zip(varianty, vazene_matice):
                 md += f"| {var} |"
-                soucet = 0.0
-                for krit in kriteria:
-                    hodnota = vazene_hodnoty[var].get(krit, 0)
-                    soucet += hodnota
-                    md += f" {hodnota:.3f} |"
-                md += f" {soucet:.3f} |\n"
+                md += "".join(f" {hodnota:.3f} |" for hodnota in radek)
+                md += f" {sum(radek):.3f} |\n"
             return md
         except Exception as e:
             Utils.zapsat_chybu(f"Chyba při vytváření tabulky vážených hodnot: {str(e)}")
@@ -414,12 +293,13 @@ Normalizací převedeme všechny hodnoty do intervalu [0,1].
 
 """
 
-    def _vytvor_graf_vysledku(self, saw_vysledky):
+    def _vytvor_graf_vysledku(self, saw_vysledky, zobrazene):
         """
         Vytvoří sloupcový graf výsledků pomocí Plotly.
         
         Args:
             saw_vysledky: Slovník s výsledky SAW analýzy
+            zobrazene: Zobrazené výsledky (varianta, pořadí, skóre) od nejlepší
         
         Returns:
             dict: Plotly figure configuration
@@ -431,7 +311,7 @@ Normalizací převedeme všechny hodnoty do intervalu [0,1].
             colors = []  # Barvy pro sloupce
             
             # Seřazení dat podle skóre (sestupně)
-            for varianta, poradi, hodnota in saw_vysledky['results']:
+            for varianta, poradi, hodnota in zobrazene:
                 varianty.append(varianta)
                 skore.append(hodnota)
                 # Nejlepší varianta bude mít zelenou, nejhorší červenou
@@ -5,11 +5,226 @@ import anvil.users
 import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
+from .. import Spravce_stavu, Ulohy, Utils, Vizualizace
+
+# Maximální počet variant v tabulkách pořadí (výsledky mohou mít desítky tisíc variant),
+# matice v tabulkách a teplotní mapě omezuje už server (Vypocty_analyzy.MAX_VARIANT_DETAILU)
+MAX_ZOBRAZENYCH_VARIANT = 50
 
 
 class Vystup_topsis_komp(Vystup_topsis_kompTemplate):
-  def __init__(self, **properties):
-    # Set Form properties and Data Bindings.
-    self.init_components(**properties)
+    """
+    Formulář pro zobrazení výsledků analýzy metodou TOPSIS
+    (Technique for Order of Preference by Similarity to Ideal Solution).
+    Výpočet probíhá na serveru jako úloha (Ulohy_vypoctu), formulář jen zobrazuje výsledky.
+    """
+    def __init__(self, analyza_id=None, **properties):
+        self.init_components(**properties)
+        # Inicializace správce stavu
+        self.spravce = Spravce_stavu.Spravce_stavu()
+
+        # Použijeme ID z parametrů nebo z aktivní analýzy ve správci
+        self.analyza_id = analyza_id or self.spravce.ziskej_aktivni_analyzu()
+
+        # Aktualizace nadpisu
+        if hasattr(self, 'headline_1'):
+            self.headline_1.text = "Analýza metodou TOPSIS"
+
+    def form_show(self, **event_args):
+        """Načte data analýzy a výsledky TOPSIS při zobrazení formuláře."""
+        if not self.analyza_id:
+            self._zobraz_prazdny_formular()
+            return
+
+        try:
+            Utils.zapsat_info(f"Načítám data analýzy ID: {self.analyza_id}")
+
+            # Hodnotící matici formulář nezobrazuje, stačí název a popis analýzy
+            souhrn = anvil.server.call('nacti_souhrn_analyzy', self.analyza_id)
+
+            topsis_vysledky = self.spravce.ziskej_vysledky(self.analyza_id, 'topsis', pri_prubehu=self._zobraz_prubeh)
+            self._zobraz_vstupni_data(souhrn, topsis_vysledky)
+            self._zobraz_normalizaci(topsis_vysledky)
+            self._zobraz_vysledky(topsis_vysledky)
+
+            Utils.zapsat_info("Výsledky TOPSIS analýzy úspěšně zobrazeny")
+
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při načítání analýzy: {str(e)}")
+            alert(f"Chyba při načítání analýzy: {str(e)}")
+
+    def _zobraz_prubeh(self, prubeh):
+        """Zobrazí průběh výpočtu na serveru místo výsledků."""
+        self.rich_text_vysledek.content = Ulohy.popis_prubehu(prubeh)
+
+    def _zobraz_prazdny_formular(self):
+        """Zobrazí prázdný formulář s informací o chybějících datech."""
+        Utils.zapsat_info("Zobrazuji prázdný formulář TOPSIS - chybí ID analýzy")
+        self.rich_text_vstupni_data.content = "Nepřišlo žádné ID analýzy."
+        self.rich_text_normalizace.content = "Není co počítat."
+        self.rich_text_vysledek.content = "Není co počítat."
+        self.plot_topsis_vysledek.visible = False
+        self.plot_topsis_vazena_matice.visible = False
+
+    def _zobraz_vstupni_data(self, souhrn, vysledky):
+        """
+        Zobrazí vstupní data analýzy v přehledné formě.
+        Kritéria a varianty bere z výsledku ze serveru, celá data analýzy se nenačítají.
+
+        Args:
+            souhrn: Název a popis analýzy (nacti_souhrn_analyzy)
+            vysledky: Výsledky metody ze serveru
+        """
+        try:
+            md = f"""
+### {souhrn['nazev']}
+
+#### Základní informace
+- Metoda: TOPSIS (Technique for Order of Preference by Similarity to Ideal Solution)
+- Popis: {souhrn['popis_analyzy'] or 'Bez popisu'}
+
+#### Kritéria
+| Název kritéria | Typ | Váha |
+|----------------|-----|------|
+"""
+            for nazev_krit, typ, vaha in zip(vysledky['kriteria'], vysledky['typy_kriterii'], vysledky['vahy']):
+                md += f"| {nazev_krit} | {typ.upper()} | {vaha:.3f} |\n"
+
+            varianty = vysledky['varianty']
+            md += f"\n#### Varianty\nPočet variant: {len(varianty)}\n"
+            if len(varianty) <= MAX_ZOBRAZENYCH_VARIANT:
+                for nazev_var in varianty:
+                    md += f"- {nazev_var}\n"
+
+            self.rich_text_vstupni_data.content = md
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při zobrazování vstupních dat: {str(e)}")
+            self.rich_text_vstupni_data.content = f"Chyba při zobrazování vstupních dat: {str(e)}"
+
+    def _zobraz_normalizaci(self, topsis_vysledky):
+        """
+        Zobrazí vektorově normalizovanou matici, vážené hodnoty a ideální řešení.
+
+        Args:
+            topsis_vysledky: Výsledky TOPSIS ze serveru
+        """
+        try:
+            kriteria = topsis_vysledky['kriteria']
+            detail = topsis_vysledky['detail']
+            pocet_variant = len(topsis_vysledky['varianty'])
+
+            md = "### Vektorová normalizace hodnot\n\n"
+            if len(detail['varianty']) < pocet_variant:
+                md += f"*Zobrazeno {len(detail['varianty'])} nejlepších z {pocet_variant} variant.*\n\n"
+
+            md += "#### Normalizovaná matice\n"
+            md += "| Varianta / Krit. | " + " | ".join(kriteria) + " |\n"
+            md += "|" + "-|"*(len(kriteria)+1) + "\n"
+            for varianta, radek in zip(detail['varianty'], detail['normalizovana_matice']):
+                md += f"| {varianta} |" + "".join(f" {hodnota:.4f} |" for hodnota in radek) + "\n"
+
+            md += """
+#### Princip vektorové normalizace:
+
+- Normalizovaná hodnota = hodnota / √(součet čtverců hodnot v daném kritériu)
+- Směr kritéria se normalizací nemění, zohledňuje ho až volba ideálního řešení
+"""
+
+            md += "\n#### Vážená normalizovaná matice\n"
+            md += "| Varianta / Krit. | " + " | ".join(kriteria) + " |\n"
+            md += "|" + "-|"*(len(kriteria)+1) + "\n"
+            for varianta, radek in zip(detail['varianty'], detail['vazena_matice']):
+                md += f"| {varianta} |" + "".join(f" {hodnota:.4f} |" for hodnota in radek) + "\n"
+
+            md += "\n#### Ideální a anti-ideální řešení\n"
+            md += "| | " + " | ".join(kriteria) + " |\n"
+            md += "|" + "-|"*(len(kriteria)+1) + "\n"
+            md += "| Typ |" + "".join(f" {typ.upper()} |" for typ in topsis_vysledky['typy_kriterii']) + "\n"
+            md += "| Ideál (A+) |" + "".join(f" {hodnota:.4f} |" for hodnota in topsis_vysledky['ideal']) + "\n"
+            md += "| Anti-ideál (A-) |" + "".join(f" {hodnota:.4f} |" for hodnota in topsis_vysledky['anti_ideal']) + "\n"
+
+            md += """
+#### Volba ideálního řešení:
+
+- Pro **maximalizační kritéria** je ideálem nejvyšší a anti-ideálem nejnižší vážená hodnota
+- Pro **minimalizační kritéria** je ideálem nejnižší a anti-ideálem nejvyšší vážená hodnota
+"""
+            self.rich_text_normalizace.content = md
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při zobrazování normalizace: {str(e)}")
+            self.rich_text_normalizace.content = f"Chyba při zobrazování normalizace: {str(e)}"
+
+    def _zobraz_vysledky(self, topsis_vysledky):
+        """
+        Zobrazí pořadí variant, vzdálenosti od ideálu a grafy.
+
+        Args:
+            topsis_vysledky: Výsledky TOPSIS ze serveru
+        """
+        try:
+            varianty = topsis_vysledky['varianty']
+            index_variant = {nazev: i for i, nazev in enumerate(varianty)}
+            dist_ideal = topsis_vysledky['vzdalenost_ideal']
+            dist_anti_ideal = topsis_vysledky['vzdalenost_anti_ideal']
+            zobrazene = topsis_vysledky['results'][:MAX_ZOBRAZENYCH_VARIANT]
+
+            md = "### Výsledky analýzy TOPSIS\n\n"
+            md += "#### Pořadí variant\n"
+            md += "| Pořadí | Varianta | D+ | D- | Relativní blízkost C |\n"
+            md += "|---------|----------|----|----|----------------------|\n"
+            for varianta, poradi, skore in zobrazene:
+                i = index_variant[varianta]
+                md += f"| {poradi}. | {varianta} | {dist_ideal[i]:.4f} | {dist_anti_ideal[i]:.4f} | {skore:.4f} |\n"
+            if len(zobrazene) < len(varianty):
+                md += f"\n*Zobrazeno {len(zobrazene)} nejlepších z {len(varianty)} variant.*\n"
+
+            md += f"""
+#### Shrnutí výsledků
+
+- **Nejlepší varianta:** {topsis_vysledky['nejlepsi_varianta']} (C = {topsis_vysledky['nejlepsi_skore']:.4f})
+- **Nejhorší varianta:** {topsis_vysledky['nejhorsi_varianta']} (C = {topsis_vysledky['nejhorsi_skore']:.4f})
+
+#### O metodě TOPSIS
+
+TOPSIS hodnotí varianty podle jejich vzdálenosti od ideálního a anti-ideálního řešení.
+
+**Princip metody:**
+1. Vektorová normalizace hodnot kritérií
+2. Vynásobení normalizovaných hodnot vahami kritérií
+3. Určení ideálního (A+) a anti-ideálního (A-) řešení podle směru kritérií
+4. Výpočet euklidovských vzdáleností D+ a D- každé varianty
+5. Relativní blízkost C = D- / (D+ + D-), vyšší je lepší
+
+**Výhody metody:**
+- Zohledňuje nejlepší i nejhorší možné řešení
+- Výsledek má jasnou geometrickou interpretaci
+- Vhodná i pro velký počet variant
+
+**Omezení metody:**
+- Euklidovská vzdálenost předpokládá kompenzaci mezi kritérii
+- Přidání nebo odebrání varianty může změnit ideál a tím i pořadí ostatních variant
+"""
+            self.rich_text_vysledek.content = md
+
+            self.plot_topsis_vysledek.figure = Vizualizace.vytvor_sloupovy_graf_vysledku(
+                zobrazene,
+                topsis_vysledky['nejlepsi_varianta'],
+                topsis_vysledky['nejhorsi_varianta'],
+                "TOPSIS"
+            )
+            self.plot_topsis_vysledek.visible = True
+
+            detail = topsis_vysledky['detail']
+            self.plot_topsis_vazena_matice.figure = Vizualizace.vytvor_heat_mapu(
+                detail['varianty'],
+                topsis_vysledky['kriteria'],
+                detail['vazena_matice'],
+                "TOPSIS (vážená normalizovaná matice)"
+            )
+            self.plot_topsis_vazena_matice.visible = True
 
-    # Any code you write here will run before the form opens.
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při zobrazování výsledků: {str(e)}")
+            self.rich_text_vysledek.content = f"Chyba při zobrazování výsledků: {str(e)}"
+            self.plot_topsis_vysledek.visible = False
+            self.plot_topsis_vazena_matice.visible = False
@@ -5,11 +5,144 @@ import anvil.users
 import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
+from .. import Spravce_stavu, Ulohy, Utils, Vypocty, Vizualizace
+
+# Maximální počet variant v tabulce pořadí a grafu
+MAX_ZOBRAZENYCH_VARIANT = 50
 
 
 class Vystup_wpm_komp(Vystup_wpm_kompTemplate):
-  def __init__(self, **properties):
-    # Set Form properties and Data Bindings.
-    self.init_components(**properties)
+    """
+    Formulář pro zobrazení výsledků analýzy metodou WPM (Weighted Product Model).
+    Skóre počítá server společně s ostatními metodami (vypocitej_vysledky_metod),
+    formulář jen zobrazuje výsledky.
+    """
+    def __init__(self, analyza_id=None, **properties):
+        self.init_components(**properties)
+        # Inicializace správce stavu
+        self.spravce = Spravce_stavu.Spravce_stavu()
+
+        # Použijeme ID z parametrů nebo z aktivní analýzy ve správci
+        self.analyza_id = analyza_id or self.spravce.ziskej_aktivni_analyzu()
+
+        # Aktualizace nadpisu
+        if hasattr(self, 'headline_1'):
+            self.headline_1.text = "Analýza metodou WPM (Weighted Product Model)"
+
+    def form_show(self, **event_args):
+        """Načte souhrn analýzy a výsledky WPM při zobrazení formuláře."""
+        if not self.analyza_id:
+            self._zobraz_prazdny_formular()
+            return
+
+        try:
+            Utils.zapsat_info(f"Načítám data analýzy ID: {self.analyza_id}")
+
+            # Hodnotící matici formulář nezobrazuje, stačí název a popis analýzy
+            souhrn = anvil.server.call('nacti_souhrn_analyzy', self.analyza_id)
+
+            vysledky_metod = self.spravce.ziskej_vysledky(self.analyza_id, 'vysledky_metod', {'metody': ['wpm']},
+                                                          pri_prubehu=self._zobraz_prubeh)
+            self._zobraz_vstupni_data(souhrn, vysledky_metod)
+            self._zobraz_vysledky(vysledky_metod)
+
+            Utils.zapsat_info("Výsledky WPM analýzy úspěšně zobrazeny")
+
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při načítání analýzy: {str(e)}")
+            alert(f"Chyba při načítání analýzy: {str(e)}")
+
+    def _zobraz_prubeh(self, prubeh):
+        """Zobrazí průběh výpočtu na serveru místo výsledků."""
+        self.rich_text_vysledek.content = Ulohy.popis_prubehu(prubeh)
+
+    def _zobraz_prazdny_formular(self):
+        """Zobrazí prázdný formulář s informací o chybějících datech."""
+        Utils.zapsat_info("Zobrazuji prázdný formulář WPM - chybí ID analýzy")
+        self.rich_text_vstupni_data.content = "Nepřišlo žádné ID analýzy."
+        self.rich_text_vysledek.content = "Není co počítat."
+        self.plot_wpm_vysledek.visible = False
+
+    def _zobraz_vstupni_data(self, souhrn, vysledky_metod):
+        """
+        Zobrazí název, popis, kritéria a počet variant analýzy.
+
+        Args:
+            souhrn: Název a popis analýzy (nacti_souhrn_analyzy)
+            vysledky_metod: Výsledek vypocitej_vysledky_metod s metodou 'wpm'
+        """
+        try:
+            varianty = vysledky_metod['varianty']
+            md = f"""
+### {souhrn['nazev']}
+
+#### Základní informace
+- Metoda: WPM (Weighted Product Model)
+- Popis: {souhrn['popis_analyzy'] or 'Bez popisu'}
+- Kritéria: {', '.join(vysledky_metod['kriteria'])}
+- Počet variant: {len(varianty)}
+"""
+            self.rich_text_vstupni_data.content = md
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při zobrazování vstupních dat: {str(e)}")
+            self.rich_text_vstupni_data.content = f"Chyba při zobrazování vstupních dat: {str(e)}"
+
+    def _zobraz_vysledky(self, vysledky_metod):
+        """
+        Zobrazí pořadí variant a graf skóre.
+
+        Args:
+            vysledky_metod: Výsledek vypocitej_vysledky_metod s metodou 'wpm'
+        """
+        try:
+            # Lineární skóre, které přeteklo rozsah čísel, posílá server jako None;
+            # pak se zobrazuje logaritmus skóre (pořadí se podle něj určuje vždy)
+            logaritmicke = vysledky_metod['metody']['wpm']['nejlepsi_skore'] is None
+            nazev_skore = "ln(skóre)" if logaritmicke else "skóre"
+            wpm_vysledky = Vypocty.vysledky_ze_serveru(vysledky_metod, 'wpm',
+                                                       'log_skore' if logaritmicke else 'skore')
+            pocet_variant = len(vysledky_metod['varianty'])
+            zobrazene = wpm_vysledky['results'][:MAX_ZOBRAZENYCH_VARIANT]
+
+            md = "### Výsledky analýzy WPM (Weighted Product Model)\n\n"
+            if logaritmicke:
+                md += "*Skóre je mimo rozsah čísel, zobrazuje se jeho přirozený logaritmus.*\n\n"
+            md += "#### Pořadí variant\n"
+            md += f"| Pořadí | Varianta | {'ln(skóre)' if logaritmicke else 'Skóre'} |\n"
+            md += "|---------|----------|--------|\n"
+            for varianta, poradi, skore in zobrazene:
+                md += f"| {poradi}. | {varianta} | {skore:.4g} |\n"
+            if len(zobrazene) < pocet_variant:
+                md += f"\n*Zobrazeno {len(zobrazene)} nejlepších z {pocet_variant} variant.*\n"
+
+            md += f"""
+#### Shrnutí výsledků
+
+- **Nejlepší varianta:** {wpm_vysledky['nejlepsi_varianta']} ({nazev_skore}: {wpm_vysledky['nejlepsi_skore']:.4g})
+- **Nejhorší varianta:** {wpm_vysledky['nejhorsi_varianta']} ({nazev_skore}: {wpm_vysledky['nejhorsi_skore']:.4g})
+
+#### O metodě WPM (Weighted Product Model)
+
+**Princip metody:**
+1. Skóre varianty je součin hodnot kritérií umocněných na váhy (u minimalizačních kritérií na zápornou váhu)
+2. Nekladné hodnoty se před výpočtem nahradí malou kladnou hodnotou
+3. Varianty se řadí podle skóre (vyšší je lepší), server počítá v logaritmech, aby součin nepřetekl
+
+**Výhody metody:**
+- Nezávisí na jednotkách kritérií, nevyžaduje normalizaci
+- Omezuje kompenzaci špatné hodnoty jednoho kritéria ostatními
+"""
+            self.rich_text_vysledek.content = md
+
+            self.plot_wpm_vysledek.figure = Vizualizace.vytvor_sloupovy_graf_vysledku(
+                zobrazene,
+                wpm_vysledky['nejlepsi_varianta'],
+                wpm_vysledky['nejhorsi_varianta'],
+                "WPM"
+            )
+            self.plot_wpm_vysledek.visible = True
 
-    # Any code you write here will run before the form opens.
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při zobrazování výsledků: {str(e)}")
+            self.rich_text_vysledek.content = f"Chyba při zobrazování výsledků: {str(e)}"
+            self.plot_wpm_vysledek.visible = False
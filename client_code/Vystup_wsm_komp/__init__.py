@@ -5,13 +5,17 @@ import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
 import anvil.users
-from .. import Spravce_stavu, Utils, Vypocty, Vizualizace
+from .. import Spravce_stavu, Ulohy, Utils, Vizualizace
+
+# Maximální počet variant v tabulce pořadí a grafech (výsledky mohou mít desítky tisíc variant),
+# normalizovanou a váženou matici omezuje už server (Vypocty_analyzy.MAX_VARIANT_DETAILU)
+MAX_ZOBRAZENYCH_VARIANT = 50
 
 
 class Vystup_wsm_komp(Vystup_wsm_kompTemplate):
     """
     Formulář pro zobrazení výsledků WSM analýzy (Weighted Sum Model).
-    Využívá sdílené moduly pro výpočty a vizualizace.
+    Výpočet probíhá na serveru jako úloha (Ulohy_vypoctu), formulář jen zobrazuje výsledky.
     """
     def __init__(self, analyza_id=None, **properties):
         self.init_components(**properties)
@@ -34,11 +38,14 @@ class Vystup_wsm_komp(Vystup_wsm_kompTemplate):
         try:
             Utils.zapsat_info(f"Načítám data analýzy ID: {self.analyza_id}")
             
-            # Načtení dat analýzy z JSON struktury
-            analyza_data = anvil.server.call('nacti_analyzu', self.analyza_id)
+            # Hodnotící matici formulář nezobrazuje, stačí název a popis analýzy
+            souhrn = anvil.server.call('nacti_souhrn_analyzy', self.analyza_id)
+            
+            # Skóre i mezivýsledky počítá server, opakované zobrazení jen čte výsledek z cache
+            wsm_vysledky = self.spravce.ziskej_vysledky(self.analyza_id, 'wsm', pri_prubehu=self._zobraz_prubeh)
             
             # Zobrazení výsledků
-            self._zobraz_kompletni_analyzu(analyza_data)
+            self._zobraz_kompletni_analyzu(souhrn, wsm_vysledky)
             
             Utils.zapsat_info("Výsledky WSM analýzy úspěšně zobrazeny")
             
@@ -46,6 +53,10 @@ class Vystup_wsm_komp(Vystup_wsm_kompTemplate):
             Utils.zapsat_chybu(f"Chyba při načítání analýzy: {str(e)}")
             alert(f"Chyba při načítání analýzy: {str(e)}")
 
+    def _zobraz_prubeh(self, prubeh):
+        """Zobrazí průběh výpočtu na serveru místo výsledků."""
+        self.rich_text_vysledek.content = Ulohy.popis_prubehu(prubeh)
+
     def _zobraz_prazdny_formular(self):
         """Zobrazí prázdný formulář s informací o chybějících datech."""
         Utils.zapsat_info("Zobrazuji prázdný formulář WSM - chybí ID analýzy")
@@ -54,49 +65,23 @@ class Vystup_wsm_komp(Vystup_wsm_kompTemplate):
         self.rich_text_vysledek.content = "Není co počítat."
         self.plot_wsm_vysledek.visible = False
 
-    def _zobraz_kompletni_analyzu(self, analyza_data):
+    def _zobraz_kompletni_analyzu(self, souhrn, wsm_vysledky):
         """
         Zobrazí kompletní analýzu včetně všech výpočtů.
         
         Args:
-            analyza_data: Slovník s daty analýzy v JSON formátu
+            souhrn: Název a popis analýzy (nacti_souhrn_analyzy)
+            wsm_vysledky: Výsledky WSM ze serveru (vypocitej_wsm)
         """
         # Zobrazení vstupních dat
-        self._zobraz_vstupni_data(analyza_data)
+        self._zobraz_vstupni_data(souhrn, wsm_vysledky)
         
-        # Provedení výpočtů
         try:
-            # Využití sdílených funkcí z modulu Vypocty
-            matice, typy_kriterii, varianty, kriteria, vahy = Vypocty.priprav_data_z_json(analyza_data)
-            
-            # Normalizace matice
-            norm_vysledky = Vypocty.normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria)
-            
-            # Výpočet vážených hodnot
-            vazene_matice = Vypocty.vypocitej_vazene_hodnoty(
-                norm_vysledky['normalizovana_matice'], 
-                vahy
-            )
-            
-            # Výpočet WSM výsledků
-            wsm_vysledky = Vypocty.wsm_vypocet(
-                norm_vysledky['normalizovana_matice'], 
-                vahy, 
-                varianty
-            )
-            
-            # Uložení dat pro další použití
-            self._data_pro_grafy = {
-                'norm_vysledky': norm_vysledky,
-                'vazene_matice': vazene_matice,
-                'vahy': vahy,
-                'wsm_vysledky': wsm_vysledky
-            }
-            
-            # Zobrazení výsledků
-            self._zobraz_normalizaci(norm_vysledky['normalizovana_matice'], vazene_matice, vahy, norm_vysledky['nazvy_kriterii'], norm_vysledky['nazvy_variant'])
+            detail = wsm_vysledky['detail']
+            self._zobraz_normalizaci(detail['normalizovana_matice'], detail['vazena_matice'], wsm_vysledky['vahy'],
+                                     wsm_vysledky['kriteria'], detail['varianty'], len(wsm_vysledky['varianty']))
             self._zobraz_vysledky(wsm_vysledky)
-            self._zobraz_citlivostni_analyzu(norm_vysledky['normalizovana_matice'], vahy, norm_vysledky['nazvy_variant'], norm_vysledky['nazvy_kriterii'])
+            self._zobraz_citlivostni_analyzu(wsm_vysledky['varianty'], wsm_vysledky['kriteria'])
             
         except Exception as e:
             Utils.zapsat_chybu(f"Chyba při výpočtu WSM výsledků: {str(e)}")
@@ -106,67 +91,59 @@ class Vystup_wsm_komp(Vystup_wsm_kompTemplate):
             if hasattr(self, 'rich_text_citlivost'):
                 self.rich_text_citlivost.visible = False
 
-    def _zobraz_vstupni_data(self, analyza_data):
-        """Zobrazí vstupní data analýzy v přehledné formě."""
+    def _zobraz_vstupni_data(self, souhrn, vysledky):
+        """
+        Zobrazí vstupní data analýzy v přehledné formě.
+        Kritéria a varianty bere z výsledku ze serveru, celá data analýzy se nenačítají.
+        
+        Args:
+            souhrn: Název a popis analýzy (nacti_souhrn_analyzy)
+            vysledky: Výsledky WSM ze serveru
+        """
         try:
             md = f"""
-### {analyza_data['nazev']}
+### {souhrn['nazev']}
 
 #### Základní informace
 - Metoda: WSM (Weighted Sum Model)
-- Popis: {analyza_data.get('popis_analyzy', 'Bez popisu')}
+- Popis: {souhrn['popis_analyzy'] or 'Bez popisu'}
 
 #### Kritéria
 | Název kritéria | Typ | Váha |
 |----------------|-----|------|
 """
             # Přidání kritérií
-            kriteria = analyza_data.get('kriteria', {})
-            for nazev_krit, krit_data in kriteria.items():
-                vaha = float(krit_data['vaha'])
-                md += f"| {nazev_krit} | {krit_data['typ'].upper()} | {vaha:.3f} |\n"
+            for nazev_krit, typ, vaha in zip(vysledky['kriteria'], vysledky['typy_kriterii'], vysledky['vahy']):
+                md += f"| {nazev_krit} | {typ.upper()} | {vaha:.3f} |\n"
 
             # Varianty
-            md += "\n#### Varianty\n"
-            varianty = analyza_data.get('varianty', {})
-            for nazev_var, var_data in varianty.items():
-                popis = f" - {var_data.get('popis_varianty', '')}" if var_data.get('popis_varianty') else ""
-                md += f"- {nazev_var}{popis}\n"
-
-            # Hodnotící matice
-            kriteria_nazvy = list(kriteria.keys())
-            varianty_nazvy = list(varianty.keys())
-            
-            md += "\n#### Hodnotící matice\n"
-            md += f"| Kritérium | {' | '.join(varianty_nazvy)} |\n"
-            md += f"|{'-' * 10}|{('|'.join('-' * 12 for _ in varianty_nazvy))}|\n"
-            
-            for nazev_krit in kriteria_nazvy:
-                radek = f"| {nazev_krit} |"
-                for nazev_var in varianty_nazvy:
-                    hodnota = varianty[nazev_var].get(nazev_krit, "N/A")
-                    hodnota = f" {hodnota:.2f} |" if isinstance(hodnota, (int, float)) else f" {hodnota} |"
-                    radek += hodnota
-                md += radek + "\n"
+            varianty = vysledky['varianty']
+            md += f"\n#### Varianty\nPočet variant: {len(varianty)}\n"
+            if len(varianty) <= MAX_ZOBRAZENYCH_VARIANT:
+                for nazev_var in varianty:
+                    md += f"- {nazev_var}\n"
 
             self.rich_text_vstupni_data.content = md
         except Exception as e:
             Utils.zapsat_chybu(f"Chyba při zobrazování vstupních dat: {str(e)}")
             self.rich_text_vstupni_data.content = f"Chyba při zobrazování vstupních dat: {str(e)}"
 
-    def _zobraz_normalizaci(self, norm_matice, vazene_matice, vahy, kriteria, varianty):
+    def _zobraz_normalizaci(self, norm_matice, vazene_matice, vahy, kriteria, varianty, pocet_variant):
         """
         Zobrazí normalizovanou matici a vážené hodnoty.
         
         Args:
-            norm_matice: 2D list normalizovaných hodnot
-            vazene_matice: 2D list vážených hodnot
+            norm_matice: 2D list normalizovaných hodnot (nejlepší varianty)
+            vazene_matice: 2D list vážených hodnot (nejlepší varianty)
             vahy: List vah kritérií
             kriteria: Seznam názvů kritérií
-            varianty: Seznam názvů variant
+            varianty: Seznam názvů zobrazených variant
+            pocet_variant: Celkový počet variant analýzy
         """
         try:
             md = "### Normalizace hodnot metodou Min-Max\n\n"
+            if len(varianty) < pocet_variant:
+                md += f"*Zobrazeno {len(varianty)} nejlepších z {pocet_variant} variant.*\n\n"
             
             # Normalizační tabulka
             md += "#### Normalizovaná matice\n"
@@ -249,10 +226,14 @@ Kde:
             md += "|---------|----------|--------|------------|\n"
             
             max_skore = wsm_vysledky['nejlepsi_skore']
+            pocet_variant = len(wsm_vysledky['results'])
+            zobrazene = wsm_vysledky['results'][:MAX_ZOBRAZENYCH_VARIANT]
             
-            for varianta, poradi, skore in wsm_vysledky['results']:
+            for varianta, poradi, skore in zobrazene:
                 procento = (skore / max_skore) * 100 if max_skore > 0 else 0
                 md += f"| {poradi}. | {varianta} | {skore:.3f} | {procento:.1f}% |\n"
+            if len(zobrazene) < pocet_variant:
+                md += f"\n*Zobrazeno {len(zobrazene)} nejlepších z {pocet_variant} variant.*\n"
 
             # Shrnutí výsledků
             md += f"""
@@ -287,20 +268,20 @@ WSM, také známý jako Simple Additive Weighting (SAW), je jedna z nejjednoduš
 
             # Přidání základního grafu skóre s využitím sdíleného modulu vizualizace
             self.plot_wsm_vysledek.figure = Vizualizace.vytvor_sloupovy_graf_vysledku(
-                wsm_vysledky['results'], 
+                zobrazene, 
                 wsm_vysledky['nejlepsi_varianta'], 
                 wsm_vysledky['nejhorsi_varianta'], 
                 "WSM"
             )
             self.plot_wsm_vysledek.visible = True
 
-            # Přidání grafu skladby skóre 
+            # Přidání grafu skladby skóre (vážené hodnoty nejlepších variant)
             if hasattr(self, 'plot_wsm_skladba'):
-                data = self._data_pro_grafy
+                detail = wsm_vysledky['detail']
                 self.plot_wsm_skladba.figure = Vizualizace.vytvor_skladany_sloupovy_graf(
-                    data['norm_vysledky']['nazvy_variant'],
-                    data['norm_vysledky']['nazvy_kriterii'],
-                    data['vazene_matice']
+                    detail['varianty'],
+                    wsm_vysledky['kriteria'],
+                    detail['vazena_matice']
                 )
                 self.plot_wsm_skladba.visible = True
             
@@ -309,13 +290,12 @@ WSM, také známý jako Simple Additive Weighting (SAW), je jedna z nejjednoduš
             self.rich_text_vysledek.content = f"Chyba při zobrazování výsledků: {str(e)}"
             self.plot_wsm_vysledek.visible = False
 
-    def _zobraz_citlivostni_analyzu(self, norm_matice, vahy, varianty, kriteria):
+    def _zobraz_citlivostni_analyzu(self, varianty, kriteria):
         """
         Zobrazí analýzu citlivosti včetně textu a grafů.
+        Výběr kritéria nabízí drop_down_citlivost, výpočet probíhá na serveru.
         
         Args:
-            norm_matice: 2D list normalizovaných hodnot
-            vahy: Seznam vah kritérií
             varianty: Seznam názvů variant
             kriteria: Seznam názvů kritérií
         """
@@ -330,7 +310,7 @@ WSM, také známý jako Simple Additive Weighting (SAW), je jedna z nejjednoduš
 ### Analýza citlivosti vah kritérií
 
 Analýza citlivosti umožňuje posoudit, jak změna váhy vybraného kritéria ovlivní celkové hodnocení variant. 
-V grafech níže je znázorněno, jak by se změnilo celkové skóre a pořadí variant při různých vahách prvního kritéria. 
+V grafech níže je znázorněno, jak by se změnilo celkové skóre a pořadí variant při různých vahách kritéria zvoleného v nabídce. 
 Ostatní váhy jsou vždy proporcionálně upraveny, aby součet všech vah zůstal roven 1.
 
 **Interpretace analýzy citlivosti:**
@@ -342,26 +322,15 @@ Ostatní váhy jsou vždy proporcionálně upraveny, aby součet všech vah zůs
 """
             self.rich_text_citlivost.content = citlivost_md
             
-            # Výpočet analýzy citlivosti pro první kritérium s využitím sdílené funkce
-            analyza_citlivosti = Vypocty.vypocitej_analyzu_citlivosti(
-                norm_matice, 
-                vahy, 
-                varianty, 
-                kriteria
-            )
+            # Výsledky citlivosti podle indexu kritéria - každé kritérium se počítá jen jednou
+            self._citlivost_kriterii = {}
+            self._citlivost_varianty = varianty
             
-            # Zobrazení grafů s využitím sdílených funkcí vizualizace
-            if hasattr(self, 'plot_citlivost_skore'):
-                self.plot_citlivost_skore.figure = Vizualizace.vytvor_graf_citlivosti_skore(
-                    analyza_citlivosti, varianty)
-                self.plot_citlivost_skore.visible = True
+            if hasattr(self, 'drop_down_citlivost'):
+                self.drop_down_citlivost.items = [(nazev, j) for j, nazev in enumerate(kriteria)]
+                self.drop_down_citlivost.selected_value = 0
             
-            if hasattr(self, 'plot_citlivost_poradi'):
-                self.plot_citlivost_poradi.figure = Vizualizace.vytvor_graf_citlivosti_poradi(
-                    analyza_citlivosti, varianty)
-                self.plot_citlivost_poradi.visible = True
-            
-            Utils.zapsat_info("Citlivostní analýza úspěšně zobrazena")
+            self._vykresli_citlivost(0)
             
         except Exception as e:
             Utils.zapsat_chybu(f"Chyba při zobrazování analýzy citlivosti: {str(e)}")
@@ -370,4 +339,40 @@ Ostatní váhy jsou vždy proporcionálně upraveny, aby součet všech vah zůs
             if hasattr(self, 'plot_citlivost_skore'):
                 self.plot_citlivost_skore.visible = False
             if hasattr(self, 'plot_citlivost_poradi'):
-                self.plot_citlivost_poradi.visible = False
\ No newline at end of file
+                self.plot_citlivost_poradi.visible = False
+
+    def _vykresli_citlivost(self, index_kriteria):
+        """
+        Vykreslí grafy citlivosti pro zvolené kritérium.
+        
+        Args:
+            index_kriteria: Index kritéria, jehož váha se mění
+        """
+        analyza_citlivosti = self._citlivost_kriterii.get(index_kriteria)
+        if analyza_citlivosti is None:
+            vysledek = anvil.server.call('vypocitej_citlivost_kriterii', self.analyza_id, [index_kriteria])
+            analyza_citlivosti = vysledek['analyzy'][0]
+            self._citlivost_kriterii[index_kriteria] = analyza_citlivosti
+        
+        varianty = self._citlivost_varianty
+        
+        # Zobrazení grafů s využitím sdílených funkcí vizualizace
+        if hasattr(self, 'plot_citlivost_skore'):
+            self.plot_citlivost_skore.figure = Vizualizace.vytvor_graf_citlivosti_skore(
+                analyza_citlivosti, varianty)
+            self.plot_citlivost_skore.visible = True
+        
+        if hasattr(self, 'plot_citlivost_poradi'):
+            self.plot_citlivost_poradi.figure = Vizualizace.vytvor_graf_citlivosti_poradi(
+                analyza_citlivosti, varianty)
+            self.plot_citlivost_poradi.visible = True
+        
+        Utils.zapsat_info(f"Citlivostní analýza zobrazena pro kritérium {analyza_citlivosti['zvolene_kriterium']}")
+
+    def drop_down_citlivost_change(self, **event_args):
+        """Překreslí analýzu citlivosti pro nově zvolené kritérium."""
+        try:
+            self._vykresli_citlivost(self.drop_down_citlivost.selected_value)
+        except Exception as e:
+            Utils.zapsat_chybu(f"Chyba při zobrazování analýzy citlivosti: {str(e)}")
+            alert(f"Chyba při zobrazování analýzy citlivosti: {str(e)}")
@@ -35,6 +35,9 @@ class Matice_krit(Matice_kritTemplate):
             
             # Aktualizujeme zobrazení
             self.text_box_matice_hodnota.text = str(hodnota)
+            
+            # Wizard přepočítá živý náhled pořadí (panel Matice_var ve Wizardu)
+            self.parent.parent.parent.raise_event('x-zmena-hodnoty')
     except ValueError:
         # Zobrazíme chybu, pokud hodnota není validní číslo
         alert("Hodnota musí být číslo")
@@ -11,7 +11,10 @@ import anvil.tables.query as q
 from anvil.tables import app_tables
 import anvil.users
 from .. import Navigace, Konstanty, Spravce_stavu, Utils
+from ..Matice_analyzy import Matice_analyzy
 
+# Počet variant v živém náhledu pořadí v kroku 4
+MAX_VARIANT_NAHLEDU = 10
 
 class Wizard_komp(Wizard_kompTemplate):
   def __init__(self, mode=Konstanty.STAV_ANALYZY['NOVY'], **properties):
@@ -33,6 +36,7 @@ class Wizard_komp(Wizard_kompTemplate):
     # Event handlery pro repeating panely
     self.repeating_panel_kriteria.set_event_handler('x-refresh', self.nacti_kriteria)
     self.repeating_panel_varianty.set_event_handler('x-refresh', self.nacti_varianty)
+    self.Matice_var.set_event_handler('x-zmena-hodnoty', self.zobraz_nahled_poradi)
 
     if self.mode == Konstanty.STAV_ANALYZY['UPRAVA']: 
         self.load_existing_analyza()
@@ -78,6 +82,9 @@ class Wizard_komp(Wizard_kompTemplate):
                     if nazev_krit != "popis_varianty" and nazev_krit in kriteria:
                         self.spravce.uloz_hodnotu_varianty(nazev_var, nazev_krit, hodnota)
             
+            # Další úpravy se budou ukládat jako dílčí změny
+            self.spravce.zacni_sledovat_zmeny()
+            
             # Nastavení polí formuláře z dat ve správci stavu
             self.text_box_nazev.text = self.spravce.ziskej_nazev()
             self.text_area_popis.text = self.spravce.ziskej_popis()
@@ -268,22 +275,18 @@ class Wizard_komp(Wizard_kompTemplate):
 
   def zobraz_krok_4(self, **event_args):
     """Naplní RepeatingPanel (Matice_var) daty pro zadání matice hodnot."""
-    varianty = self.spravce.ziskej_varianty()
-    kriteria = self.spravce.ziskej_kriteria()
-    
+    matice = Matice_analyzy.z_json({
+        'kriteria': self.spravce.ziskej_kriteria(),
+        'varianty': self.spravce.ziskej_varianty()
+    })
+    # Dosud nezadané hodnoty zůstávají v matici prázdné
     matice_data = []
-    for nazev_var, var_data in varianty.items():
-        kriteria_pro_variantu = []
-        
-        for nazev_krit, krit_data in kriteria.items():
-            # Získáme hodnotu pro toto kritérium a variantu
-            hodnota = var_data.get(nazev_krit, '')
-            
-            kriteria_pro_variantu.append({
-                'nazev_kriteria': nazev_krit,
-                'id_kriteria': nazev_krit,
-                'hodnota': hodnota
-            })
+    for i, nazev_var in enumerate(matice.varianty):
+        kriteria_pro_variantu = [{
+            'nazev_kriteria': nazev_krit,
+            'id_kriteria': nazev_krit,
+            'hodnota': '' if matice.je_chybejici(i, j) else matice.hodnota(i, j)
+        } for j, nazev_krit in enumerate(matice.kriteria)]
 
         matice_data.append({
             'nazev_varianty': nazev_var,
@@ -292,6 +295,26 @@ class Wizard_komp(Wizard_kompTemplate):
         })
 
     self.Matice_var.items = matice_data
+    self.zobraz_nahled_poradi()
+
+  def zobraz_nahled_poradi(self, **event_args):
+    """Zobrazí průběžné WSM pořadí variant podle dosud zadaných hodnot matice."""
+    nahled = self.spravce.ziskej_nahled_poradi()
+    if not nahled:
+        self.rich_text_nahled_poradi.visible = False
+        return
+
+    zobrazene = nahled['results'][:MAX_VARIANT_NAHLEDU]
+    md = "#### Průběžné pořadí (WSM)\n"
+    md += "| Pořadí | Varianta | Skóre |\n"
+    md += "|---------|----------|--------|\n"
+    for varianta, poradi, skore in zobrazene:
+        md += f"| {poradi}. | {varianta} | {skore:.3f} |\n"
+    if len(zobrazene) < len(nahled['results']):
+        md += f"\n*Zobrazeno {len(zobrazene)} nejlepších z {len(nahled['results'])} variant.*\n"
+
+    self.rich_text_nahled_poradi.content = md
+    self.rich_text_nahled_poradi.visible = True
 
   def button_ulozit_4_click(self, **event_args):
     """Uloží kompletní analýzu na server, pokud je matice validní."""
@@ -2,14 +2,17 @@
 # Modul: CRUD_analyzy
 #
 # Modul obsahuje základní operace pro práci s analýzami v novém JSON formátu:
-# - Create: vytvoření nové analýzy (vytvor_analyzu)
-# - Read: načtení analýzy podle ID (nacti_analyzu)
-# - Update: aktualizace existující analýzy (uprav_analyzu)
+# - Create: vytvoření nové analýzy (vytvor_analyzu), rovnou s daty (vytvor_analyzu_s_daty)
+# - Read: načtení analýzy podle ID (nacti_analyzu), jen názvu a souhrnu bez dat (nacti_souhrn_analyzy)
+# - Update: aktualizace existující analýzy (uprav_analyzu), dílčí změny (uprav_analyzu_zmenami)
 # - Delete: smazání analýzy (smaz_analyzu)
 #
 # Pomocné funkce:
 # - validuj_nazev_analyzy: Kontrola platnosti názvu analýzy
 # - validuj_data_analyzy: Kontrola struktury JSON dat analýzy
+# - validuj_matici_analyzy: Kontrola dat analýzy předaných jako Matice_analyzy
+# - nacti_analyzu_pro_upravu: Načtení analýzy s kontrolou oprávnění k úpravě
+# - proved_zmenu: Jedna dílčí úprava dat s validací dotčených položek
 # - handle_errors: Dekorátor pro jednotné zachytávání a logování chyb
 # -------------------------------------------------------
 import datetime
@@ -22,6 +25,9 @@ import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
 
+from . import Cache_vysledku, Uloziste_analyz
+from .Matice_analyzy import Matice_analyzy
+
 # ============= Pomocné funkce pro error handling =============
 
 def zapsat_info(zprava):
@@ -47,6 +53,42 @@ def handle_errors(func):
             raise ValueError(zprava) from e
     return wrapper
 
+# Dílčí úpravy pro uprav_analyzu_zmenami (Konstanty.OPERACE_UPRAVY)
+OPERACE_UPRAVY = ("nastav_hodnotu", "pridej_kriterium", "uprav_kriterium", "odeber_kriterium",
+                  "pridej_variantu", "uprav_variantu", "odeber_variantu", "nastav_popis")
+OPERACE_MENICI_VAHY = {"pridej_kriterium", "uprav_kriterium", "odeber_kriterium"}
+
+# Souhrnné sloupce analýzy pro seznamy (udržuje Uloziste_analyz a Cache_vysledku)
+SLOUPCE_SOUHRNU = ("popis", "pocet_kriterii", "pocet_variant", "velikost_dat",
+                   "posledni_vitez", "posledni_metoda")
+
+# Povolené typy kritérií (Konstanty.TYP_KRITERIA)
+TYPY_KRITERII = ("max", "min")
+
+def nacti_analyzu_pro_upravu(analyza_id: str):
+    """
+    Načte řádek analýzy a ověří, že ji přihlášený uživatel smí upravit.
+    
+    Args:
+        analyza_id: ID analýzy
+        
+    Returns:
+        Row: Řádek tabulky analyzy
+        
+    Raises:
+        ValueError: Pokud analýza neexistuje nebo ji uživatel nesmí upravit
+    """
+    analyza = app_tables.analyzy.get_by_id(analyza_id)
+    if not analyza:
+        raise ValueError(f"Analýza s ID {analyza_id} neexistuje.")
+    
+    # Kontrola, zda má uživatel právo upravovat analýzu
+    aktualni_uzivatel = anvil.users.get_user()
+    if (aktualni_uzivatel != analyza["uzivatel"] and 
+        not (aktualni_uzivatel and aktualni_uzivatel.get("role") == "admin")):
+        raise ValueError("Nemáte oprávnění upravit tuto analýzu.")
+    return analyza
+
 # =============== Validační funkce ===============
 
 def validuj_nazev_analyzy(nazev: str) -> None:
@@ -64,16 +106,57 @@ def validuj_nazev_analyzy(nazev: str) -> None:
     if len(nazev) > 100:  # Konstanty.VALIDACE['MAX_DELKA_NAZEV']
         raise ValueError("Název analýzy je příliš dlouhý (max 100 znaků).")
 
+def _validuj_soucet_vah(vahy) -> None:
+    """
+    Zkontroluje, že součet vah kritérií je 1.
+    
+    Args:
+        vahy: Váhy kritérií
+        
+    Raises:
+        ValueError: Pokud váhy nejsou čísla nebo jejich součet není 1
+    """
+    try:
+        vahy_suma = sum(float(vaha) for vaha in vahy)
+    except (ValueError, TypeError):
+        raise ValueError("Neplatná hodnota váhy u některého z kritérií.")
+    if abs(vahy_suma - 1.0) > 0.001:  # Konstanty.VALIDACE['TOLERANCE_SOUCTU_VAH']
+        raise ValueError(f"Součet vah musí být 1.0 (aktuálně: {vahy_suma:.3f}).")
+
+def validuj_matici_analyzy(matice: Matice_analyzy) -> None:
+    """
+    Validuje data analýzy předaná jako Matice_analyzy.
+    Struktura je daná třídou, kontrolují se jen počty, váhy a chybějící hodnoty.
+    
+    Args:
+        matice: Matice analýzy k validaci
+        
+    Raises:
+        ValueError: Pokud data nejsou validní
+    """
+    if not matice.pocet_kriterii:
+        raise ValueError("Analýza musí obsahovat alespoň jedno kritérium.")
+    _validuj_soucet_vah(matice.vahy)
+    if not matice.pocet_variant:
+        raise ValueError("Analýza musí obsahovat alespoň jednu variantu.")
+    
+    for i, j in matice.chybejici:
+        zapsat_info(f"Upozornění: Varianta '{matice.varianty[i]}' neobsahuje hodnotu pro kritérium '{matice.kriteria[j]}'")
+
 def validuj_data_analyzy(data: Dict) -> None:
     """
     Validuje strukturu dat analýzy v novém formátu.
     
     Args:
-        data: Data analýzy k validaci
+        data: Data analýzy k validaci (slovník data_json nebo Matice_analyzy)
         
     Raises:
         ValueError: Pokud data nejsou validní
     """
+    if isinstance(data, Matice_analyzy):
+        validuj_matici_analyzy(data)
+        return
+    
     if not isinstance(data, dict):
         raise ValueError("Data analýzy musí být dictionary.")
     
@@ -97,12 +180,7 @@ def validuj_data_analyzy(data: Dict) -> None:
             raise ValueError(f"Kritérium '{nazev_krit}' musí obsahovat 'typ' a 'vahu'.")
     
     # Kontrola součtu vah kritérií
-    try:
-        vahy_suma = sum(float(k_data['vaha']) for k_data in kriteria.values())
-        if abs(vahy_suma - 1.0) > 0.001:  # Konstanty.VALIDACE['TOLERANCE_SOUCTU_VAH']
-            raise ValueError(f"Součet vah musí být 1.0 (aktuálně: {vahy_suma:.3f}).")
-    except (ValueError, TypeError, KeyError):
-        raise ValueError("Neplatná hodnota váhy u některého z kritérií.")
+    _validuj_soucet_vah(k_data['vaha'] for k_data in kriteria.values())
         
     # Validace variant
     varianty = data.get("varianty", {})
@@ -119,6 +197,162 @@ def validuj_data_analyzy(data: Dict) -> None:
             if nazev_krit not in var_data and nazev_krit != "popis_varianty":
                 zapsat_info(f"Upozornění: Varianta '{nazev_var}' neobsahuje hodnotu pro kritérium '{nazev_krit}'")
 
+def validuj_nazev_polozky(nazev, druh: str) -> None:
+    """
+    Validuje název kritéria nebo varianty.
+    
+    Args:
+        nazev: Název k validaci
+        druh: Popis položky pro chybovou zprávu ("kritérium", "varianta")
+        
+    Raises:
+        ValueError: Pokud název není validní
+    """
+    if not isinstance(nazev, str) or not nazev.strip():
+        raise ValueError(f"Název ({druh}) nesmí být prázdný.")
+    if nazev == "popis_varianty":
+        raise ValueError(f"Název '{nazev}' je vyhrazený.")
+    if len(nazev) > 100:  # Konstanty.VALIDACE['MAX_DELKA_NAZEV']
+        raise ValueError(f"Název ({druh}) je příliš dlouhý (max 100 znaků).")
+
+def _validuj_cislo(hodnota, zprava: str) -> float:
+    """Převede hodnotu na float, jinak vyhodí ValueError se zprávou."""
+    try:
+        return float(hodnota)
+    except (ValueError, TypeError):
+        raise ValueError(zprava)
+
+def _validuj_typ_kriteria(typ) -> str:
+    """Ověří typ kritéria a vrátí ho malými písmeny."""
+    if str(typ).lower() not in TYPY_KRITERII:
+        raise ValueError(f"Neplatný typ kritéria '{typ}' (povoleno: {', '.join(TYPY_KRITERII)}).")
+    return str(typ).lower()
+
+# =============== Dílčí úpravy dat ===============
+
+def _kriterium(matice: Matice_analyzy, nazev) -> int:
+    """Vrátí index existujícího kritéria."""
+    if nazev not in matice.kriteria:
+        raise ValueError(f"Kritérium '{nazev}' neexistuje.")
+    return matice.index_kriteria(nazev)
+
+def _varianta(matice: Matice_analyzy, nazev) -> int:
+    """Vrátí index existující varianty."""
+    if nazev not in matice.varianty:
+        raise ValueError(f"Varianta '{nazev}' neexistuje.")
+    return matice.index_varianty(nazev)
+
+def _novy_nazev_kriteria(matice: Matice_analyzy, nazev) -> None:
+    """Ověří název nového nebo přejmenovaného kritéria."""
+    validuj_nazev_polozky(nazev, "kritérium")
+    if nazev in matice.kriteria:
+        raise ValueError(f"Kritérium '{nazev}' již existuje.")
+
+def _novy_nazev_varianty(matice: Matice_analyzy, nazev) -> None:
+    """Ověří název nové nebo přejmenované varianty."""
+    validuj_nazev_polozky(nazev, "varianta")
+    if nazev in matice.varianty:
+        raise ValueError(f"Varianta '{nazev}' již existuje.")
+
+def proved_zmenu(matice: Matice_analyzy, zmena: Dict) -> str:
+    """
+    Provede jednu dílčí úpravu dat analýzy a zvaliduje jen dotčené položky.
+    
+    Podporované operace (klíč 'operace', viz OPERACE_UPRAVY):
+    - nastav_hodnotu: varianta, kriterium, hodnota
+    - pridej_kriterium: nazev, typ, vaha
+    - uprav_kriterium: nazev a volitelně novy_nazev, typ, vaha
+    - odeber_kriterium: nazev
+    - pridej_variantu: nazev, popis_varianty (volitelný)
+    - uprav_variantu: nazev a volitelně novy_nazev, popis_varianty
+    - odeber_variantu: nazev
+    - nastav_popis: popis_analyzy
+    
+    Args:
+        matice: Matice analýzy (upravuje se na místě)
+        zmena: Slovník popisující operaci
+        
+    Returns:
+        str: Název provedené operace
+        
+    Raises:
+        ValueError: Pokud operace není podporována nebo má neplatné údaje
+    """
+    if not isinstance(zmena, dict):
+        raise ValueError("Změna musí být dictionary.")
+    operace = zmena.get("operace")
+    if operace not in OPERACE_UPRAVY:
+        raise ValueError(f"Nepodporovaná operace úpravy: {operace}")
+    
+    if operace == "nastav_hodnotu":
+        i = _varianta(matice, zmena.get("varianta"))
+        j = _kriterium(matice, zmena.get("kriterium"))
+        hodnota = _validuj_cislo(zmena.get("hodnota"),
+                                 f"Neplatná hodnota pro variantu {zmena.get('varianta')} a kritérium {zmena.get('kriterium')}.")
+        matice.nastav_hodnotu(i, j, hodnota)
+    
+    elif operace == "pridej_kriterium":
+        _novy_nazev_kriteria(matice, zmena.get("nazev"))
+        vaha = _validuj_cislo(zmena.get("vaha", 0), "Neplatná hodnota váhy u některého z kritérií.")
+        matice.pridej_kriterium(zmena["nazev"], _validuj_typ_kriteria(zmena.get("typ", "max")), vaha)
+    
+    elif operace == "uprav_kriterium":
+        j = _kriterium(matice, zmena.get("nazev"))
+        novy_nazev = zmena.get("novy_nazev")
+        if novy_nazev is not None and novy_nazev != zmena["nazev"]:
+            _novy_nazev_kriteria(matice, novy_nazev)
+        typ = _validuj_typ_kriteria(zmena["typ"]) if zmena.get("typ") is not None else None
+        vaha = None
+        if zmena.get("vaha") is not None:
+            vaha = _validuj_cislo(zmena["vaha"], "Neplatná hodnota váhy u některého z kritérií.")
+        matice.uprav_kriterium(j, novy_nazev, typ, vaha)
+    
+    elif operace == "odeber_kriterium":
+        matice.odeber_kriterium(_kriterium(matice, zmena.get("nazev")))
+    
+    elif operace == "pridej_variantu":
+        _novy_nazev_varianty(matice, zmena.get("nazev"))
+        matice.pridej_variantu(zmena["nazev"], str(zmena.get("popis_varianty") or ""))
+    
+    elif operace == "uprav_variantu":
+        i = _varianta(matice, zmena.get("nazev"))
+        novy_nazev = zmena.get("novy_nazev")
+        if novy_nazev is not None and novy_nazev != zmena["nazev"]:
+            _novy_nazev_varianty(matice, novy_nazev)
+        popis = zmena.get("popis_varianty")
+        matice.uprav_variantu(i, novy_nazev, str(popis) if popis is not None else None)
+    
+    elif operace == "odeber_variantu":
+        matice.odeber_variantu(_varianta(matice, zmena.get("nazev")))
+    
+    else:  # nastav_popis
+        matice.popis_analyzy = str(zmena.get("popis_analyzy") or "")
+    
+    return operace
+
+def _vytvor_radek_analyzy(uzivatel, nazev: str, data):
+    """
+    Vloží řádek analýzy s daty ve sloupcovém formátu a jejich hashem.
+    
+    Args:
+        uzivatel: Vlastník analýzy
+        nazev: Název analýzy
+        data: Data analýzy (slovník data_json nebo Matice_analyzy)
+        
+    Returns:
+        Row: Nový řádek tabulky analyzy
+    """
+    data_json = Uloziste_analyz.zakoduj_data(data)
+    return app_tables.analyzy.add_row(
+        nazev=nazev,
+        uzivatel=uzivatel,
+        data_json=data_json,
+        hash_dat=Cache_vysledku.vypocitej_hash_dat(data_json),
+        datum_vytvoreni=datetime.datetime.now(),
+        datum_upravy=None,
+        **Uloziste_analyz.souhrn_dat(data_json)
+    )
+
 # =============== CRUD Operace ===============
 
 @anvil.server.callable
@@ -144,21 +378,12 @@ def vytvor_analyzu(nazev: str, popis: str = "") -> str:
     validuj_nazev_analyzy(nazev)
     
     try:
-        # Vytvoření základní JSON struktury pro analýzu v novém formátu
-        data_json = {
+        # Vytvoření záznamu v databázi s prázdnou JSON strukturou
+        analyza = _vytvor_radek_analyzy(uzivatel, nazev, {
             "popis_analyzy": popis,
             "kriteria": {},
             "varianty": {}
-        }
-        
-        # Vytvoření záznamu v databázi
-        analyza = app_tables.analyzy.add_row(
-            nazev=nazev,
-            uzivatel=uzivatel,
-            data_json=data_json,
-            datum_vytvoreni=datetime.datetime.now(),
-            datum_upravy=None
-        )
+        })
         return analyza.get_id()
     except Exception as e:
         zapsat_chybu(f"Chyba při vytváření analýzy: {str(e)}")
@@ -166,20 +391,67 @@ def vytvor_analyzu(nazev: str, popis: str = "") -> str:
 
 @anvil.server.callable
 @handle_errors
+@tables.in_transaction
+def vytvor_analyzu_s_daty(nazev: str, data: Dict) -> Dict:
+    """
+    Vytvoří novou analýzu rovnou s kompletními daty jedním voláním serveru.
+    Data se zvalidují před zápisem, takže při chybě nevznikne prázdný řádek.
+    
+    Args:
+        nazev: Název nové analýzy
+        data: Data analýzy (slovník data_json nebo Matice_analyzy)
+        
+    Returns:
+        Dict: {'id': ID nové analýzy, 'hash_dat': hash uložených dat}
+        
+    Raises:
+        ValueError: Pokud uživatel není přihlášen nebo data nejsou validní
+    """
+    uzivatel = anvil.users.get_user()
+    if not uzivatel:
+        raise ValueError("Pro vytvoření analýzy musíte být přihlášen.")
+
+    validuj_nazev_analyzy(nazev)
+    validuj_data_analyzy(data)
+    
+    try:
+        analyza = _vytvor_radek_analyzy(uzivatel, nazev, data)
+        zapsat_info(f"Vytvořena analýza {analyza.get_id()} s daty")
+        return {'id': analyza.get_id(), 'hash_dat': analyza["hash_dat"]}
+    except Exception as e:
+        zapsat_chybu(f"Chyba při vytváření analýzy: {str(e)}")
+        raise
+
+@anvil.server.callable
+@handle_errors
+@tables.in_transaction
 def nacti_analyzu(analyza_id: str) -> Dict:
     """
     Načte analýzu podle ID.
+    Data v původním formátu se při načtení převedou (zápis, případně i uvolnění
+    sdílených dat), proto načtení běží v transakci jako úpravy a mazání
+    a oprávnění se ověřuje před čtením dat.
     
     Args:
         analyza_id: ID požadované analýzy
         
     Returns:
         Dict: Slovník s daty analýzy
+        
+    Raises:
+        ValueError: Pokud analýza neexistuje nebo k ní uživatel nemá přístup
     """
     try:
         analyza = app_tables.analyzy.get_by_id(analyza_id)
         if not analyza:
             raise ValueError(f"Analýza s ID {analyza_id} neexistuje.")
+        
+        aktualni_uzivatel = anvil.users.get_user()
+        if not aktualni_uzivatel:
+            raise ValueError("Pro načtení analýzy musíte být přihlášen.")
+        if (aktualni_uzivatel != analyza["uzivatel"] and
+            aktualni_uzivatel.get("role") != "admin"):
+            raise ValueError("Nemáte oprávnění k této analýze.")
             
         # Sestavení kompletního slovníku dat
         result = {
@@ -189,8 +461,8 @@ def nacti_analyzu(analyza_id: str) -> Dict:
             "datum_upravy": analyza["datum_upravy"],
         }
         
-        # Přidání dat z JSON
-        result.update(analyza["data_json"])
+        # Přidání dat z JSON (uložená data se převádí ze sloupcového formátu)
+        result.update(Uloziste_analyz.nacti_matici(analyza).do_json())
         
         return result
     except Exception as e:
@@ -199,25 +471,58 @@ def nacti_analyzu(analyza_id: str) -> Dict:
 
 @anvil.server.callable
 @handle_errors
-def uprav_analyzu(analyza_id: str, nazev: str = None, data: Dict = None) -> None:
+def nacti_souhrn_analyzy(analyza_id: str) -> Dict:
+    """
+    Načte název a souhrnné sloupce analýzy bez čtení data_json.
+    Pro výstupní formuláře, které hodnotící matici nezobrazují
+    (kritéria a varianty berou z výsledku výpočtu).
+    
+    Args:
+        analyza_id: ID požadované analýzy
+        
+    Returns:
+        Dict: id, nazev, popis_analyzy, pocet_kriterii, pocet_variant,
+              datum_vytvoreni a datum_upravy
+    """
+    analyza = app_tables.analyzy.get_by_id(
+        analyza_id,
+        q.fetch_only("uzivatel", "nazev", "datum_vytvoreni", "datum_upravy", *SLOUPCE_SOUHRNU)
+    )
+    if not analyza:
+        raise ValueError(f"Analýza s ID {analyza_id} neexistuje.")
+    
+    aktualni_uzivatel = anvil.users.get_user()
+    if (aktualni_uzivatel != analyza["uzivatel"] and 
+        not (aktualni_uzivatel and aktualni_uzivatel.get("role") == "admin")):
+        raise ValueError("Nemáte oprávnění k této analýze.")
+    
+    return {
+        "id": analyza.get_id(),
+        "nazev": analyza["nazev"],
+        "popis_analyzy": analyza["popis"] or "",
+        "pocet_kriterii": analyza["pocet_kriterii"],
+        "pocet_variant": analyza["pocet_variant"],
+        "datum_vytvoreni": analyza["datum_vytvoreni"],
+        "datum_upravy": analyza["datum_upravy"]
+    }
+
+@anvil.server.callable
+@handle_errors
+@tables.in_transaction
+def uprav_analyzu(analyza_id: str, nazev: str = None, data: Dict = None) -> str:
     """
     Upraví existující analýzu.
     
     Args:
         analyza_id: ID analýzy k úpravě
         nazev: Nový název analýzy (volitelný)
-        data: Nová data JSON (volitelné)
+        data: Nová data JSON nebo Matice_analyzy (volitelné)
+        
+    Returns:
+        str: Hash dat analýzy po úpravě
     """
     try:
-        analyza = app_tables.analyzy.get_by_id(analyza_id)
-        if not analyza:
-            raise ValueError(f"Analýza s ID {analyza_id} neexistuje.")
-        
-        # Kontrola, zda má uživatel právo upravovat analýzu
-        aktualni_uzivatel = anvil.users.get_user()
-        if (aktualni_uzivatel != analyza["uzivatel"] and 
-            not (aktualni_uzivatel and aktualni_uzivatel.get("role") == "admin")):
-            raise ValueError("Nemáte oprávnění upravit tuto analýzu.")
+        analyza = nacti_analyzu_pro_upravu(analyza_id)
         
         # Aktualizace názvu, pokud byl poskytnut
         if nazev is not None:
@@ -228,10 +533,59 @@ def uprav_analyzu(analyza_id: str, nazev: str = None, data: Dict = None) -> None
         if data is not None:
             # Validace struktury dat
             validuj_data_analyzy(data)
-            analyza["data_json"] = data
+            # Uložení ve sloupcovém formátu, při změně obsahu se smaže cache výsledků
+            Uloziste_analyz.uloz_data(analyza, data)
         
         # Aktualizace časového razítka
         analyza["datum_upravy"] = datetime.datetime.now()
+        return analyza["hash_dat"]
+        
+    except Exception as e:
+        zapsat_chybu(f"Chyba při úpravě analýzy {analyza_id}: {str(e)}")
+        raise
+
+@anvil.server.callable
+@handle_errors
+@tables.in_transaction
+def uprav_analyzu_zmenami(analyza_id: str, zmeny: List[Dict], nazev: str = None) -> str:
+    """
+    Upraví analýzu seznamem dílčích změn místo přepsání celých dat.
+    Změny se provedou na serveru v daném pořadí a validují se jen dotčené
+    položky; součet vah a počty kritérií či variant se kontrolují jen tehdy,
+    když je některá změna mohla ovlivnit.
+    
+    Args:
+        analyza_id: ID analýzy k úpravě
+        zmeny: Seznam změn ve formátu proved_zmenu
+        nazev: Nový název analýzy (volitelný)
+        
+    Returns:
+        str: Hash dat analýzy po úpravě
+    """
+    try:
+        analyza = nacti_analyzu_pro_upravu(analyza_id)
+        
+        if nazev is not None:
+            validuj_nazev_analyzy(nazev)
+        
+        if zmeny:
+            matice = Uloziste_analyz.nacti_matici(analyza)
+            provedene = {proved_zmenu(matice, zmena) for zmena in zmeny}
+            
+            if provedene & OPERACE_MENICI_VAHY:
+                _validuj_soucet_vah(matice.vahy)
+            if "odeber_kriterium" in provedene and not matice.pocet_kriterii:
+                raise ValueError("Analýza musí obsahovat alespoň jedno kritérium.")
+            if "odeber_variantu" in provedene and not matice.pocet_variant:
+                raise ValueError("Analýza musí obsahovat alespoň jednu variantu.")
+            
+            Uloziste_analyz.uloz_data(analyza, matice)
+        
+        if nazev is not None:
+            analyza["nazev"] = nazev
+        analyza["datum_upravy"] = datetime.datetime.now()
+        zapsat_info(f"Analýza {analyza_id} upravena ({len(zmeny or [])} změn)")
+        return analyza["hash_dat"]
         
     except Exception as e:
         zapsat_chybu(f"Chyba při úpravě analýzy {analyza_id}: {str(e)}")
@@ -239,6 +593,7 @@ def uprav_analyzu(analyza_id: str, nazev: str = None, data: Dict = None) -> None
 
 @anvil.server.callable
 @handle_errors
+@tables.in_transaction
 def smaz_analyzu(analyza_id: str) -> bool:
     """
     Smaže analýzu podle ID.
@@ -260,7 +615,10 @@ def smaz_analyzu(analyza_id: str) -> bool:
             not (aktualni_uzivatel and aktualni_uzivatel.get("role") == "admin")):
             raise ValueError("Nemáte oprávnění smazat tuto analýzu.")
             
+        sdilena = analyza["sdilena_data"]
+        Cache_vysledku.zneplatni_cache(analyza)
         analyza.delete()
+        Uloziste_analyz.uvolni_sdilena_data(sdilena)
         return True
         
     except Exception as e:
@@ -269,9 +627,12 @@ def smaz_analyzu(analyza_id: str) -> bool:
 
 @anvil.server.callable
 @handle_errors
+@tables.in_transaction
 def klonuj_analyzu(analyza_id: str) -> str:
     """
     Vytvoří kopii existující analýzy.
+    Klon data nekopíruje, odkazuje na sdílená data původní analýzy
+    (Uloziste_analyz.sdilej_data) a vlastní kopii dostane až při první změně.
     
     Args:
         analyza_id: ID analýzy ke klonování
@@ -298,13 +659,18 @@ def klonuj_analyzu(analyza_id: str) -> str:
         # Vytvoření kopie analýzy
         novy_nazev = f"Kopie - {puvodni['nazev']}"
         
-        # Vytvoření nové analýzy
+        # Vytvoření nové analýzy s odkazem na sdílená data
+        sdilena = Uloziste_analyz.sdilej_data(puvodni)
         nova_analyza = app_tables.analyzy.add_row(
             nazev=novy_nazev,
             uzivatel=aktualni_uzivatel,
-            data_json=puvodni["data_json"],
+            data_json=None,
+            sdilena_data=sdilena,
+            hash_dat=sdilena["hash_dat"],
             datum_vytvoreni=datetime.datetime.now(),
-            datum_upravy=None
+            datum_upravy=None,
+            # Souhrn se s daty nemění, kopírujeme ho
+            **{sloupec: puvodni[sloupec] for sloupec in SLOUPCE_SOUHRNU}
         )
         
         zapsat_info(f"Analýza {analyza_id} úspěšně naklonována jako {nova_analyza.get_id()}")
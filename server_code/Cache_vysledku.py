@@ -0,0 +1,128 @@
+# -------------------------------------------------------
+# Modul: Cache_vysledku
+#
+# Perzistentní cache vypočtených výsledků v tabulce vysledky.
+# Záznam je určen analýzou, kódem metody, hashem parametrů a hashem obsahu data_json,
+# takže opakované zobrazení nezměněné analýzy stojí jedno čtení řádku.
+#
+# Funkce:
+# - vypocitej_hash_dat: Stabilní hash obsahu dat analýzy
+# - ziskej_hash_dat: Hash dat uložený u analýzy (případně dopočtený)
+# - nacti_z_cache / uloz_do_cache: Čtení a zápis výsledku metody
+# - zneplatni_cache: Smazání všech uložených výsledků analýzy
+# - zneplatni_cache_analyz: Smazání výsledků více analýz jedním dotazem
+# -------------------------------------------------------
+import datetime
+import hashlib
+import json
+from typing import Dict, Optional
+import anvil.tables as tables
+import anvil.tables.query as q
+from anvil.tables import app_tables
+
+def vypocitej_hash_dat(data) -> str:
+    """
+    Vypočítá stabilní hash dat nezávislý na pořadí klíčů ve slovnících.
+
+    Args:
+        data: JSON-serializovatelná data (data_json analýzy, parametry metody)
+
+    Returns:
+        str: SHA-256 hash v hexadecimálním tvaru
+    """
+    serializovana = json.dumps(data, sort_keys=True, separators=(",", ":"),
+                               ensure_ascii=False, default=str)
+    return hashlib.sha256(serializovana.encode("utf-8")).hexdigest()
+
+def ziskej_hash_dat(analyza) -> str:
+    """
+    Vrátí hash data_json uložený u analýzy.
+    U starších řádků bez hashe ho dopočítá a uloží.
+
+    Args:
+        analyza: Řádek tabulky analyzy
+
+    Returns:
+        str: Hash obsahu data_json
+    """
+    hash_dat = analyza["hash_dat"]
+    if not hash_dat:
+        hash_dat = vypocitej_hash_dat(analyza["data_json"])
+        analyza["hash_dat"] = hash_dat
+    return hash_dat
+
+def nacti_z_cache(analyza, metoda: str, parametry: Optional[Dict] = None) -> Optional[Dict]:
+    """
+    Načte uložený výsledek metody, pokud odpovídá aktuálním datům analýzy.
+    Případné duplicitní záznamy (např. ze starších souběžných zápisů) nevadí,
+    použije se první z nich a uloz_do_cache je při dalším zápisu odstraní.
+
+    Args:
+        analyza: Řádek tabulky analyzy
+        metoda: Kód metody
+        parametry: Parametry výpočtu (volitelné)
+
+    Returns:
+        Optional[Dict]: Uložený výsledek nebo None
+    """
+    zaznam = next(iter(app_tables.vysledky.search(
+        analyza=analyza,
+        metoda=metoda,
+        hash_parametru=vypocitej_hash_dat(parametry or {}),
+        hash_dat=ziskej_hash_dat(analyza)
+    )), None)
+    return zaznam["vysledek"] if zaznam else None
+
+@tables.in_transaction
+def uloz_do_cache(analyza, metoda: str, vysledek: Dict, parametry: Optional[Dict] = None) -> None:
+    """
+    Uloží výsledek metody pro aktuální data analýzy.
+    Starší výsledky téže metody a parametrů (pro jiná data) se přepíšou.
+    Smazání, vložení i zápis souhrnu proběhnou v jedné transakci, takže ani
+    souběžné výpočty (úloha na pozadí, více záložek) nevytvoří duplicitní záznam.
+    Nejlepší varianta výsledku se zapíše do souhrnu analýzy (posledni_vitez).
+
+    Args:
+        analyza: Řádek tabulky analyzy
+        metoda: Kód metody
+        vysledek: Vypočtený výsledek (JSON-serializovatelný)
+        parametry: Parametry výpočtu (volitelné)
+    """
+    hash_parametru = vypocitej_hash_dat(parametry or {})
+    for stary in app_tables.vysledky.search(analyza=analyza, metoda=metoda,
+                                            hash_parametru=hash_parametru):
+        stary.delete()
+
+    app_tables.vysledky.add_row(
+        analyza=analyza,
+        metoda=metoda,
+        hash_parametru=hash_parametru,
+        hash_dat=ziskej_hash_dat(analyza),
+        vysledek=vysledek,
+        datum_vypoctu=datetime.datetime.now()
+    )
+
+    if isinstance(vysledek, dict) and vysledek.get("nejlepsi_varianta") is not None:
+        # Kód metody bez přípony záznamu (např. "topsis_detail" -> "topsis")
+        analyza.update(posledni_vitez=vysledek["nejlepsi_varianta"], posledni_metoda=metoda.split("_")[0])
+
+def zneplatni_cache(analyza) -> None:
+    """
+    Smaže všechny uložené výsledky analýzy.
+    Volá se při změně dat nebo smazání analýzy.
+
+    Args:
+        analyza: Řádek tabulky analyzy
+    """
+    for zaznam in app_tables.vysledky.search(analyza=analyza):
+        zaznam.delete()
+
+def zneplatni_cache_analyz(analyzy) -> None:
+    """
+    Smaže uložené výsledky více analýz jedním dotazem (při hromadném mazání).
+
+    Args:
+        analyzy: Řádky tabulky analyzy
+    """
+    if analyzy:
+        app_tables.vysledky.search(analyza=q.any_of(*analyzy)).delete_all_rows()
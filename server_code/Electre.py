@@ -0,0 +1,407 @@
+# -------------------------------------------------------
+# Modul: Electre
+#
+# Metody ELECTRE I a ELECTRE III nad modulem Vypocetni_jadro.
+# Párové matice souhlasu a nesouhlasu (varianty × varianty) se nikdy neukládají celé:
+# počítají se po blocích řádků, jejichž velikost omezuje MAX_PRVKU_BLOKU, a z každého
+# bloku se uloží jen hrany relace převyšování a řádkové/sloupcové součty.
+# Graf převyšování se vrací v kompaktním tvaru CSR (odkazy + cile). Hrany se
+# při průchodu bloky počítají a po překročení max_hran se přestanou ukládat -
+# výsledek pak obsahuje jen počty hran a detail převyšování nejlepších variant.
+#
+# Funkce:
+# - vypocitej_electre_i: Převyšování podle prahů souhlasu a nesouhlasu, jádro grafu
+# - vypocitej_electre_iii: Věrohodnost převyšování s prahy q, p, v a λ-řez
+# - vyber_jadro: Jádro grafu převyšování
+# -------------------------------------------------------
+import numpy as np
+
+from . import Vypocetni_jadro
+
+# Maximální počet prvků jednoho pomocného pole blok × varianty × kritéria (4M float64 = 32 MB)
+MAX_PRVKU_BLOKU = 4 * 1024 * 1024
+
+# Výchozí prahy ELECTRE I
+PRAH_SOUHLASU = 0.7
+PRAH_NESOUHLASU = 0.3
+
+# Výchozí prahy ELECTRE III jako podíl rozsahu kritéria (indiference q, preference p, veto v)
+PRAHY_ELECTRE_III = {'indiference': 0.05, 'preference': 0.2, 'veto': 0.8}
+PRAH_LAMBDA = 0.7
+
+# Počet nejlepších variant v matici převyšování 'detail'
+MAX_VARIANT_DETAILU = 50
+
+# =============== Pomocné funkce ===============
+
+def _orientuj(matice, typy_kriterii):
+    """
+    Převede matici na tvar, kde vyšší hodnota je vždy lepší (minimalizační sloupce se negují).
+
+    Args:
+        matice: 2D list nebo pole původních hodnot
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+
+    Returns:
+        np.ndarray: Orientovaná matice (varianty × kritéria)
+    """
+    pole = Vypocetni_jadro.jako_matici(matice)
+    return np.where(Vypocetni_jadro.maska_minimalizacnich(typy_kriterii), -pole, pole)
+
+def _bloky_radku(pocet_variant, pocet_kriterii, max_prvku=MAX_PRVKU_BLOKU):
+    """
+    Rozdělí řádky na bloky tak, aby pole blok × varianty × kritéria nepřekročilo max_prvku.
+
+    Args:
+        pocet_variant: Počet variant
+        pocet_kriterii: Počet kritérií
+        max_prvku: Maximální počet prvků pomocného pole
+
+    Returns:
+        list: Dvojice (zacatek, konec) pro každý blok
+    """
+    velikost = max(1, max_prvku // max(1, pocet_variant * pocet_kriterii))
+    return [(zacatek, min(zacatek + velikost, pocet_variant))
+            for zacatek in range(0, pocet_variant, velikost)]
+
+def _pridej_hrany(hrany, prevysuje, zacatek, max_hran):
+    """
+    Přidá hrany bloku relace převyšování. Po překročení max_hran se dosud
+    uložené hrany zahodí a další bloky se už jen počítají.
+
+    Args:
+        hrany: Slovník {'pocet', 'zdroje', 'cile'} sbíraných hran (upravuje se na místě)
+        prevysuje: Booleovská matice bloku (řádky bloku × varianty)
+        zacatek: Index varianty prvního řádku bloku
+        max_hran: Maximální počet ukládaných hran (None = bez omezení)
+    """
+    hrany['pocet'] += int(np.count_nonzero(prevysuje))
+    if hrany['zdroje'] is None:
+        return
+    if max_hran is not None and hrany['pocet'] > max_hran:
+        hrany['zdroje'] = hrany['cile'] = None
+        return
+
+    radky, sloupce = np.nonzero(prevysuje)
+    hrany['zdroje'].append((radky + zacatek).astype(np.int32))
+    hrany['cile'].append(sloupce.astype(np.int32))
+
+def _sestav_graf(pocet_variant, hrany):
+    """
+    Sestaví graf převyšování ve tvaru CSR z hran nasbíraných po blocích.
+
+    Args:
+        pocet_variant: Počet variant
+        hrany: Slovník z _pridej_hrany (zdroje bloků jsou seřazené vzestupně)
+
+    Returns:
+        tuple: (odkazy, cile), hrany varianty i jsou cile[odkazy[i]:odkazy[i + 1]]
+    """
+    zdroje = np.concatenate(hrany['zdroje']) if hrany['zdroje'] else np.zeros(0, dtype=np.int32)
+    cile = np.concatenate(hrany['cile']) if hrany['cile'] else np.zeros(0, dtype=np.int32)
+    odkazy = np.zeros(pocet_variant + 1, dtype=np.int64)
+    np.cumsum(np.bincount(zdroje, minlength=pocet_variant), out=odkazy[1:])
+    return odkazy, cile
+
+def vyber_jadro(odkazy, cile, pocet_variant):
+    """
+    Vybere jádro grafu převyšování.
+    Do jádra postupně přidává varianty, které nepřevyšuje žádná dosud nerozhodnutá
+    varianta, a vyřazuje varianty, které převyšují. Zbylé varianty leží v cyklu.
+
+    Args:
+        odkazy: Pole odkazů CSR (pocet_variant + 1)
+        cile: Pole cílů hran CSR
+        pocet_variant: Počet variant
+
+    Returns:
+        tuple: (jadro, v_cyklu) - seznamy indexů variant
+    """
+    zdroje = np.repeat(np.arange(pocet_variant), np.diff(odkazy))
+    nerozhodnute = np.ones(pocet_variant, dtype=bool)
+    jadro = []
+
+    while nerozhodnute.any():
+        aktivni_hrany = nerozhodnute[zdroje] & nerozhodnute[cile]
+        vstupni_stupen = np.bincount(cile[aktivni_hrany], minlength=pocet_variant)
+        nove = np.flatnonzero(nerozhodnute & (vstupni_stupen == 0))
+        if nove.size == 0:
+            break  # Zbylé varianty tvoří cyklus
+
+        jadro.extend(nove.tolist())
+        nerozhodnute[nove] = False
+        for i in nove.tolist():
+            nerozhodnute[cile[odkazy[i]:odkazy[i + 1]]] = False
+
+    return sorted(jadro), np.flatnonzero(nerozhodnute).tolist()
+
+def _detail_z_grafu(odkazy, cile, indexy):
+    """
+    Vybere z grafu CSR matici převyšování mezi zadanými variantami.
+
+    Args:
+        odkazy, cile: Graf převyšování ve tvaru CSR
+        indexy: Pole indexů vybraných variant
+
+    Returns:
+        np.ndarray: Matice 0/1 (řádek převyšuje sloupec) v pořadí indexy
+    """
+    pozice = np.full(odkazy.size - 1, -1, dtype=np.int64)
+    pozice[indexy] = np.arange(indexy.size)
+    zdroje = np.repeat(pozice, np.diff(odkazy))
+    vybrane = (zdroje >= 0) & (pozice[cile] >= 0)
+
+    detail = np.zeros((indexy.size, indexy.size), dtype=np.int64)
+    detail[zdroje[vybrane], pozice[cile[vybrane]]] = 1
+    return detail
+
+def _sestav_vysledek(varianty, kriteria, skore, hrany, vystupni_stupen, vstupni_stupen,
+                     parametry, relace_variant, max_variant_detailu):
+    """
+    Sestaví společný výstupní slovník obou variant metody.
+
+    Args:
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        skore: Čisté skóre variant (pro pořadí)
+        hrany: Hrany grafu z _pridej_hrany (zdroje None, pokud překročily limit)
+        vystupni_stupen: Počet variant, které daná varianta převyšuje
+        vstupni_stupen: Počet variant, které danou variantu převyšují
+        parametry: Použité prahy
+        relace_variant: Funkce indexy -> matice převyšování mezi vybranými variantami
+                        (použije se, pokud graf nebyl uložen)
+        max_variant_detailu: Počet nejlepších variant v matici 'detail'
+
+    Returns:
+        dict: Výsledky ve formátu ostatních metod doplněné o jádro, detail
+              a graf převyšování (jádro a graf jen do max_hran hran)
+    """
+    pocet_variant = len(varianty)
+    results = Vypocetni_jadro.sestav_vysledky(varianty, skore)
+    indexy = Vypocetni_jadro.indexy_nejlepsich(skore, max_variant_detailu)
+
+    vysledek = {
+        'results': results,
+        'nejlepsi_varianta': results[0][0],
+        'nejlepsi_skore': results[0][2],
+        'nejhorsi_varianta': results[-1][0],
+        'nejhorsi_skore': results[-1][2],
+        'varianty': varianty,
+        'kriteria': kriteria,
+        'parametry': parametry,
+        'jadro': None,
+        'v_cyklu': None,
+        'pocet_hran': hrany['pocet'],
+        'pocet_prevysovanych': vystupni_stupen.tolist(),
+        'pocet_prevysujicich': vstupni_stupen.tolist()
+    }
+
+    if hrany['zdroje'] is None:
+        # Graf se neuložil, relaci mezi nejlepšími variantami stačí spočítat znovu
+        detail = relace_variant(indexy).astype(np.int64)
+    else:
+        odkazy, cile = _sestav_graf(pocet_variant, hrany)
+        jadro, v_cyklu = vyber_jadro(odkazy, cile, pocet_variant)
+        vysledek['jadro'] = [varianty[i] for i in jadro]
+        vysledek['v_cyklu'] = [varianty[i] for i in v_cyklu]
+        vysledek['graf'] = {'odkazy': odkazy.tolist(), 'cile': cile.tolist()}
+        detail = _detail_z_grafu(odkazy, cile, indexy)
+
+    vysledek['detail'] = {'varianty': [varianty[i] for i in indexy.tolist()],
+                          'prevysovani': detail.tolist()}
+    return vysledek
+
+# =============== ELECTRE I ===============
+
+def _prevysovani_i(skalovane_a, skalovane_b, vahy, prah_souhlasu, prah_nesouhlasu):
+    """
+    Vypočítá relaci převyšování ELECTRE I mezi dvěma skupinami variant.
+
+    Args:
+        skalovane_a: Orientované hodnoty převyšujících variant vydělené rozsahem kritérií
+        skalovane_b: Orientované hodnoty převyšovaných variant vydělené rozsahem kritérií
+        vahy: Normované váhy kritérií
+        prah_souhlasu: Minimální index souhlasu
+        prah_nesouhlasu: Maximální index nesouhlasu
+
+    Returns:
+        np.ndarray: Booleovská matice (a × b), True pokud a převyšuje b (včetně a == b)
+    """
+    # rozdil[a, b, j] = o kolik je b lepší než a v kritériu j (v podílech rozsahu)
+    rozdil = skalovane_b[None, :, :] - skalovane_a[:, None, :]
+    souhlas = (rozdil <= 0) @ vahy
+    nesouhlas = np.maximum(rozdil.max(axis=2), 0.0)
+    return (souhlas >= prah_souhlasu) & (nesouhlas <= prah_nesouhlasu)
+
+def vypocitej_electre_i(matice, typy_kriterii, vahy, varianty, kriteria,
+                        prah_souhlasu=PRAH_SOUHLASU, prah_nesouhlasu=PRAH_NESOUHLASU,
+                        max_prvku_bloku=MAX_PRVKU_BLOKU, max_hran=None,
+                        max_variant_detailu=MAX_VARIANT_DETAILU):
+    """
+    Vypočítá relaci převyšování metodou ELECTRE I.
+
+    Varianta a převyšuje b, pokud index souhlasu C(a, b) (podíl vah kritérií,
+    v nichž a není horší než b) dosahuje prahu souhlasu a index nesouhlasu
+    D(a, b) (největší převaha b v kritériu vztažená k rozsahu kritéria)
+    nepřekračuje práh nesouhlasu. Pořadí určuje čisté skóre
+    (počet převyšovaných minus počet převyšujících variant).
+
+    Args:
+        matice: 2D list nebo pole původních hodnot
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        vahy: List vah kritérií
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        prah_souhlasu: Minimální index souhlasu (0 až 1)
+        prah_nesouhlasu: Maximální index nesouhlasu (0 až 1)
+        max_prvku_bloku: Omezení velikosti pomocných polí
+        max_hran: Maximální počet hran ukládaného grafu (None = bez omezení)
+        max_variant_detailu: Počet nejlepších variant v matici 'detail'
+
+    Returns:
+        dict: Výsledky, jádro, detail a graf převyšování (CSR)
+    """
+    try:
+        pole = _orientuj(matice, typy_kriterii)
+        pocet_variant, pocet_kriterii = pole.shape
+        vahy = np.asarray(vahy, dtype=np.float64)
+        vahy = vahy / vahy.sum()
+
+        rozsah = pole.max(axis=0) - pole.min(axis=0)
+        rozsah = np.where(rozsah == 0, 1.0, rozsah)
+        skalovane = pole / rozsah
+
+        hrany = {'pocet': 0, 'zdroje': [], 'cile': []}
+        vystupni_stupen = np.zeros(pocet_variant, dtype=np.int64)
+        vstupni_stupen = np.zeros(pocet_variant, dtype=np.int64)
+
+        for zacatek, konec in _bloky_radku(pocet_variant, pocet_kriterii, max_prvku_bloku):
+            prevysuje = _prevysovani_i(skalovane[zacatek:konec], skalovane, vahy,
+                                       prah_souhlasu, prah_nesouhlasu)
+            prevysuje[np.arange(konec - zacatek), np.arange(zacatek, konec)] = False
+
+            _pridej_hrany(hrany, prevysuje, zacatek, max_hran)
+            vystupni_stupen[zacatek:konec] = prevysuje.sum(axis=1)
+            vstupni_stupen += prevysuje.sum(axis=0)
+
+        def relace_variant(indexy):
+            prevysuje = _prevysovani_i(skalovane[indexy], skalovane[indexy], vahy,
+                                       prah_souhlasu, prah_nesouhlasu)
+            np.fill_diagonal(prevysuje, False)
+            return prevysuje
+
+        skore = (vystupni_stupen - vstupni_stupen).astype(np.float64)
+        parametry = {'metoda': 'ELECTRE I', 'prah_souhlasu': float(prah_souhlasu),
+                     'prah_nesouhlasu': float(prah_nesouhlasu)}
+        return _sestav_vysledek(varianty, kriteria, skore, hrany, vystupni_stupen, vstupni_stupen,
+                                parametry, relace_variant, max_variant_detailu)
+    except Exception as e:
+        raise ValueError(f"Chyba při výpočtu ELECTRE I: {str(e)}")
+
+# =============== ELECTRE III ===============
+
+def _verohodnost_iii(pole_a, pole_b, vahy, q, p, v):
+    """
+    Vypočítá věrohodnost převyšování ELECTRE III mezi dvěma skupinami variant.
+
+    Má-li kritérium p == q (nebo v == p), je dílčí souhlas (nesouhlas) ostrý
+    skok: c_j = 1, pokud je b lepší nejvýše o q, jinak 0; d_j = 1 jen při
+    převaze b nad v.
+
+    Args:
+        pole_a: Orientované hodnoty převyšujících variant
+        pole_b: Orientované hodnoty převyšovaných variant
+        vahy: Normované váhy kritérií
+        q, p, v: Prahy indiference, preference a veta pro každé kritérium (q <= p <= v)
+
+    Returns:
+        np.ndarray: Matice věrohodnosti sigma(a, b) (a × b)
+    """
+    rozdil = pole_b[None, :, :] - pole_a[:, None, :]
+    pasmo_souhlasu = np.where(p > q, p - q, 1.0)
+    pasmo_veta = np.where(v > p, v - p, 1.0)
+
+    dilci_souhlas = np.where(p > q, np.clip((p - rozdil) / pasmo_souhlasu, 0.0, 1.0), rozdil <= q)
+    nesouhlas = np.where(v > p, np.clip((rozdil - p) / pasmo_veta, 0.0, 1.0), rozdil > v)
+    souhlas = dilci_souhlas @ vahy
+
+    # Oslabení věrohodnosti kritérii, jejichž nesouhlas převyšuje celkový souhlas
+    with np.errstate(divide="ignore", invalid="ignore"):
+        oslabeni = np.where(nesouhlas > souhlas[:, :, None],
+                            (1.0 - nesouhlas) / (1.0 - souhlas[:, :, None]), 1.0)
+    return souhlas * oslabeni.prod(axis=2)
+
+def vypocitej_electre_iii(matice, typy_kriterii, vahy, varianty, kriteria,
+                          prahy=None, prah_lambda=PRAH_LAMBDA, max_prvku_bloku=MAX_PRVKU_BLOKU,
+                          max_hran=None, max_variant_detailu=MAX_VARIANT_DETAILU):
+    """
+    Vypočítá věrohodnost převyšování metodou ELECTRE III.
+
+    Dílčí souhlas kritéria klesá lineárně mezi prahem indiference q a preference p,
+    dílčí nesouhlas roste mezi prahem preference p a veta v (při shodných prazích
+    jde o ostrý skok). Věrohodnost
+    sigma(a, b) = C(a, b) * prod((1 - d_j) / (1 - C)) přes kritéria s d_j > C.
+    Hrany grafu tvoří dvojice se sigma >= λ, pořadí určuje čistý tok věrohodnosti
+    (síla minus slabost). Sestupná a vzestupná destilace se neprovádí.
+
+    Args:
+        matice: 2D list nebo pole původních hodnot
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        vahy: List vah kritérií
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        prahy: Slovník 'indiference', 'preference', 'veto' jako podíl rozsahu kritéria
+               (číslo nebo seznam pro každé kritérium), výchozí PRAHY_ELECTRE_III
+        prah_lambda: Hranice věrohodnosti pro λ-řez (0 až 1)
+        max_prvku_bloku: Omezení velikosti pomocných polí
+        max_hran: Maximální počet hran ukládaného grafu (None = bez omezení)
+        max_variant_detailu: Počet nejlepších variant v matici 'detail'
+
+    Returns:
+        dict: Výsledky, jádro λ-řezu, detail, graf převyšování (CSR) a síla/slabost variant
+    """
+    try:
+        prahy = dict(PRAHY_ELECTRE_III, **(prahy or {}))
+        pole = _orientuj(matice, typy_kriterii)
+        pocet_variant, pocet_kriterii = pole.shape
+        vahy = np.asarray(vahy, dtype=np.float64)
+        vahy = vahy / vahy.sum()
+
+        rozsah = pole.max(axis=0) - pole.min(axis=0)
+        rozsah = np.where(rozsah == 0, 1.0, rozsah)
+        q = np.asarray(prahy['indiference'], dtype=np.float64) * rozsah
+        p = np.maximum(np.asarray(prahy['preference'], dtype=np.float64) * rozsah, q)
+        v = np.maximum(np.asarray(prahy['veto'], dtype=np.float64) * rozsah, p)
+
+        hrany = {'pocet': 0, 'zdroje': [], 'cile': []}
+        vystupni_stupen = np.zeros(pocet_variant, dtype=np.int64)
+        vstupni_stupen = np.zeros(pocet_variant, dtype=np.int64)
+        sila = np.zeros(pocet_variant)
+        slabost = np.zeros(pocet_variant)
+
+        for zacatek, konec in _bloky_radku(pocet_variant, pocet_kriterii, max_prvku_bloku):
+            vero = _verohodnost_iii(pole[zacatek:konec], pole, vahy, q, p, v)
+            vero[np.arange(konec - zacatek), np.arange(zacatek, konec)] = 0.0
+
+            sila[zacatek:konec] = vero.sum(axis=1)
+            slabost += vero.sum(axis=0)
+
+            prevysuje = vero >= prah_lambda
+            _pridej_hrany(hrany, prevysuje, zacatek, max_hran)
+            vystupni_stupen[zacatek:konec] = prevysuje.sum(axis=1)
+            vstupni_stupen += prevysuje.sum(axis=0)
+
+        def relace_variant(indexy):
+            vero = _verohodnost_iii(pole[indexy], pole[indexy], vahy, q, p, v)
+            np.fill_diagonal(vero, 0.0)
+            return vero >= prah_lambda
+
+        parametry = {'metoda': 'ELECTRE III', 'prah_lambda': float(prah_lambda),
+                     'prahy': {k: np.asarray(hodnota, dtype=np.float64).tolist() for k, hodnota in prahy.items()}}
+        vysledek = _sestav_vysledek(varianty, kriteria, sila - slabost, hrany, vystupni_stupen,
+                                    vstupni_stupen, parametry, relace_variant, max_variant_detailu)
+        vysledek['sila'] = sila.tolist()
+        vysledek['slabost'] = slabost.tolist()
+        return vysledek
+    except Exception as e:
+        raise ValueError(f"Chyba při výpočtu ELECTRE III: {str(e)}")
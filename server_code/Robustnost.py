@@ -0,0 +1,219 @@
+# -------------------------------------------------------
+# Modul: Robustnost
+#
+# Monte Carlo analýza robustnosti výsledku vůči nejistotě ve vahách kritérií.
+# Váhy se vzorkují z Dirichletova rozdělení se středem v uložených vahách (vaha),
+# skóre všech vzorků se počítá po dávkách jako maticový součin a výsledkem jsou
+# indexy akceptovatelnosti pořadí (jak často je varianta na daném místě).
+# Velikost dávky omezuje počet prvků pole vzorky × varianty a ze skóre se
+# vybírá jen max_poradi nejlepších variant (np.argpartition), ne celé pořadí.
+# Každá dávka má vlastní generátor odvozený ze seedu a indexu dávky, dávky lze
+# proto rozdělit mezi více procesů (ProcessPoolExecutor) bez vlivu na výsledek.
+#
+# Funkce:
+# - vypocitej_robustnost: Indexy akceptovatelnosti pořadí pro WSM/SAW nebo WPM
+# -------------------------------------------------------
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import Registr_metod, Vypocetni_jadro
+
+# Metody, jejichž skóre (nebo jeho logaritmus) je lineární ve vahách a lze ho počítat maticovým součinem
+PODPOROVANE_METODY = Registr_metod.metody_se_schopnosti(Registr_metod.SCHOPNOST_LINEARNI_VE_VAHACH)
+
+# Maximální počet vzorků v jednom maticovém součinu
+VELIKOST_DAVKY = 10000
+
+# Maximální počet prvků pole vzorky × varianty jedné dávky (4M float64 = 32 MB)
+MAX_PRVKU_DAVKY = 4 * 1024 * 1024
+
+def _priprav_matici_metody(matice, typy_kriterii, metoda):
+    """
+    Připraví matici, jejíž součin s vektorem vah dává skóre (WSM) nebo logaritmus skóre (WPM).
+
+    Args:
+        matice: Pole původních hodnot (varianty × kritéria)
+        typy_kriterii: List typů kritérií
+        metoda: Kód metody z PODPOROVANE_METODY
+
+    Returns:
+        np.ndarray: Matice pro dávkový součin s vahami
+    """
+    popis = Registr_metod.ziskej_metodu(metoda)
+    if popis['skore'] == 'wpm':
+        # WPM: pořadí podle logaritmu skóre, který je ve vahách lineární
+        return Vypocetni_jadro.log_matice_wpm(matice, Vypocetni_jadro.maska_minimalizacnich(typy_kriterii))
+    return Vypocetni_jadro.normalizuj_pole(matice, typy_kriterii, popis['normalizace'])
+
+def _velikost_davky(pocet_variant):
+    """
+    Vrátí počet vzorků v dávce: nejvýše VELIKOST_DAVKY a tolik, aby pole
+    vzorky × varianty nepřekročilo MAX_PRVKU_DAVKY.
+
+    Args:
+        pocet_variant: Počet variant
+
+    Returns:
+        int: Počet vzorků v jedné dávce
+    """
+    return max(1, min(VELIKOST_DAVKY, MAX_PRVKU_DAVKY // max(1, pocet_variant)))
+
+def _davky_vzorku(pocet_vzorku, seed, velikost_davky=VELIKOST_DAVKY):
+    """
+    Rozdělí vzorky do dávek po velikost_davky, každou s vlastním seedem podle jejího indexu.
+
+    Args:
+        pocet_vzorku: Celkový počet vzorků
+        seed: Seed celého výpočtu (None = náhodný)
+        velikost_davky: Počet vzorků v dávce (viz _velikost_davky)
+
+    Returns:
+        list: Dvojice (počet vzorků dávky, SeedSequence dávky)
+    """
+    pocet_davek = -(-pocet_vzorku // velikost_davky)
+    seedy = np.random.SeedSequence(seed).spawn(pocet_davek)
+    return [(min(velikost_davky, pocet_vzorku - i * velikost_davky), seedy[i])
+            for i in range(pocet_davek)]
+
+def _nejlepsi_varianty(skore, pocet):
+    """
+    Vrátí indexy pocet nejlepších variant každého vzorku od nejlepší,
+    shodně se stabilním řazením Vypocetni_jadro.poradi_ze_skore (při shodě vyhrává nižší index).
+    Nejlepší varianty vybírá np.argpartition, celé řazení jen u vzorků se shodou na hranici výběru.
+
+    Args:
+        skore: Pole skóre (vzorky × varianty)
+        pocet: Počet vybíraných variant
+
+    Returns:
+        np.ndarray: Indexy variant (vzorky × pocet)
+    """
+    pocet_variant = skore.shape[1]
+    if pocet >= pocet_variant:
+        return np.argsort(-skore, axis=1, kind="stable")
+
+    vybrane = np.argpartition(-skore, pocet - 1, axis=1)[:, :pocet]
+    hodnoty = np.take_along_axis(skore, vybrane, axis=1)
+    # Seřazení výběru podle skóre sestupně, při shodě podle indexu varianty
+    vybrane = np.take_along_axis(vybrane, np.lexsort((vybrane, -hodnoty), axis=1), axis=1)
+
+    # Hodnota na hranici výběru sdílená i nevybranou variantou: výběr mezi shodnými
+    # variantami určil argpartition, takové vzorky se seřadí celé
+    hranice = np.take_along_axis(skore, vybrane[:, -1:], axis=1)
+    shoda = (skore == hranice).sum(axis=1) > (np.take_along_axis(skore, vybrane, axis=1) == hranice).sum(axis=1)
+    if shoda.any():
+        vybrane[shoda] = np.argsort(-skore[shoda], axis=1, kind="stable")[:, :pocet]
+    return vybrane
+
+def _zpracuj_davky(matice_metody, alfa, davky, max_poradi, pri_davce=None):
+    """
+    Zpracuje dávky vzorků a vrátí četnosti pořadí.
+    Funkce je na úrovni modulu, aby ji šlo předat do procesového poolu.
+
+    Args:
+        matice_metody: Matice pro součin s vahami (varianty × kritéria)
+        alfa: Parametry Dirichletova rozdělení
+        davky: Dávky z _davky_vzorku (počet vzorků, SeedSequence)
+        max_poradi: Počet sledovaných pořadí (1..max_poradi)
+        pri_davce: Volitelná funkce volaná s počtem vzorků po každé dávce (jen v aktuálním procesu)
+
+    Returns:
+        np.ndarray: Četnosti (varianty × max_poradi)
+    """
+    pocet_variant = matice_metody.shape[0]
+    cetnosti = np.zeros(pocet_variant * max_poradi, dtype=np.int64)
+    indexy_poradi = np.arange(max_poradi)
+
+    for davka, seed_davky in davky:
+        vahy = np.random.default_rng(seed_davky).dirichlet(alfa, size=davka)
+        skore = vahy @ matice_metody.T
+        nejlepsi = _nejlepsi_varianty(skore, max_poradi)
+
+        # Četnosti dvojic (varianta, pořadí) jedním bincount
+        klice = nejlepsi * max_poradi + indexy_poradi[None, :]
+        cetnosti += np.bincount(klice.ravel(), minlength=cetnosti.size)
+        if pri_davce:
+            pri_davce(davka)
+
+    return cetnosti.reshape(pocet_variant, max_poradi)
+
+def vypocitej_robustnost(matice, typy_kriterii, vahy, varianty, metoda="wsm", pocet_vzorku=100000,
+                         koncentrace=100.0, max_poradi=None, pocet_procesu=1, seed=None, pri_prubehu=None):
+    """
+    Vypočítá indexy akceptovatelnosti pořadí Monte Carlo vzorkováním vah.
+
+    Váhy se vzorkují z Dirichletova rozdělení s parametry koncentrace × vaha,
+    střední hodnota vzorků je tedy rovna uloženým vahám a vyšší koncentrace
+    znamená menší rozptyl.
+
+    Args:
+        matice: 2D list nebo pole původních hodnot [varianty][kriteria]
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        vahy: List vah kritérií
+        varianty: List názvů variant
+        metoda: Kód metody ("wsm", "saw" nebo "wpm")
+        pocet_vzorku: Celkový počet vzorků vah
+        koncentrace: Koncentrační parametr Dirichletova rozdělení
+        max_poradi: Počet sledovaných pořadí (None = všechna)
+        pocet_procesu: Počet procesů (1 = výpočet v aktuálním procesu), výsledek na něm nezávisí
+        seed: Seed pro reprodukovatelnost (volitelný)
+        pri_prubehu: Volitelná funkce volaná s (zpracováno, celkem) vzorků - po dávkách,
+                     při více procesech po dokončení části každého procesu
+
+    Returns:
+        dict: 'varianty', 'metoda', 'pocet_vzorku', 'akceptovatelnost_poradi'
+              (varianty × pořadí, podíl vzorků) a 'prvni_misto' (podíl výher)
+
+    Raises:
+        ValueError: Pokud metoda není podporována nebo jsou parametry neplatné
+    """
+    metoda = str(metoda).lower()
+    if metoda not in PODPOROVANE_METODY:
+        raise ValueError(f"Metoda '{metoda}' není pro analýzu robustnosti podporována.")
+    if pocet_vzorku < 1 or koncentrace <= 0:
+        raise ValueError("Počet vzorků i koncentrace musí být kladné.")
+
+    pole = Vypocetni_jadro.jako_matici(matice)
+    pocet_variant = pole.shape[0]
+    max_poradi = pocet_variant if max_poradi is None else max(1, min(int(max_poradi), pocet_variant))
+
+    # Nulové váhy by Dirichletovo rozdělení nepřijalo, proto malá kladná spodní mez
+    alfa = np.maximum(np.asarray(vahy, dtype=np.float64) * koncentrace, 1e-3)
+    matice_metody = _priprav_matici_metody(pole, typy_kriterii, metoda)
+
+    davky = _davky_vzorku(pocet_vzorku, seed, _velikost_davky(pocet_variant))
+    pocet_procesu = max(1, min(int(pocet_procesu), os.cpu_count() or 1, len(davky)))
+    # Každý proces dostane souvislý úsek celých dávek
+    casti_davek = [davky[i * len(davky) // pocet_procesu:(i + 1) * len(davky) // pocet_procesu]
+                   for i in range(pocet_procesu)]
+
+    zpracovano = [0]
+
+    def _po_davce(pocet):
+        zpracovano[0] += pocet
+        if pri_prubehu:
+            pri_prubehu(zpracovano[0], pocet_vzorku)
+
+    if pocet_procesu == 1:
+        cetnosti = _zpracuj_davky(matice_metody, alfa, davky, max_poradi, _po_davce)
+    else:
+        with ProcessPoolExecutor(max_workers=pocet_procesu) as pool:
+            casti = pool.map(_zpracuj_davky,
+                             [matice_metody] * pocet_procesu, [alfa] * pocet_procesu,
+                             casti_davek, [max_poradi] * pocet_procesu)
+            cetnosti = 0
+            for davky_casti, cast in zip(casti_davek, casti):
+                cetnosti = cetnosti + cast
+                _po_davce(sum(davka for davka, _ in davky_casti))
+
+    akceptovatelnost = cetnosti / float(pocet_vzorku)
+    return {
+        'varianty': varianty,
+        'metoda': metoda,
+        'pocet_vzorku': int(pocet_vzorku),
+        'koncentrace': float(koncentrace),
+        'akceptovatelnost_poradi': akceptovatelnost.tolist(),
+        'prvni_misto': akceptovatelnost[:, 0].tolist()
+    }
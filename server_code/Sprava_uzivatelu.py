@@ -7,9 +7,11 @@
 # - Administrativní funkce
 # - Pomocné funkce
 # -------------------------------------------------------
+import collections
 import datetime
 import logging
 import functools
+import itertools
 from typing import Dict, List, Optional, Any
 import anvil.server
 import anvil.users
@@ -17,6 +19,22 @@ import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
 
+from . import Cache_vysledku, Uloziste_analyz
+
+# Sloupce analýzy, které potřebují seznamy (bez data_json s celou maticí)
+SLOUPCE_SEZNAMU = ("nazev", "datum_vytvoreni", "datum_upravy", "popis", "pocet_kriterii",
+                   "pocet_variant", "velikost_dat", "posledni_vitez", "posledni_metoda", "hash_dat")
+
+# Stránkování seznamu analýz (Konstanty.VELIKOST_STRANKY_ANALYZ)
+VELIKOST_STRANKY = 20
+MAX_VELIKOST_STRANKY = 100
+
+# Znaky se zvláštním významem ve vzoru q.like/q.ilike (zpětné lomítko je escape znak)
+ZNAKY_VZORU = ("\\", "%", "_")
+
+# Počet analýz smazaných v jedné transakci při mazání uživatele
+VELIKOST_DAVKY_MAZANI = 200
+
 # ============= Pomocné funkce pro error handling =============
 
 def zapsat_info(zprava):
@@ -63,6 +81,37 @@ def nacti_vsechny_uzivatele():
         zapsat_chybu(f"Chyba při načítání uživatelů: {str(e)}")
         raise ValueError("Nepodařilo se načíst seznam uživatelů")
 
+@anvil.server.callable
+@handle_errors
+def nacti_uzivatele_s_poctem_analyz() -> List[Dict]:
+    """
+    Načte všechny uživatele i s počtem jejich analýz pro administraci.
+    Počty se spočítají jedním průchodem tabulkou analýz (čte se jen sloupec
+    uzivatel), místo samostatného volání serveru pro každého uživatele.
+    
+    Returns:
+        List[Dict]: Uživatelé s klíči id, email, signed_up, last_login, role a pocet_analyz
+    """
+    over_admin_prava()
+    
+    pocty = collections.Counter(
+        a["uzivatel"].get_id()
+        for a in app_tables.analyzy.search(q.fetch_only("uzivatel"))
+        if a["uzivatel"] is not None
+    )
+    
+    return [
+        {
+            "id": u.get_id(),
+            "email": u["email"],
+            "signed_up": u["signed_up"],
+            "last_login": u["last_login"],
+            "role": u["role"],
+            "pocet_analyz": pocty.get(u.get_id(), 0)
+        }
+        for u in app_tables.users.search(q.fetch_only("email", "signed_up", "last_login", "role"))
+    ]
+
 @anvil.server.callable
 @handle_errors
 def vytvor_noveho_uzivatele(email: str, heslo: str, je_admin: bool = False):
@@ -162,53 +211,167 @@ def zmenit_roli_uzivatele(email: str, nova_role: str) -> bool:
         zapsat_chybu(f"Chyba při změně role uživatele {email}: {str(e)}")
         raise ValueError(f"Nepodařilo se změnit roli uživatele: {str(e)}")
 
-@anvil.server.callable
-@handle_errors
-def smaz_uzivatele(email: str) -> bool:
+def _uzivatel_ke_smazani(email: str):
     """
-    Smaže uživatele a všechny jeho analýzy.
+    Ověří, že volající smí smazat uživatele, a vrátí jeho řádek.
     
     Args:
         email: Email uživatele ke smazání
     
     Returns:
-        bool: True pokud byl uživatel úspěšně smazán
+        Row: Řádek uživatele
     """
     # Ověření, že volající je admin
     over_admin_prava()
     
-    zapsat_info(f"Mažu uživatele: {email}")
-    
-    uzivatel = app_tables.users.get(email=email)
-
     # Kontrola, zda nejde o aktuálně přihlášeného uživatele
     aktualni_uzivatel = anvil.users.get_user()
     if aktualni_uzivatel and aktualni_uzivatel['email'] == email:
         raise ValueError("Nelze smazat vlastní účet, se kterým jste aktuálně přihlášeni.")
     
+    uzivatel = app_tables.users.get(email=email)
     if not uzivatel:
         raise ValueError(f"Uživatel {email} nebyl nalezen")
-        
-    # Nejprve získáme a smažeme všechny analýzy uživatele
-    analyzy = app_tables.analyzy.search(uzivatel=uzivatel)
-    pocet_analyz = 0
+    return uzivatel
+
+@tables.in_transaction
+def _smaz_davku_analyz(uzivatel, velikost_davky: int) -> int:
+    """
+    Smaže v jedné transakci nejvýše velikost_davky analýz uživatele i s výsledky v cache.
+    Při konfliktu s jinou transakcí ji in_transaction spustí znovu.
     
-    for analyza in analyzy:
-        try:
-            analyza.delete()
-            pocet_analyz += 1
-        except Exception as e:
-            zapsat_chybu(f"Chyba při mazání analýzy: {str(e)}")
-            # Pokračujeme s dalšími analýzami
+    Args:
+        uzivatel: Řádek uživatele
+        velikost_davky: Maximální počet analýz v dávce
+    
+    Returns:
+        int: Počet smazaných analýz (0, pokud už žádné nezbývají)
+    """
+    davka = list(itertools.islice(
+        app_tables.analyzy.search(q.fetch_only("sdilena_data"), uzivatel=uzivatel), velikost_davky
+    ))
+    Cache_vysledku.zneplatni_cache_analyz(davka)
+    sdilena = {a["sdilena_data"].get_id(): a["sdilena_data"] for a in davka if a["sdilena_data"] is not None}
+    for analyza in davka:
+        analyza.delete()
+    for radek in sdilena.values():
+        Uloziste_analyz.uvolni_sdilena_data(radek)
+    return len(davka)
+
+def smaz_analyzy_uzivatele(uzivatel, pri_prubehu=None) -> int:
+    """
+    Smaže všechny analýzy uživatele po dávkách (VELIKOST_DAVKY_MAZANI),
+    každou dávku atomicky. Přerušené mazání lze spustit znovu.
     
-    # Nakonec smažeme samotného uživatele
+    Args:
+        uzivatel: Řádek uživatele
+        pri_prubehu: Volitelná funkce volaná po každé dávce s počtem dosud smazaných analýz
+    
+    Returns:
+        int: Počet smazaných analýz
+    """
+    smazano = 0
+    while True:
+        pocet = _smaz_davku_analyz(uzivatel, VELIKOST_DAVKY_MAZANI)
+        if not pocet:
+            return smazano
+        smazano += pocet
+        if pri_prubehu:
+            pri_prubehu(smazano)
+
+@anvil.server.callable
+@handle_errors
+def smaz_uzivatele(email: str) -> bool:
+    """
+    Smaže uživatele a všechny jeho analýzy.
+    U uživatelů s mnoha analýzami je vhodnější spust_mazani_uzivatele.
+    
+    Args:
+        email: Email uživatele ke smazání
+    
+    Returns:
+        bool: True pokud byl uživatel úspěšně smazán
+    """
+    zapsat_info(f"Mažu uživatele: {email}")
+    uzivatel = _uzivatel_ke_smazani(email)
+    
+    # Nejprve smažeme všechny analýzy uživatele, nakonec samotného uživatele
+    pocet_analyz = smaz_analyzy_uzivatele(uzivatel)
     uzivatel.delete()
     zapsat_info(f"Uživatel {email} a {pocet_analyz} analýz úspěšně smazáno")
     
     return True
 
+@anvil.server.callable
+@handle_errors
+def spust_mazani_uzivatele(email: str):
+    """
+    Spustí smazání uživatele a jeho analýz na pozadí.
+    Průběh je v task_state úlohy (celkem, smazano, hotovo).
+    
+    Args:
+        email: Email uživatele ke smazání
+    
+    Returns:
+        Task: Úloha na pozadí, kterou klient sleduje
+    """
+    _uzivatel_ke_smazani(email)
+    zapsat_info(f"Spouštím mazání uživatele {email} na pozadí")
+    return anvil.server.launch_background_task('smaz_uzivatele_na_pozadi', email)
+
+@anvil.server.background_task
+def smaz_uzivatele_na_pozadi(email: str) -> int:
+    """
+    Úloha na pozadí pro spust_mazani_uzivatele.
+    
+    Args:
+        email: Email uživatele ke smazání (oprávnění ověřil spust_mazani_uzivatele)
+    
+    Returns:
+        int: Počet smazaných analýz
+    """
+    uzivatel = app_tables.users.get(email=email)
+    if not uzivatel:
+        raise ValueError(f"Uživatel {email} nebyl nalezen")
+    
+    anvil.server.task_state["celkem"] = pocet_analyz_uzivatele(uzivatel)
+    anvil.server.task_state["smazano"] = 0
+    
+    def pri_prubehu(smazano):
+        anvil.server.task_state["smazano"] = smazano
+    
+    pocet_analyz = smaz_analyzy_uzivatele(uzivatel, pri_prubehu)
+    uzivatel.delete()
+    anvil.server.task_state["hotovo"] = True
+    zapsat_info(f"Uživatel {email} a {pocet_analyz} analýz smazáno na pozadí")
+    return pocet_analyz
+
 # =============== Správa analýz uživatelů ===============
 
+def polozka_seznamu_analyz(analyza) -> Dict:
+    """
+    Sestaví položku seznamu analýz ze souhrnných sloupců řádku.
+    
+    Args:
+        analyza: Řádek tabulky analyzy (stačí sloupce SLOUPCE_SEZNAMU)
+        
+    Returns:
+        Dict: Metadata analýzy pro seznamy
+    """
+    return {
+        "id": analyza.get_id(),
+        "nazev": analyza["nazev"],
+        "datum_vytvoreni": analyza["datum_vytvoreni"],
+        "datum_upravy": analyza["datum_upravy"],
+        "popis": analyza["popis"] or "",
+        "pocet_kriterii": analyza["pocet_kriterii"],
+        "pocet_variant": analyza["pocet_variant"],
+        "velikost_dat": analyza["velikost_dat"],
+        "posledni_vitez": analyza["posledni_vitez"],
+        "posledni_metoda": analyza["posledni_metoda"],
+        "hash_dat": analyza["hash_dat"]
+    }
+
 @anvil.server.callable
 @handle_errors
 def nacti_analyzy_uzivatele(limit: Optional[int] = None, sort_by: str = "datum_vytvoreni") -> List[Dict]:
@@ -229,35 +392,29 @@ def nacti_analyzy_uzivatele(limit: Optional[int] = None, sort_by: str = "datum_v
     try:
         # Načtení analýz uživatele podle požadovaného řazení
         if sort_by == "datum_vytvoreni":
-            analyzy = list(app_tables.analyzy.search(
+            analyzy = app_tables.analyzy.search(
+                q.fetch_only(*SLOUPCE_SEZNAMU),
                 tables.order_by("datum_vytvoreni", ascending=False),
                 uzivatel=uzivatel
-            ))
+            )
         elif sort_by == "datum_upravy":
-            analyzy = list(app_tables.analyzy.search(
+            analyzy = app_tables.analyzy.search(
+                q.fetch_only(*SLOUPCE_SEZNAMU),
                 tables.order_by("datum_upravy", ascending=False),
                 uzivatel=uzivatel
-            ))
+            )
         else:
-            analyzy = list(app_tables.analyzy.search(
+            analyzy = app_tables.analyzy.search(
+                q.fetch_only(*SLOUPCE_SEZNAMU),
                 uzivatel=uzivatel
-            ))
+            )
             
-        # Omezení počtu výsledků, pokud je požadováno
+        # Omezení počtu výsledků, pokud je požadováno (search načítá řádky postupně)
         if limit is not None:
-            analyzy = analyzy[:limit]
+            analyzy = itertools.islice(analyzy, limit)
             
-        # Sestavení výstupních dat
-        result = []
-        for a in analyzy:
-            item = {
-                "id": a.get_id(),
-                "nazev": a["nazev"],
-                "datum_vytvoreni": a["datum_vytvoreni"],
-                "datum_upravy": a["datum_upravy"],
-                "popis": a["data_json"].get("popis", "")
-            }
-            result.append(item)
+        # Sestavení výstupních dat jen ze souhrnných sloupců
+        result = [polozka_seznamu_analyz(a) for a in analyzy]
             
         return result
         
@@ -265,6 +422,83 @@ def nacti_analyzy_uzivatele(limit: Optional[int] = None, sort_by: str = "datum_v
         zapsat_chybu(f"Chyba při načítání analýz uživatele: {str(e)}")
         return []
 
+def vzor_hledani_nazvu(hledany_nazev: str) -> str:
+    """
+    Sestaví vzor pro q.ilike, který najde názvy obsahující zadaný text.
+    Znaky % a _ zadané uživatelem se hledají doslova, ne jako zástupné znaky.
+    
+    Args:
+        hledany_nazev: Text zadaný uživatelem
+        
+    Returns:
+        str: Vzor pro q.ilike
+    """
+    for znak in ZNAKY_VZORU:
+        hledany_nazev = hledany_nazev.replace(znak, "\\" + znak)
+    return f"%{hledany_nazev}%"
+
+@anvil.server.callable
+@handle_errors
+def nacti_stranku_analyz(velikost_stranky: int = VELIKOST_STRANKY, kurzor: Optional[Dict] = None,
+                         hledany_nazev: Optional[str] = None) -> Dict:
+    """
+    Načte jednu stránku analýz přihlášeného uživatele od nejnovější.
+    
+    Stránky navazují přes kurzor (datum vytvoření poslední vrácené analýzy
+    a ID analýz s tímto datem, které už byly vráceny), takže se řádky
+    nenačítají od začátku a pořadí je stabilní i při shodném datu.
+    
+    Args:
+        velikost_stranky: Počet analýz na stránce (nejvýše MAX_VELIKOST_STRANKY)
+        kurzor: Kurzor vrácený předchozí stránkou, None pro první stránku
+        hledany_nazev: Část názvu analýzy pro vyhledávání (bez ohledu na velikost písmen)
+        
+    Returns:
+        Dict: Klíče 'analyzy' (seznam analýz s metadaty) a 'kurzor'
+              (kurzor další stránky, None pokud další analýzy nejsou)
+    """
+    uzivatel = anvil.users.get_user()
+    if not uzivatel:
+        return {"analyzy": [], "kurzor": None}
+    
+    velikost_stranky = max(1, min(int(velikost_stranky), MAX_VELIKOST_STRANKY))
+    
+    podminky = {"uzivatel": uzivatel}
+    if hledany_nazev and hledany_nazev.strip():
+        podminky["nazev"] = q.ilike(vzor_hledani_nazvu(hledany_nazev.strip()))
+    
+    # Analýzy s datem kurzoru, které už byly vráceny, se přeskočí
+    vracene_na_hranici = set()
+    if kurzor:
+        podminky["datum_vytvoreni"] = q.less_than_or_equal_to(kurzor["datum_vytvoreni"])
+        vracene_na_hranici = set(kurzor["id_na_hranici"])
+    
+    analyzy = app_tables.analyzy.search(
+        q.fetch_only(*SLOUPCE_SEZNAMU),
+        tables.order_by("datum_vytvoreni", ascending=False),
+        **podminky
+    )
+    
+    # O jednu analýzu víc, abychom poznali, zda existuje další stránka
+    stranka = []
+    for analyza in analyzy:
+        if analyza.get_id() in vracene_na_hranici:
+            continue
+        stranka.append(polozka_seznamu_analyz(analyza))
+        if len(stranka) > velikost_stranky:
+            break
+    
+    dalsi_kurzor = None
+    if len(stranka) > velikost_stranky:
+        stranka = stranka[:velikost_stranky]
+        datum_hranice = stranka[-1]["datum_vytvoreni"]
+        id_na_hranici = [a["id"] for a in stranka if a["datum_vytvoreni"] == datum_hranice]
+        if kurzor and kurzor["datum_vytvoreni"] == datum_hranice:
+            id_na_hranici.extend(vracene_na_hranici)
+        dalsi_kurzor = {"datum_vytvoreni": datum_hranice, "id_na_hranici": id_na_hranici}
+    
+    return {"analyzy": stranka, "kurzor": dalsi_kurzor}
+
 @anvil.server.callable
 @handle_errors
 def nacti_analyzy_uzivatele_admin(email: str, sort_by: str = "datum_vytvoreni") -> List[Dict]:
@@ -292,30 +526,24 @@ def nacti_analyzy_uzivatele_admin(email: str, sort_by: str = "datum_vytvoreni")
         # Získání analýz uživatele
         if sort_by == "datum_vytvoreni":
             analyzy = list(app_tables.analyzy.search(
+                q.fetch_only(*SLOUPCE_SEZNAMU),
                 tables.order_by("datum_vytvoreni", ascending=False),
                 uzivatel=uzivatel
             ))
         elif sort_by == "datum_upravy":
             analyzy = list(app_tables.analyzy.search(
+                q.fetch_only(*SLOUPCE_SEZNAMU),
                 tables.order_by("datum_upravy", ascending=False),
                 uzivatel=uzivatel
             ))
         else:
             analyzy = list(app_tables.analyzy.search(
+                q.fetch_only(*SLOUPCE_SEZNAMU),
                 uzivatel=uzivatel
             ))
         
-        # Sestavení výstupních dat
-        result = []
-        for a in analyzy:
-            item = {
-                "id": a.get_id(),
-                "nazev": a["nazev"],
-                "datum_vytvoreni": a["datum_vytvoreni"],
-                "datum_upravy": a["datum_upravy"],
-                "popis": a["data_json"].get("popis", "")
-            }
-            result.append(item)
+        # Sestavení výstupních dat jen ze souhrnných sloupců
+        result = [polozka_seznamu_analyz(a) for a in analyzy]
         
         zapsat_info(f"Nalezeno {len(result)} analýz pro uživatele {email}")
         return result
@@ -324,6 +552,19 @@ def nacti_analyzy_uzivatele_admin(email: str, sort_by: str = "datum_vytvoreni")
         zapsat_chybu(f"Chyba při načítání analýz pro uživatele {email}: {str(e)}")
         raise ValueError(f"Chyba při načítání analýz: {str(e)}")
 
+def pocet_analyz_uzivatele(uzivatel) -> int:
+    """
+    Spočítá analýzy uživatele bez načtení jejich řádků.
+    Délku výsledku vyhledávání zjistí databáze, nevytváří se seznam řádků.
+    
+    Args:
+        uzivatel: Řádek uživatele z tabulky 'users'
+    
+    Returns:
+        int: Počet analýz uživatele
+    """
+    return len(app_tables.analyzy.search(q.fetch_only(), uzivatel=uzivatel))
+
 @anvil.server.callable
 @handle_errors
 def vrat_pocet_analyz_pro_uzivatele(uzivatel) -> int:
@@ -337,19 +578,39 @@ def vrat_pocet_analyz_pro_uzivatele(uzivatel) -> int:
         int: Celkový počet analýz, které se vážou k danému uživateli
     """
     try:
-        zapsat_info(f"Hledám analýzy pro uživatele: {uzivatel['email']}")
-        
-        # Převedeme výsledek vyhledávání na list a spočítáme jeho délku
-        analyzy = list(app_tables.analyzy.search(uzivatel=uzivatel))
-        pocet = len(analyzy)
-        
-        zapsat_info(f"Nalezeno analýz: {pocet}")
+        pocet = pocet_analyz_uzivatele(uzivatel)
+        zapsat_info(f"Uživatel {uzivatel['email']} má {pocet} analýz")
         return pocet
         
     except Exception as e:
         zapsat_chybu(f"Chyba při načítání počtu analýz pro uživatele {uzivatel['email']}: {str(e)}")
         return 0
 
+@anvil.server.callable
+@handle_errors
+def vrat_pocty_analyz_pro_uzivatele(emaily: List[str]) -> Dict[str, int]:
+    """
+    Vrátí počty analýz pro více uživatelů jedním voláním serveru.
+    Cizí počty smí zjišťovat jen administrátor, ostatní uživatelé jen svůj.
+    
+    Args:
+        emaily: Emaily uživatelů
+    
+    Returns:
+        Dict[str, int]: Počet analýz podle emailu (neexistující uživatelé mají 0)
+    """
+    aktualni_uzivatel = anvil.users.get_user()
+    if not aktualni_uzivatel:
+        raise ValueError("Uživatel není přihlášen.")
+    if any(email != aktualni_uzivatel["email"] for email in emaily):
+        over_admin_prava()
+    
+    pocty = {}
+    for email in emaily:
+        uzivatel = app_tables.users.get(q.fetch_only("email"), email=email)
+        pocty[email] = pocet_analyz_uzivatele(uzivatel) if uzivatel else 0
+    return pocty
+
 # =============== Administrativní funkce ===============
 
 @anvil.server.callable
@@ -385,6 +646,21 @@ def nastavit_roli_po_registraci(email: str) -> bool:
 
 # =============== Pomocné funkce ===============
 
+@anvil.server.callable
+@handle_errors
+def spust_doplneni_souhrnu() -> str:
+    """
+    Spustí na pozadí doplnění souhrnných sloupců u starších analýz
+    (Uloziste_analyz.doplnit_souhrny_analyz).
+    
+    Returns:
+        str: ID úlohy na pozadí
+    """
+    over_admin_prava()
+    uloha = anvil.server.launch_background_task('doplnit_souhrny_analyz')
+    zapsat_info(f"Spuštěno doplnění souhrnů analýz, úloha {uloha.get_id()}")
+    return uloha.get_id()
+
 def over_admin_prava():
     """
     Ověří, zda má přihlášený uživatel administrátorská práva.
@@ -0,0 +1,265 @@
+# -------------------------------------------------------
+# Modul: Ulohy_vypoctu
+#
+# Náročné výpočty (WSM, TOPSIS, MABAC, ELECTRE, Monte Carlo robustnost, více metod
+# najednou) jako úlohy na pozadí, aby velké analýzy nepřekročily časový limit
+# požadavku. Klient úlohu spustí (spust_ulohu_vypoctu) a dotazuje se na její stav
+# (stav_ulohy_vypoctu), dokud není hotová - viz klientský modul Ulohy.
+#
+# Úloha volá stejné funkce spocitej_* z Vypocty_analyzy jako přímá callable,
+# výsledek se tedy ukládá i do cache (Cache_vysledku). Průběh je v task_state
+# úlohy (faze, zpracovano, celkem), výsledek je návratová hodnota úlohy.
+# Malé analýzy (odhad práce ze souhrnných sloupců analýzy) se spočítají hned.
+#
+# Bez background tasks Anvilu (lokální testy, ULOHY_VE_VLAKNECH) běží úlohy
+# ve ThreadPoolExecutor a jejich stav se drží v paměti procesu.
+#
+# Vlastníka úlohy zapisuje server už při spuštění (lokální úloha do svého stavu,
+# úloha na pozadí do relace uživatele pod klíčem KLIC_ULOH_RELACE), stav úlohy
+# bez zapsaného vlastníka se nevydá nikomu.
+#
+# Funkce:
+# - spust_ulohu_vypoctu: Spuštění výpočtu (nebo rovnou výsledek u malé analýzy)
+# - stav_ulohy_vypoctu: Stav, průběh a po dokončení výsledek úlohy
+# - proved_ulohu_vypoctu: Úloha na pozadí
+# - odhad_prace: Odhad počtu operací výpočtu
+# -------------------------------------------------------
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+import anvil.server
+import anvil.users
+from anvil.tables import app_tables
+
+from . import Vypocty_analyzy
+from .CRUD_analyzy import handle_errors, zapsat_info
+
+# Typy úloh: kód -> (výpočet nad řádkem analýzy, parametry, které smí předat klient)
+TYPY_ULOH = {
+    'vysledky_metod': (Vypocty_analyzy.spocitej_vysledky_metod, ('metody', 'nekladne_hodnoty')),
+    'wsm': (Vypocty_analyzy.spocitej_wsm, ()),
+    'topsis': (Vypocty_analyzy.spocitej_topsis, ()),
+    'mabac': (Vypocty_analyzy.spocitej_mabac, ()),
+    'electre': (Vypocty_analyzy.spocitej_electre, ('varianta_metody', 'parametry')),
+    'robustnost': (Vypocty_analyzy.spocitej_robustnost,
+                   ('metoda', 'pocet_vzorku', 'koncentrace', 'max_poradi', 'pocet_procesu', 'seed'))
+}
+
+# Výpočty s menším odhadem práce se provedou přímo v požadavku
+MAX_PRACE_PRIMEHO_VYPOCTU = 2000000
+
+# Lokální běh bez background tasks Anvilu
+ULOHY_VE_VLAKNECH = os.environ.get("MCAPP_ULOHY_VE_VLAKNECH") == "1"
+MAX_VLAKEN = 4
+
+# Fáze úlohy v task_state
+FAZE_CEKA = 'ceka'
+FAZE_VYPOCET = 'vypocet'
+FAZE_HOTOVO = 'hotovo'
+
+# Stavy úlohy vracené klientovi
+STAV_BEZI = 'bezi'
+STAV_HOTOVO = 'hotovo'
+STAV_CHYBA = 'chyba'
+
+# Klíč v anvil.server.session: ID úlohy na pozadí -> ID uživatele, který ji spustil
+KLIC_ULOH_RELACE = 'ulohy_vypoctu'
+
+# Lokální úlohy: id -> (Future, stav)
+_vykonavatel = None
+_lokalni_ulohy = {}
+_zamek = threading.Lock()
+
+def odhad_prace(typ_ulohy: str, analyza, parametry: Dict) -> Optional[int]:
+    """
+    Odhadne počet operací výpočtu ze souhrnných sloupců analýzy.
+
+    Args:
+        typ_ulohy: Kód typu úlohy z TYPY_ULOH
+        analyza: Řádek tabulky analyzy
+        parametry: Parametry úlohy
+
+    Returns:
+        Optional[int]: Odhad práce, None pokud analýza nemá doplněný souhrn
+    """
+    if analyza["pocet_variant"] is None or analyza["pocet_kriterii"] is None:
+        return None
+
+    prace = analyza["pocet_variant"] * analyza["pocet_kriterii"]
+    if typ_ulohy == 'electre':
+        # Párové srovnání všech variant
+        prace *= analyza["pocet_variant"]
+    elif typ_ulohy == 'robustnost':
+        prace *= parametry.get('pocet_vzorku', 100000)
+    elif typ_ulohy == 'vysledky_metod':
+        prace *= len(parametry.get('metody', ()))
+    return prace
+
+def _proved(typ_ulohy: str, analyza_id: str, parametry: Dict, stav):
+    """
+    Provede výpočet úlohy a průběžně zapisuje jeho stav.
+
+    Args:
+        typ_ulohy: Kód typu úlohy z TYPY_ULOH
+        analyza_id: ID analýzy (oprávnění ověřil spust_ulohu_vypoctu)
+        parametry: Parametry výpočtu
+        stav: task_state úlohy nebo slovník lokální úlohy
+
+    Returns:
+        Výsledek výpočtu
+    """
+    vypocet, _ = TYPY_ULOH[typ_ulohy]
+    analyza = app_tables.analyzy.get_by_id(analyza_id)
+    if not analyza:
+        raise ValueError(f"Analýza s ID {analyza_id} neexistuje.")
+
+    stav['faze'] = FAZE_VYPOCET
+    if typ_ulohy == 'robustnost':
+        def pri_prubehu(zpracovano, celkem):
+            stav['zpracovano'] = zpracovano
+            stav['celkem'] = celkem
+        parametry = dict(parametry, pri_prubehu=pri_prubehu)
+
+    vysledek = vypocet(analyza, **parametry)
+    stav['faze'] = FAZE_HOTOVO
+    zapsat_info(f"Úloha {typ_ulohy} pro analýzu {analyza_id} dokončena")
+    return vysledek
+
+@anvil.server.background_task
+def proved_ulohu_vypoctu(typ_ulohy: str, analyza_id: str, parametry: Dict):
+    """
+    Úloha na pozadí pro spust_ulohu_vypoctu.
+
+    Args:
+        typ_ulohy: Kód typu úlohy z TYPY_ULOH
+        analyza_id: ID analýzy
+        parametry: Parametry výpočtu
+
+    Returns:
+        Výsledek výpočtu
+    """
+    return _proved(typ_ulohy, analyza_id, parametry, anvil.server.task_state)
+
+def _spust_ve_vlakne(typ_ulohy: str, analyza_id: str, parametry: Dict, uzivatel_id: str) -> str:
+    """Spustí úlohu v lokálním ThreadPoolExecutor a vrátí její ID."""
+    global _vykonavatel
+    with _zamek:
+        if _vykonavatel is None:
+            _vykonavatel = ThreadPoolExecutor(max_workers=MAX_VLAKEN)
+        id_ulohy = f"lokalni-{uuid.uuid4().hex}"
+        stav = {'uzivatel': uzivatel_id, 'faze': FAZE_CEKA}
+        _lokalni_ulohy[id_ulohy] = (_vykonavatel.submit(_proved, typ_ulohy, analyza_id, parametry, stav), stav)
+    return id_ulohy
+
+def _zapis_vlastnika(id_ulohy: str, uzivatel_id: str) -> None:
+    """Zapíše vlastníka úlohy na pozadí do relace uživatele."""
+    ulohy = dict(anvil.server.session.get(KLIC_ULOH_RELACE) or {})
+    ulohy[id_ulohy] = uzivatel_id
+    anvil.server.session[KLIC_ULOH_RELACE] = ulohy
+
+def _odeber_vlastnika(id_ulohy: str) -> None:
+    """Odebere dokončenou úlohu na pozadí z relace uživatele."""
+    ulohy = dict(anvil.server.session.get(KLIC_ULOH_RELACE) or {})
+    if ulohy.pop(id_ulohy, None) is not None:
+        anvil.server.session[KLIC_ULOH_RELACE] = ulohy
+
+def _prubeh(stav) -> Dict:
+    """Vrátí průběh úlohy pro klienta (bez interních údajů)."""
+    return {klic: stav[klic] for klic in ('faze', 'zpracovano', 'celkem') if klic in stav}
+
+@anvil.server.callable
+@handle_errors
+def spust_ulohu_vypoctu(typ_ulohy: str, analyza_id: str, parametry: Optional[Dict] = None) -> Dict:
+    """
+    Spustí výpočet analýzy jako úlohu na pozadí. Malou analýzu spočítá hned.
+
+    Args:
+        typ_ulohy: Kód typu úlohy z TYPY_ULOH
+        analyza_id: ID analýzy
+        parametry: Parametry výpočtu (klíčové argumenty příslušné funkce spocitej_*)
+
+    Returns:
+        Dict: {'stav': 'hotovo', 'vysledek': ...} nebo {'stav': 'bezi', 'id': ID úlohy, 'prubeh': {}}
+    """
+    if typ_ulohy not in TYPY_ULOH:
+        raise ValueError(f"Neznámý typ úlohy: {typ_ulohy}")
+    vypocet, povolene_parametry = TYPY_ULOH[typ_ulohy]
+
+    parametry = dict(parametry or {})
+    nezname = set(parametry) - set(povolene_parametry)
+    if nezname:
+        raise ValueError(f"Neznámé parametry úlohy {typ_ulohy}: {', '.join(sorted(nezname))}")
+
+    analyza = Vypocty_analyzy.nacti_analyzu_pro_vypocet(analyza_id)
+
+    prace = odhad_prace(typ_ulohy, analyza, parametry)
+    if prace is not None and prace <= MAX_PRACE_PRIMEHO_VYPOCTU:
+        return {'stav': STAV_HOTOVO, 'vysledek': vypocet(analyza, **parametry)}
+
+    uzivatel_id = anvil.users.get_user().get_id()
+    if ULOHY_VE_VLAKNECH:
+        id_ulohy = _spust_ve_vlakne(typ_ulohy, analyza_id, parametry, uzivatel_id)
+    else:
+        id_ulohy = anvil.server.launch_background_task(
+            'proved_ulohu_vypoctu', typ_ulohy, analyza_id, parametry).get_id()
+        _zapis_vlastnika(id_ulohy, uzivatel_id)
+
+    zapsat_info(f"Spuštěna úloha {typ_ulohy} pro analýzu {analyza_id} ({id_ulohy})")
+    return {'stav': STAV_BEZI, 'id': id_ulohy, 'prubeh': {}}
+
+@anvil.server.callable
+@handle_errors
+def stav_ulohy_vypoctu(id_ulohy: str) -> Dict:
+    """
+    Vrátí stav úlohy spuštěné přes spust_ulohu_vypoctu.
+
+    Args:
+        id_ulohy: ID úlohy
+
+    Returns:
+        Dict: {'stav': 'bezi', 'prubeh': {...}}, {'stav': 'hotovo', 'vysledek': ...}
+              nebo {'stav': 'chyba', 'chyba': text chyby}
+
+    Raises:
+        ValueError: Pokud úloha nemá zapsaného vlastníka nebo jím uživatel není
+    """
+    uzivatel = anvil.users.get_user()
+    if not uzivatel:
+        raise ValueError("Pro zjištění stavu výpočtu musíte být přihlášen.")
+
+    # Vlastník se ověřuje vždy a dřív, než se na úlohu sáhne
+    lokalni = _lokalni_ulohy.get(id_ulohy)
+    if lokalni:
+        vlastnik = lokalni[1]['uzivatel']
+    else:
+        vlastnik = (anvil.server.session.get(KLIC_ULOH_RELACE) or {}).get(id_ulohy)
+    if vlastnik is None or (vlastnik != uzivatel.get_id() and uzivatel.get('role') != 'admin'):
+        raise ValueError("Úloha neexistuje nebo k ní nemáte oprávnění.")
+
+    if lokalni:
+        future, stav = lokalni
+        ukonceni = None
+        if future.done():
+            ukonceni = 'failed' if future.exception() else 'completed'
+    else:
+        uloha = anvil.server.get_background_task(id_ulohy)
+        stav = dict(uloha.get_state() or {})
+        ukonceni = uloha.get_termination_status()
+
+    if ukonceni is None:
+        return {'stav': STAV_BEZI, 'prubeh': _prubeh(stav)}
+
+    if lokalni:
+        _lokalni_ulohy.pop(id_ulohy, None)
+        if ukonceni == 'completed':
+            return {'stav': STAV_HOTOVO, 'vysledek': future.result()}
+        return {'stav': STAV_CHYBA, 'chyba': str(future.exception())}
+
+    _odeber_vlastnika(id_ulohy)
+
+    if ukonceni == 'completed':
+        return {'stav': STAV_HOTOVO, 'vysledek': uloha.get_return_value()}
+    chyba = uloha.get_error() if ukonceni == 'failed' else None
+    return {'stav': STAV_CHYBA, 'chyba': str(chyba) if chyba else f"Výpočet byl ukončen ({ukonceni})."}
@@ -0,0 +1,294 @@
+# -------------------------------------------------------
+# Modul: Uloziste_analyz
+#
+# Sloupcový formát uložení dat analýzy ve sloupci analyzy.data_json.
+# Původní formát (verze 1) jsou vnořené slovníky "varianty" -> {kriterium -> hodnota},
+# u velkých analýz statisíce klíčů, které se serializují při každém čtení a zápisu.
+# Verze 2 ukládá seřazené seznamy kritérií a variant a hodnoty jako jedno
+# base64 pole float64 (little-endian) po řádcích variant:
+#
+#   {"verze_formatu": 2, "popis_analyzy": str,
+#    "kriteria": [nazev], "typy_kriterii": [typ], "vahy": [vaha],
+#    "varianty": [nazev], "popisy_variant": [popis],
+#    "hodnoty": base64, "chybejici": [[i, j]]}
+#
+# Řádky ve verzi 1 se převádí líně při prvním čtení (nacti_matici) v transakci,
+# takže souběžná čtení téže analýzy převod neprovedou dvakrát.
+# Ostatní moduly s data_json pracují jen přes tento modul.
+#
+# Klony analýz (copy-on-write) nemají vlastní data_json, ale odkaz sdilena_data
+# na neměnný řádek tabulky sdilena_data určený hashem obsahu. Vlastní kopii dat
+# klon dostane až při první změně (uloz_data). Řádek sdílených dat se smaže,
+# když na něj přestane odkazovat poslední analýza.
+#
+# Funkce:
+# - je_sloupcovy_format: Test, zda jsou data už ve verzi 2
+# - zakoduj_data: Převod data_json (libovolné verze) nebo Matice_analyzy do verze 2
+# - dekoduj_data: Převod uložených dat na Matice_analyzy
+# - nacti_matici: Matice analýzy z řádku tabulky s línou migrací
+# - uloz_data: Zápis dat do řádku včetně hashe, souhrnu a zneplatnění cache
+# - souhrn_dat: Hodnoty souhrnných sloupců pro seznamy analýz
+# - ulozena_data: Uložený obsah dat analýzy (vlastní nebo sdílený)
+# - sdilej_data: Převedení dat analýzy do sdíleného řádku pro klonování
+# - uvolni_sdilena_data: Smazání sdílených dat, na která už nic neodkazuje
+# - doplnit_souhrny_analyz: Úloha na pozadí doplňující souhrn starším řádkům
+#
+# Souhrnné sloupce (popis, pocet_kriterii, pocet_variant, velikost_dat) se udržují
+# při každém zápisu dat, posledni_vitez a posledni_metoda zapisuje Cache_vysledku.
+# Seznamy analýz tak nikdy nemusí načítat data_json.
+# -------------------------------------------------------
+import base64
+import json
+import logging
+import sys
+from array import array
+from typing import Dict
+import anvil.server
+import anvil.tables as tables
+import anvil.tables.query as q
+from anvil.tables import app_tables
+
+from . import Cache_vysledku
+from .Matice_analyzy import Matice_analyzy
+
+# Aktuální verze formátu uložení, data bez klíče verze jsou verze 1
+VERZE_FORMATU = 2
+KLIC_VERZE = "verze_formatu"
+
+def je_sloupcovy_format(data_json) -> bool:
+    """
+    Zjistí, zda jsou uložená data už ve sloupcovém formátu.
+
+    Args:
+        data_json: Obsah sloupce data_json
+
+    Returns:
+        bool: True pro verzi 2
+    """
+    return isinstance(data_json, dict) and data_json.get(KLIC_VERZE) == VERZE_FORMATU
+
+def _zabal_hodnoty(hodnoty) -> str:
+    """Zakóduje plochý buffer hodnot jako base64 float64 little-endian."""
+    pole = array('d', hodnoty)
+    if sys.byteorder == "big":
+        pole.byteswap()
+    return base64.b64encode(pole.tobytes()).decode("ascii")
+
+def _rozbal_hodnoty(zakodovane: str):
+    """Dekóduje base64 float64 little-endian na array('d')."""
+    pole = array('d')
+    pole.frombytes(base64.b64decode(zakodovane))
+    if sys.byteorder == "big":
+        pole.byteswap()
+    return pole
+
+def zakoduj_data(data) -> Dict:
+    """
+    Převede data analýzy do sloupcového formátu pro uložení.
+
+    Args:
+        data: data_json ve verzi 1 nebo 2, případně Matice_analyzy
+
+    Returns:
+        Dict: Data ve formátu verze 2
+    """
+    if je_sloupcovy_format(data):
+        return data
+
+    matice = Matice_analyzy.z_json(data)
+    return {
+        KLIC_VERZE: VERZE_FORMATU,
+        "popis_analyzy": matice.popis_analyzy,
+        "kriteria": list(matice.kriteria),
+        "typy_kriterii": list(matice.typy_kriterii),
+        "vahy": list(matice.vahy),
+        "varianty": list(matice.varianty),
+        "popisy_variant": list(matice.popisy_variant),
+        "hodnoty": _zabal_hodnoty(matice.hodnoty),
+        "chybejici": [list(pozice) for pozice in matice.chybejici]
+    }
+
+def dekoduj_data(data_json) -> Matice_analyzy:
+    """
+    Převede uložená data analýzy (libovolné verze) na matici.
+
+    Args:
+        data_json: Obsah sloupce data_json
+
+    Returns:
+        Matice_analyzy: Matice analýzy
+    """
+    if not je_sloupcovy_format(data_json):
+        return Matice_analyzy.z_json(data_json or {})
+
+    return Matice_analyzy(
+        data_json["kriteria"],
+        data_json["typy_kriterii"],
+        data_json["vahy"],
+        data_json["varianty"],
+        _rozbal_hodnoty(data_json["hodnoty"]),
+        data_json["popisy_variant"],
+        data_json.get("popis_analyzy", ""),
+        [tuple(pozice) for pozice in data_json.get("chybejici", [])]
+    )
+
+def souhrn_dat(zakodovana: Dict) -> Dict:
+    """
+    Spočítá souhrnné sloupce řádku analýzy z dat ve sloupcovém formátu.
+
+    Args:
+        zakodovana: Data ve formátu verze 2
+
+    Returns:
+        Dict: Hodnoty sloupců popis, pocet_kriterii, pocet_variant a velikost_dat
+    """
+    return {
+        "popis": zakodovana.get("popis_analyzy", ""),
+        "pocet_kriterii": len(zakodovana["kriteria"]),
+        "pocet_variant": len(zakodovana["varianty"]),
+        "velikost_dat": len(json.dumps(zakodovana, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+    }
+
+def ulozena_data(analyza):
+    """
+    Vrátí uložený obsah dat analýzy - vlastní data_json,
+    u nezměněného klonu data_json sdíleného řádku.
+
+    Args:
+        analyza: Řádek tabulky analyzy
+
+    Returns:
+        Obsah data_json (libovolné verze)
+    """
+    sdilena = analyza["sdilena_data"]
+    return sdilena["data_json"] if sdilena is not None else analyza["data_json"]
+
+def sdilej_data(analyza):
+    """
+    Převede data analýzy do sdíleného řádku (podle hashe obsahu), aby na ně
+    mohly odkazovat klony. Už sdílená data vrátí beze změny.
+
+    Args:
+        analyza: Řádek tabulky analyzy
+
+    Returns:
+        Row: Řádek tabulky sdilena_data
+    """
+    sdilena = analyza["sdilena_data"]
+    if sdilena is not None:
+        return sdilena
+
+    # Sdílí se jen data ve sloupcovém formátu, starší řádek se nejprve převede
+    if not je_sloupcovy_format(analyza["data_json"]):
+        nacti_matici(analyza)
+
+    hash_dat = Cache_vysledku.ziskej_hash_dat(analyza)
+    sdilena = app_tables.sdilena_data.get(hash_dat=hash_dat)
+    if sdilena is None:
+        sdilena = app_tables.sdilena_data.add_row(hash_dat=hash_dat, data_json=analyza["data_json"])
+    analyza.update(sdilena_data=sdilena, data_json=None)
+    return sdilena
+
+def uvolni_sdilena_data(sdilena) -> None:
+    """
+    Smaže řádek sdílených dat, pokud na něj už neodkazuje žádná analýza.
+
+    Args:
+        sdilena: Řádek tabulky sdilena_data nebo None
+    """
+    if sdilena is not None and not len(app_tables.analyzy.search(q.fetch_only(), sdilena_data=sdilena)):
+        sdilena.delete()
+
+def nacti_matici(analyza) -> Matice_analyzy:
+    """
+    Načte data analýzy jako matici. Řádek v původním formátu
+    při tom převede do sloupcového formátu a uloží.
+    Volající musí ověřit oprávnění k analýze, převod do ní zapisuje.
+
+    Args:
+        analyza: Řádek tabulky analyzy
+
+    Returns:
+        Matice_analyzy: Matice analýzy
+    """
+    data_json = ulozena_data(analyza)
+    if je_sloupcovy_format(data_json):
+        return dekoduj_data(data_json)
+    return _preved_data(analyza)
+
+@tables.in_transaction
+def _preved_data(analyza) -> Matice_analyzy:
+    """
+    Převede data analýzy v původním formátu do sloupcového a uloží je.
+    Formát se ověřuje znovu uvnitř transakce, souběžné čtení už mohlo data převést.
+
+    Args:
+        analyza: Řádek tabulky analyzy
+
+    Returns:
+        Matice_analyzy: Matice analýzy
+    """
+    analyza.refresh()
+    data_json = ulozena_data(analyza)
+    matice = dekoduj_data(data_json)
+
+    if not je_sloupcovy_format(data_json):
+        uloz_data(analyza, matice)
+        logging.info(f"[INFO] Analýza {analyza.get_id()} převedena do formátu verze {VERZE_FORMATU}")
+
+    return matice
+
+def uloz_data(analyza, data) -> str:
+    """
+    Uloží data analýzy ve sloupcovém formátu a aktualizuje hash dat a souhrn.
+    Při změně obsahu smaže výsledky v cache i posledního vítěze, klon při ní
+    dostane vlastní kopii dat.
+
+    Args:
+        analyza: Řádek tabulky analyzy
+        data: data_json ve verzi 1 nebo 2, případně Matice_analyzy
+
+    Returns:
+        str: Nový hash dat
+    """
+    zakodovana = zakoduj_data(data)
+    novy_hash = Cache_vysledku.vypocitej_hash_dat(zakodovana)
+
+    sdilena = analyza["sdilena_data"]
+    if novy_hash == analyza["hash_dat"] and sdilena is not None:
+        # Obsah se nezměnil, klon dál sdílí data
+        return novy_hash
+
+    # Uložené výsledky platí jen pro původní data
+    if novy_hash != analyza["hash_dat"]:
+        Cache_vysledku.zneplatni_cache(analyza)
+        analyza.update(posledni_vitez=None, posledni_metoda=None)
+
+    analyza.update(data_json=zakodovana, sdilena_data=None, hash_dat=novy_hash, **souhrn_dat(zakodovana))
+    uvolni_sdilena_data(sdilena)
+    return novy_hash
+
+@anvil.server.background_task
+def doplnit_souhrny_analyz():
+    """
+    Doplní souhrnné sloupce (a případně převede data do formátu verze 2)
+    u řádků analýz, které je ještě nemají. Průběh hlásí v task_state.
+
+    Returns:
+        int: Počet doplněných analýz
+    """
+    analyzy = app_tables.analyzy.search(velikost_dat=None)
+    anvil.server.task_state["celkem"] = len(analyzy)
+    doplneno = 0
+    for analyza in analyzy:
+        data_json = ulozena_data(analyza)
+        if je_sloupcovy_format(data_json):
+            analyza.update(**souhrn_dat(data_json))
+        else:
+            # Migrace dat zapíše i souhrn
+            nacti_matici(analyza)
+        doplneno += 1
+        anvil.server.task_state["zpracovano"] = doplneno
+
+    logging.info(f"[INFO] Souhrn doplněn u {doplneno} analýz")
+    return doplneno
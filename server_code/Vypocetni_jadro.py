@@ -0,0 +1,1119 @@
+# -------------------------------------------------------
+# Modul: Vypocetni_jadro
+#
+# Serverová varianta sdílených výpočtů z client_code/Vypocty.py postavená na NumPy.
+# Funkce mají stejné názvy, parametry i výstupní slovníky jako v modulu Vypocty,
+# ale místo vnořených cyklů počítají nad souvislými float64 poli (broadcasting).
+# Modul Vypocty zůstává referenční implementací pro klienta.
+#
+# Funkce:
+# - priprav_data_z_json: Převod JSON dat analýzy (nebo Matice_analyzy) na matici hodnot
+# - vypocitej_statistiky_sloupcu: Jednorázový výpočet statistik sloupců
+# - normalizuj_matici_minmax/_vektorove/_max/_soucet: Normalizace nad sdílenými statistikami
+# - vypocitej_vazene_hodnoty: Vážení normalizované matice
+# - wsm_vypocet, topsis_vypocet, wpm_vypocet, mabac_vypocet: Výpočty jednotlivých metod
+# - vypocitej_wsm, vypocitej_topsis, vypocitej_mabac: Kompletní výpočet z původních hodnot
+# - vypocitej_analyzu_citlivosti: Analýza citlivosti vah jednoho kritéria
+# - vypocitej_citlivost_kriterii: Dávková analýza citlivosti pro více kritérií
+# - vypocitej_body_zlomu: Přesné váhy změny pořadí a interval stability vítěze
+# - skore_wsm, skore_topsis, skore_mabac, skore_wpm(_log), poradi_ze_skore: Výpočty přímo nad poli
+# - indexy_nejlepsich, detail_nejlepsich: Omezení detailních matic na nejlepší varianty
+# - uprav_nekladne_hodnoty, log_matice_wpm: Příprava kladné a logaritmické matice pro WPM
+# - linearni_skore_wpm, seznam_skore: Lineární skóre WPM bez přetečení a jeho převod na list
+# - vypocitej_metody: Dávkový výpočet více metod nad jednou analýzou podle Registr_metod
+# -------------------------------------------------------
+import numpy as np
+
+from . import Registr_metod
+from .Matice_analyzy import Matice_analyzy
+
+# Typy kritérií, které se minimalizují
+TYPY_MINIMALIZACNI = ("min", "cost")
+
+# Politiky pro nekladné hodnoty u WPM, první je výchozí (Konstanty.WPM_NEKLADNE_HODNOTY)
+WPM_NEKLADNE_HODNOTY = ("nahradit", "posunout", "chyba")
+WPM_NAHRADNI_HODNOTA = 0.001  # Konstanty.WPM_NAHRADNI_HODNOTA
+
+# Maximální počet prvků jednoho pomocného pole blok × varianty v bodech zlomu
+# (1M float64 = 8 MB, blok jich drží kolem pěti)
+MAX_PRVKU_BLOKU = 1024 * 1024
+
+# =============== Pomocné funkce ===============
+
+def jako_matici(matice):
+    """
+    Převede vstupní matici na souvislé 2D pole typu float64.
+
+    Args:
+        matice: 2D list nebo NumPy pole [varianty][kriteria]
+
+    Returns:
+        np.ndarray: Pole tvaru (pocet_variant, pocet_kriterii)
+    """
+    pole = np.ascontiguousarray(matice, dtype=np.float64)
+    if pole.ndim != 2:
+        raise ValueError("Matice hodnot musí být dvourozměrná.")
+    return pole
+
+def maska_minimalizacnich(typy_kriterii):
+    """
+    Vrátí booleovskou masku minimalizačních kritérií.
+
+    Args:
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+
+    Returns:
+        np.ndarray: Pole bool, True pro minimalizační kritéria
+    """
+    return np.array([str(t).lower() in TYPY_MINIMALIZACNI for t in typy_kriterii], dtype=bool)
+
+def _poradi_z_skore(skore):
+    """
+    Vrátí indexy variant seřazené podle skóre sestupně.
+    Řazení je stabilní, shodné pořadí jako sorted(..., reverse=True) v modulu Vypocty.
+
+    Args:
+        skore: 1D pole skóre variant
+
+    Returns:
+        np.ndarray: Indexy variant od nejlepší po nejhorší
+    """
+    return np.argsort(-skore, kind="stable")
+
+def indexy_nejlepsich(skore, pocet):
+    """
+    Vrátí indexy nejvýše pocet nejlepších variant ve stejném pořadí jako sestav_vysledky.
+
+    Args:
+        skore: 1D pole skóre variant
+        pocet: Počet vybíraných variant
+
+    Returns:
+        np.ndarray: Indexy nejlepších variant od nejlepší
+    """
+    return _poradi_z_skore(skore)[:pocet]
+
+def detail_nejlepsich(varianty, skore, pocet, matice):
+    """
+    Vybere řádky matic pro nejvýše pocet nejlepších variant ještě v NumPy,
+    takže se do seznamů převádí jen zobrazovaná část.
+
+    Args:
+        varianty: List názvů variant
+        skore: 1D pole skóre variant
+        pocet: Počet nejlepších variant
+        matice: Slovník název -> pole tvaru (pocet_variant, ...)
+
+    Returns:
+        dict: 'varianty' a vybrané řádky každé matice jako listy, od nejlepší varianty
+    """
+    indexy = indexy_nejlepsich(skore, pocet)
+    detail = {'varianty': [varianty[i] for i in indexy.tolist()]}
+    for nazev, pole in matice.items():
+        detail[nazev] = np.asarray(pole)[indexy].tolist()
+    return detail
+
+def sestav_vysledky(varianty, skore):
+    """
+    Sestaví seznam výsledků ve formátu (varianta, poradi, skore).
+
+    Args:
+        varianty: List názvů variant
+        skore: 1D pole skóre variant
+
+    Returns:
+        list: Seznam tuple seřazený podle skóre sestupně
+    """
+    serazene = _poradi_z_skore(skore)
+    hodnoty = skore[serazene].tolist()
+    return [(varianty[idx], poradi, hodnota)
+            for poradi, (idx, hodnota) in enumerate(zip(serazene.tolist(), hodnoty), 1)]
+
+# =============== Příprava dat ===============
+
+def priprav_data_z_json(analyza_data):
+    """
+    Připraví data z JSON struktury pro výpočty.
+
+    Args:
+        analyza_data: Slovník s daty analýzy v novém formátu nebo Matice_analyzy
+
+    Returns:
+        tuple: (matice, typy_kriterii, varianty, kriteria, vahy), kde matice
+               a vahy jsou NumPy pole typu float64
+    """
+    try:
+        # Chybějící nebo neplatné hodnoty převádí Matice_analyzy na 0 (stejně jako modul Vypocty)
+        vstup = Matice_analyzy.z_json(analyza_data)
+        matice = np.array(vstup.hodnoty, dtype=np.float64).reshape(vstup.pocet_variant, vstup.pocet_kriterii)
+        vahy = np.array(vstup.vahy, dtype=np.float64)
+
+        return matice, list(vstup.typy_kriterii), list(vstup.varianty), list(vstup.kriteria), vahy
+
+    except Exception as e:
+        raise ValueError(f"Chyba při přípravě dat pro výpočet: {str(e)}")
+
+# =============== Normalizace a vážení ===============
+
+def vypocitej_statistiky_sloupcu(matice):
+    """
+    Spočítá statistiky každého sloupce (kritéria) matice jedním průchodem.
+    Výsledek sdílí všechny normalizační funkce.
+
+    Args:
+        matice: 2D list nebo pole s hodnotami [varianty][kriteria]
+
+    Returns:
+        dict: Slovník s poli 'min', 'max', 'rozsah', 'soucet' a 'soucet_ctvercu'
+    """
+    pole = jako_matici(matice)
+    min_val = pole.min(axis=0)
+    max_val = pole.max(axis=0)
+    return {
+        'min': min_val,
+        'max': max_val,
+        'rozsah': max_val - min_val,
+        'soucet': pole.sum(axis=0),
+        'soucet_ctvercu': np.einsum('ij,ij->j', pole, pole)
+    }
+
+def _normalizuj_minmax_pole(pole, minimalizacni, statistiky):
+    """Min-max normalizace nad polem, vrací pole stejného tvaru."""
+    min_val = statistiky['min']
+    max_val = statistiky['max']
+    konstantni = statistiky['rozsah'] == 0
+
+    # Dělení nulou u konstantních sloupců obejdeme, výsledek pak přepíšeme na 1.0
+    delitel = np.where(konstantni, 1.0, statistiky['rozsah'])
+    norm = np.where(minimalizacni, (max_val - pole) / delitel, (pole - min_val) / delitel)
+    norm[:, konstantni] = 1.0
+    return norm
+
+def _normalizuj_vektorove_pole(pole, minimalizacni, statistiky):
+    """Vektorová normalizace nad polem, nulové sloupce zůstávají 0."""
+    normy = np.sqrt(statistiky['soucet_ctvercu'])
+    return np.divide(pole, normy, out=np.zeros_like(pole), where=normy != 0)
+
+def _normalizuj_max_pole(pole, minimalizacni, statistiky):
+    """Normalizace maximem nad polem (MIN kritéria jako minimum / hodnota)."""
+    prinosove = np.divide(pole, statistiky['max'], out=np.zeros_like(pole),
+                          where=statistiky['max'] != 0)
+    nakladove = np.divide(np.broadcast_to(statistiky['min'], pole.shape), pole,
+                          out=np.zeros_like(pole), where=pole != 0)
+    return np.where(minimalizacni, nakladove, prinosove)
+
+def _normalizuj_soucet_pole(pole, minimalizacni, statistiky):
+    """Normalizace součtem sloupce nad polem, nulové sloupce zůstávají 0."""
+    soucty = statistiky['soucet']
+    return np.divide(pole, soucty, out=np.zeros_like(pole), where=soucty != 0)
+
+# Normalizační funkce nad poli podle názvu
+NORMALIZACE = {
+    'minmax': _normalizuj_minmax_pole,
+    'vektorova': _normalizuj_vektorove_pole,
+    'max': _normalizuj_max_pole,
+    'soucet': _normalizuj_soucet_pole
+}
+
+def normalizuj_pole(matice, typy_kriterii, normalizace='minmax', statistiky=None):
+    """
+    Normalizuje matici a vrátí NumPy pole (bez převodu na list).
+
+    Args:
+        matice: 2D list nebo pole s hodnotami [varianty][kriteria]
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        normalizace: Název normalizace ('minmax', 'vektorova', 'max', 'soucet')
+        statistiky: Předem spočtené statistiky sloupců (volitelné)
+
+    Returns:
+        np.ndarray: Normalizovaná matice
+    """
+    pole = jako_matici(matice)
+    if statistiky is None:
+        statistiky = vypocitej_statistiky_sloupcu(pole)
+    return NORMALIZACE[normalizace](pole, maska_minimalizacnich(typy_kriterii), statistiky)
+
+def _normalizuj(funkce, matice, typy_kriterii, varianty, kriteria, statistiky):
+    """Společná obálka normalizačních funkcí - sestaví výstupní slovník."""
+    pole = jako_matici(matice)
+    if statistiky is None:
+        statistiky = vypocitej_statistiky_sloupcu(pole)
+    else:
+        statistiky = {k: np.asarray(v, dtype=np.float64) for k, v in statistiky.items()}
+    norm = funkce(pole, maska_minimalizacnich(typy_kriterii), statistiky)
+    return {
+        'nazvy_variant': varianty,
+        'nazvy_kriterii': kriteria,
+        'normalizovana_matice': norm.tolist()
+    }
+
+def normalizuj_matici_minmax(matice, typy_kriterii, varianty, kriteria, statistiky=None):
+    """
+    Provede min-max normalizaci hodnot matice.
+
+    Args:
+        matice: 2D list nebo pole s hodnotami [varianty][kriteria]
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        statistiky: Předem spočtené statistiky sloupců (volitelné)
+
+    Returns:
+        dict: Slovník obsahující normalizovanou matici a metadata
+    """
+    return _normalizuj(_normalizuj_minmax_pole, matice, typy_kriterii, varianty, kriteria, statistiky)
+
+def normalizuj_matici_vektorove(matice, typy_kriterii, varianty, kriteria, statistiky=None):
+    """
+    Provede vektorovou (euklidovskou) normalizaci hodnot matice.
+
+    Args:
+        matice: 2D list nebo pole s hodnotami [varianty][kriteria]
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        statistiky: Předem spočtené statistiky sloupců (volitelné)
+
+    Returns:
+        dict: Slovník obsahující normalizovanou matici a metadata
+    """
+    return _normalizuj(_normalizuj_vektorove_pole, matice, typy_kriterii, varianty, kriteria, statistiky)
+
+def normalizuj_matici_max(matice, typy_kriterii, varianty, kriteria, statistiky=None):
+    """
+    Provede lineární normalizaci maximem (MIN kritéria jako minimum / hodnota).
+
+    Args:
+        matice: 2D list nebo pole s hodnotami [varianty][kriteria]
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        statistiky: Předem spočtené statistiky sloupců (volitelné)
+
+    Returns:
+        dict: Slovník obsahující normalizovanou matici a metadata
+    """
+    return _normalizuj(_normalizuj_max_pole, matice, typy_kriterii, varianty, kriteria, statistiky)
+
+def normalizuj_matici_soucet(matice, typy_kriterii, varianty, kriteria, statistiky=None):
+    """
+    Provede normalizaci součtem sloupce.
+
+    Args:
+        matice: 2D list nebo pole s hodnotami [varianty][kriteria]
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        statistiky: Předem spočtené statistiky sloupců (volitelné)
+
+    Returns:
+        dict: Slovník obsahující normalizovanou matici a metadata
+    """
+    return _normalizuj(_normalizuj_soucet_pole, matice, typy_kriterii, varianty, kriteria, statistiky)
+
+def vypocitej_vazene_hodnoty(matice, vahy):
+    """
+    Vypočítá vážené hodnoty (váhy × normalizované hodnoty).
+
+    Args:
+        matice: 2D list nebo pole normalizovaných hodnot
+        vahy: List vah kritérií
+
+    Returns:
+        2D list vážených hodnot
+    """
+    return (jako_matici(matice) * np.asarray(vahy, dtype=np.float64)).tolist()
+
+# =============== Výpočty nad poli ===============
+#
+# Funkce pracují přímo s NumPy poli a vrací pole skóre v původním pořadí variant.
+# Používají je jak obálky se slovníkovým výstupem níže, tak dávkové výpočty na serveru.
+
+def skore_wsm(norm, vahy):
+    """
+    Vypočítá skóre WSM jako součin normalizované matice a vektoru vah.
+
+    Args:
+        norm: Pole normalizovaných hodnot (varianty × kritéria)
+        vahy: Pole vah kritérií
+
+    Returns:
+        np.ndarray: Skóre variant
+    """
+    return jako_matici(norm) @ np.asarray(vahy, dtype=np.float64)
+
+def skore_topsis(norm, vahy, minimalizacni=None):
+    """
+    Vypočítá relativní blízkost variant k ideálnímu řešení (TOPSIS).
+
+    Ideál je pro maximalizační kritéria maximum sloupce vážené matice a pro
+    minimalizační minimum, anti-ideál naopak. Bez masky se všechna kritéria
+    berou jako maximalizační (vstup normalizovaný min-max už má směr otočený).
+
+    Args:
+        norm: Pole normalizovaných hodnot (varianty × kritéria)
+        vahy: Pole vah kritérií
+        minimalizacni: Booleovská maska minimalizačních kritérií (volitelná)
+
+    Returns:
+        tuple: (blizkost, ideal, anti_ideal, vazena_matice, dist_ideal, dist_anti_ideal)
+               jako NumPy pole
+    """
+    vazena_matice = jako_matici(norm) * np.asarray(vahy, dtype=np.float64)
+
+    maxima = vazena_matice.max(axis=0)
+    minima = vazena_matice.min(axis=0)
+    if minimalizacni is None:
+        ideal, anti_ideal = maxima, minima
+    else:
+        ideal = np.where(minimalizacni, minima, maxima)
+        anti_ideal = np.where(minimalizacni, maxima, minima)
+
+    # Řádkové součty čtverců přes einsum - bez dalšího pole čtverců
+    rozdil = vazena_matice - ideal
+    dist_ideal = np.sqrt(np.einsum("ij,ij->i", rozdil, rozdil))
+    rozdil = vazena_matice - anti_ideal
+    dist_anti_ideal = np.sqrt(np.einsum("ij,ij->i", rozdil, rozdil))
+
+    # Relativní blízkost k ideálu, při nulovém jmenovateli 0
+    jmenovatel = dist_ideal + dist_anti_ideal
+    blizkost = np.divide(dist_anti_ideal, jmenovatel,
+                         out=np.zeros_like(jmenovatel), where=jmenovatel != 0)
+    return blizkost, ideal, anti_ideal, vazena_matice, dist_ideal, dist_anti_ideal
+
+def skore_mabac(norm, vahy):
+    """
+    Vypočítá skóre MABAC z min-max normalizované matice.
+
+    Vážená matice v_ij = w_j * (n_ij + 1), hranice aproximační oblasti g_j je
+    geometrický průměr sloupce počítaný v logaritmickém prostoru
+    (exp průměru logaritmů) a skóre je součet vzdáleností q_ij = v_ij - g_j.
+
+    Args:
+        norm: Pole min-max normalizovaných hodnot (varianty × kritéria)
+        vahy: Pole vah kritérií
+
+    Returns:
+        tuple: (skore, hranice, vazena_matice, vzdalenosti) jako NumPy pole
+    """
+    vazena_matice = (jako_matici(norm) + 1.0) * np.asarray(vahy, dtype=np.float64)
+
+    # Nulová váha dává nulový sloupec - log(0) = -inf a hranice vyjde 0
+    with np.errstate(divide="ignore"):
+        hranice = np.exp(np.log(vazena_matice).mean(axis=0))
+
+    vzdalenosti = vazena_matice - hranice
+    return vzdalenosti.sum(axis=1), hranice, vazena_matice, vzdalenosti
+
+def uprav_nekladne_hodnoty(matice, nekladne_hodnoty=WPM_NEKLADNE_HODNOTY[0],
+                           nahradni_hodnota=WPM_NAHRADNI_HODNOTA):
+    """
+    Připraví matici pro WPM podle zvolené politiky pro nekladné hodnoty
+    (stejná pravidla jako Vypocty.uprav_nekladne_hodnoty).
+
+    Args:
+        matice: Pole původních hodnot (varianty × kritéria)
+        nekladne_hodnoty: 'nahradit', 'posunout' nebo 'chyba'
+        nahradni_hodnota: Kladná hodnota použitá při nahrazení nebo posunu
+
+    Returns:
+        np.ndarray: Nové pole s kladnými hodnotami
+
+    Raises:
+        ValueError: Při neznámé politice nebo nekladné hodnotě s politikou 'chyba'
+    """
+    if nekladne_hodnoty not in WPM_NEKLADNE_HODNOTY:
+        raise ValueError(f"Neznámá politika pro nekladné hodnoty: {nekladne_hodnoty}")
+    if nahradni_hodnota <= 0:
+        raise ValueError("Náhradní hodnota pro WPM musí být kladná.")
+
+    pole = jako_matici(matice)
+    nekladne = pole <= 0
+    if not nekladne.any():
+        return pole.copy()
+
+    if nekladne_hodnoty == "nahradit":
+        return np.where(nekladne, nahradni_hodnota, pole)
+    if nekladne_hodnoty == "chyba":
+        i, j = np.argwhere(nekladne)[0].tolist()
+        raise ValueError(f"WPM vyžaduje kladné hodnoty (varianta {i + 1}, kritérium {j + 1}: {pole[i, j]}).")
+
+    # Posun: jen sloupce, jejichž minimum není kladné
+    minima = pole.min(axis=0)
+    return pole + np.where(minima <= 0, nahradni_hodnota - minima, 0.0)
+
+def log_matice_wpm(matice, minimalizacni, nekladne_hodnoty=WPM_NEKLADNE_HODNOTY[0],
+                   nahradni_hodnota=WPM_NAHRADNI_HODNOTA):
+    """
+    Vrátí matici logaritmů se znaménkem podle směru kritéria.
+    Její součin s vektorem vah je logaritmus skóre WPM:
+    log(prod x^(±w)) = sum(±w * log x).
+
+    Args:
+        matice: Pole původních hodnot (varianty × kritéria)
+        minimalizacni: Booleovská maska minimalizačních kritérií
+        nekladne_hodnoty: Politika pro nekladné hodnoty
+        nahradni_hodnota: Kladná hodnota pro nahrazení nebo posun
+
+    Returns:
+        np.ndarray: Pole ±log(x) (varianty × kritéria)
+    """
+    pole = uprav_nekladne_hodnoty(matice, nekladne_hodnoty, nahradni_hodnota)
+    return np.log(pole) * np.where(minimalizacni, -1.0, 1.0)
+
+def skore_wpm_log(matice, vahy, minimalizacni, nekladne_hodnoty=WPM_NEKLADNE_HODNOTY[0],
+                  nahradni_hodnota=WPM_NAHRADNI_HODNOTA):
+    """
+    Vypočítá logaritmus skóre WPM jedním maticovým součinem.
+    Na rozdíl od součinu mocnin nepodtéká ani nepřetéká.
+
+    Args:
+        matice: Pole původních hodnot (varianty × kritéria)
+        vahy: Pole vah kritérií
+        minimalizacni: Booleovská maska minimalizačních kritérií
+        nekladne_hodnoty: Politika pro nekladné hodnoty
+        nahradni_hodnota: Kladná hodnota pro nahrazení nebo posun
+
+    Returns:
+        np.ndarray: Logaritmické skóre variant
+    """
+    log_matice = log_matice_wpm(matice, minimalizacni, nekladne_hodnoty, nahradni_hodnota)
+    return log_matice @ np.asarray(vahy, dtype=np.float64)
+
+def linearni_skore_wpm(log_skore):
+    """
+    Převede logaritmické skóre WPM na lineární. Skóre mimo rozsah float64
+    (přetečení) je NaN, ve výsledcích None; podtečení k 0 pořadí neovlivní,
+    protože se řadí podle logaritmického skóre.
+
+    Args:
+        log_skore: 1D pole logaritmického skóre
+
+    Returns:
+        np.ndarray: Lineární skóre variant
+    """
+    with np.errstate(over="ignore", under="ignore"):
+        skore = np.exp(log_skore)
+    skore[np.isinf(skore)] = np.nan
+    return skore
+
+def seznam_skore(skore):
+    """
+    Převede pole skóre na list, nekonečné hodnoty a NaN na None.
+
+    Args:
+        skore: 1D pole skóre
+
+    Returns:
+        list: Skóre jako float nebo None
+    """
+    konecne = np.isfinite(skore)
+    if konecne.all():
+        return skore.tolist()
+    return [hodnota if je_konecna else None for hodnota, je_konecna in zip(skore.tolist(), konecne.tolist())]
+
+def skore_wpm(matice, vahy, minimalizacni, nekladne_hodnoty=WPM_NEKLADNE_HODNOTY[0],
+              nahradni_hodnota=WPM_NAHRADNI_HODNOTA):
+    """
+    Vypočítá lineární skóre WPM z původních hodnot (exp logaritmického skóre).
+    Pro řazení je vhodnější skore_wpm_log - lineární skóre může podtéct k 0
+    a skóre, které by přeteklo, je NaN (viz linearni_skore_wpm).
+
+    Args:
+        matice: Pole původních hodnot (varianty × kritéria)
+        vahy: Pole vah kritérií
+        minimalizacni: Booleovská maska minimalizačních kritérií
+        nekladne_hodnoty: Politika pro nekladné hodnoty
+        nahradni_hodnota: Kladná hodnota pro nahrazení nebo posun
+
+    Returns:
+        np.ndarray: Skóre variant
+    """
+    return linearni_skore_wpm(skore_wpm_log(matice, vahy, minimalizacni, nekladne_hodnoty, nahradni_hodnota))
+
+def poradi_ze_skore(skore):
+    """
+    Převede skóre na pořadí variant (1 = nejlepší) podél poslední osy.
+
+    Args:
+        skore: Pole skóre, 1D nebo (počet_scénářů × varianty)
+
+    Returns:
+        np.ndarray: Pořadí každé varianty ve stejném tvaru jako skore
+    """
+    serazene = np.argsort(-skore, axis=-1, kind="stable")
+    poradi = np.empty_like(serazene)
+    np.put_along_axis(poradi, serazene,
+                      np.broadcast_to(np.arange(1, skore.shape[-1] + 1), serazene.shape), axis=-1)
+    return poradi
+
+# =============== Výpočty metod ===============
+
+def wsm_vypocet(norm_matice, vahy, varianty):
+    """
+    Provede výpočet metodou WSM (Weighted Sum Model).
+
+    Args:
+        norm_matice: 2D list nebo pole normalizovaných hodnot
+        vahy: List vah kritérií
+        varianty: List názvů variant
+
+    Returns:
+        dict: Výsledky analýzy metodou WSM
+    """
+    results = sestav_vysledky(varianty, skore_wsm(norm_matice, vahy))
+
+    return {
+        'results': results,
+        'nejlepsi_varianta': results[0][0],
+        'nejlepsi_skore': results[0][2],
+        'nejhorsi_varianta': results[-1][0],
+        'nejhorsi_skore': results[-1][2],
+        'rozdil_skore': results[0][2] - results[-1][2]
+    }
+
+def vypocitej_wsm(matice, typy_kriterii, vahy, varianty, statistiky=None, max_variant_detailu=None):
+    """
+    Kompletní výpočet WSM (SAW) z původních hodnot: min-max normalizace,
+    vážení a skóre jako součet vážených hodnot.
+
+    Args:
+        matice: 2D list nebo pole původních hodnot
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        vahy: List vah kritérií
+        varianty: List názvů variant
+        statistiky: Předem spočtené statistiky sloupců (volitelné)
+        max_variant_detailu: Pokud je zadán, normalizovaná a vážená matice jsou jen
+            v 'detail' pro tento počet nejlepších variant (viz detail_nejlepsich)
+
+    Returns:
+        dict: Výsledky wsm_vypocet doplněné o 'normalizovana_matice' a 'vazena_matice'
+              (při max_variant_detailu jsou v 'detail')
+    """
+    norm = normalizuj_pole(matice, typy_kriterii, 'minmax', statistiky)
+    # Skóre stejně jako dávkový výpočet (vypocitej_metody), aby se pořadí shodovalo
+    skore = skore_wsm(norm, vahy)
+    vazena_matice = norm * np.asarray(vahy, dtype=np.float64)
+    results = sestav_vysledky(varianty, skore)
+
+    vysledek = {
+        'results': results,
+        'nejlepsi_varianta': results[0][0],
+        'nejlepsi_skore': results[0][2],
+        'nejhorsi_varianta': results[-1][0],
+        'nejhorsi_skore': results[-1][2],
+        'rozdil_skore': results[0][2] - results[-1][2]
+    }
+    matice_detailu = {'normalizovana_matice': norm, 'vazena_matice': vazena_matice}
+    if max_variant_detailu is None:
+        vysledek.update((nazev, pole.tolist()) for nazev, pole in matice_detailu.items())
+    else:
+        vysledek['detail'] = detail_nejlepsich(varianty, skore, max_variant_detailu, matice_detailu)
+    return vysledek
+
+def vypocitej_citlivost_kriterii(norm_matice, vahy, varianty, kriteria, vyber_kriterii=None,
+                                 pocet_kroku=101):
+    """
+    Provede analýzu citlivosti pro více kritérií najednou.
+    Váhy všech kombinací kritérium × krok se sestaví jako jedno pole
+    (kritéria × kroky × kritéria) a skóre se spočítá jediným dávkovým maticovým součinem.
+
+    Args:
+        norm_matice: 2D list nebo pole normalizovaných hodnot
+        vahy: List vah kritérií
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        vyber_kriterii: List indexů měněných kritérií (None = všechna kritéria)
+        pocet_kroku: Počet kroků váhy v intervalu 0.1 až 0.9
+
+    Returns:
+        dict: {'vahy_rozsah': [...], 'analyzy': [výsledek pro každé kritérium ve formátu
+              vypocitej_analyzu_citlivosti]}
+    """
+    try:
+        norm = jako_matici(norm_matice)
+        vahy_pole = np.asarray(vahy, dtype=np.float64)
+        if vyber_kriterii is None:
+            indexy = np.arange(len(vahy_pole))
+        else:
+            indexy = np.asarray(vyber_kriterii, dtype=np.intp).reshape(-1)
+        vahy_rozsah = np.linspace(0.1, 0.9, pocet_kroku)
+        radky = np.arange(len(indexy))
+
+        # Podíly zbylých kritérií pro každé měněné kritérium (kritéria × kritéria)
+        ostatni = np.tile(vahy_pole, (len(indexy), 1))
+        ostatni[radky, indexy] = 0.0
+        sumy = ostatni.sum(axis=1, keepdims=True)
+        podily = np.divide(ostatni, sumy, out=ostatni.copy(), where=sumy > 0)
+
+        # Váhy (kritéria × kroky × kritéria): zbylé váhy se proporcionálně přepočítají
+        nove_vahy = (1.0 - vahy_rozsah)[None, :, None] * podily[:, None, :]
+        nove_vahy[radky, :, indexy] = vahy_rozsah
+
+        # Skóre (kritéria × kroky × varianty) jedním dávkovým součinem
+        skore = nove_vahy @ norm.T
+        poradi = poradi_ze_skore(skore)
+
+        rozsah_list = vahy_rozsah.tolist()
+        return {
+            'vahy_rozsah': rozsah_list,
+            'analyzy': [
+                {
+                    'vahy_rozsah': rozsah_list,
+                    'citlivost_skore': skore[k].tolist(),
+                    'citlivost_poradi': poradi[k].tolist(),
+                    'zvolene_kriterium': kriteria[int(idx)],
+                    'zvolene_kriterium_index': int(idx)
+                }
+                for k, idx in enumerate(indexy)
+            ]
+        }
+    except Exception as e:
+        raise ValueError(f"Chyba při výpočtu analýzy citlivosti: {str(e)}")
+
+def vypocitej_analyzu_citlivosti(norm_matice, vahy, varianty, kriteria, vyber_kriteria=0, pocet_kroku=9):
+    """
+    Provede analýzu citlivosti změnou váhy vybraného kritéria.
+
+    Args:
+        norm_matice: 2D list nebo pole normalizovaných hodnot
+        vahy: List vah kritérií
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        vyber_kriteria: Index kritéria, jehož váha se bude měnit
+        pocet_kroku: Počet kroků při změně váhy
+
+    Returns:
+        dict: Výsledky analýzy citlivosti
+    """
+    return vypocitej_citlivost_kriterii(norm_matice, vahy, varianty, kriteria,
+                                        [vyber_kriteria], pocet_kroku)['analyzy'][0]
+
+def _nejblizsi_body(body_t, body_i, body_l, t0, pocet):
+    """
+    Spojí průsečíky z bloků a ponechá nejvýše pocet nejbližších váze t0.
+    Při shodné vzdálenosti rozhoduje pořadí nalezení, výběr tedy nezávisí na velikosti bloků.
+
+    Args:
+        body_t, body_i, body_l: Listy polí vah průsečíků a indexů obou variant
+        t0: Aktuální váha kritéria
+        pocet: Maximální počet ponechaných průsečíků
+
+    Returns:
+        tuple: Spojená pole (body_t, body_i, body_l)
+    """
+    body_t = np.concatenate(body_t) if body_t else np.empty(0)
+    body_i = np.concatenate(body_i) if body_i else np.empty(0, dtype=np.intp)
+    body_l = np.concatenate(body_l) if body_l else np.empty(0, dtype=np.intp)
+    if pocet is not None and body_t.size > pocet:
+        vyber = np.sort(np.argsort(np.abs(body_t - t0), kind="stable")[:pocet])
+        body_t, body_i, body_l = body_t[vyber], body_i[vyber], body_l[vyber]
+    return body_t, body_i, body_l
+
+def vypocitej_body_zlomu(norm_matice, vahy, varianty, kriteria, vyber_kriterii=None,
+                         max_prvku_bloku=MAX_PRVKU_BLOKU, max_bodu=None):
+    """
+    Najde přesné váhy, při kterých se mění pořadí variant (aditivní modely WSM/SAW).
+
+    Při změně váhy kritéria k na t a proporcionálním přepočtu ostatních vah je skóre
+    každé varianty lineární funkcí t: s_i(t) = P_i + t * (N_ik - P_i), kde P_i je skóre
+    podle přepočtených vah ostatních kritérií. Průsečíky přímek dvou variant jsou
+    body zlomu pořadí, počítají se analyticky bez vzorkování vah. Dvojice variant
+    se zpracovávají po blocích řádků, jejichž velikost omezuje max_prvku_bloku,
+    takže paměť neroste s m² ani s m.
+
+    Args:
+        norm_matice: 2D list nebo pole normalizovaných hodnot
+        vahy: List vah kritérií
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        vyber_kriterii: List indexů kritérií (None = všechna kritéria)
+        max_prvku_bloku: Maximální počet prvků pomocného pole blok × varianty
+        max_bodu: Maximální počet vrácených bodů zlomu na kritérium, ponechají se
+            nejbližší aktuální váze (None = všechny, u m variant až m²/2)
+
+    Returns:
+        list: Pro každé kritérium slovník s klíči 'kriterium', 'kriterium_index',
+              'aktualni_vaha', 'nejlepsi_varianta', 'interval_stability' (od, do),
+              'body_zlomu' (seřazený seznam {'vaha', 'varianta_a', 'varianta_b'})
+              a 'pocet_bodu_zlomu' (počet všech bodů zlomu před omezením)
+    """
+    try:
+        norm = jako_matici(norm_matice)
+        vahy_pole = np.asarray(vahy, dtype=np.float64)
+        pocet_variant = norm.shape[0]
+        velikost_bloku = max(1, max_prvku_bloku // max(1, pocet_variant))
+        if vyber_kriterii is None:
+            indexy = range(len(vahy_pole))
+        else:
+            indexy = [int(k) for k in vyber_kriterii]
+
+        vysledky = []
+        for k in indexy:
+            # Přímky skóre variant: s(t) = usek + t * smernice
+            ostatni = vahy_pole.copy()
+            ostatni[k] = 0.0
+            suma = ostatni.sum()
+            if suma > 0:
+                ostatni /= suma
+            usek = norm @ ostatni
+            smernice = norm[:, k] - usek
+            t0 = float(vahy_pole[k])
+
+            # Průsečíky všech dvojic (i < l) uvnitř intervalu (0, 1), po blocích řádků;
+            # při omezení max_bodu se uložené průsečíky průběžně prořezávají
+            body_t, body_i, body_l = [], [], []
+            pocet_bodu = ulozeno = 0
+            for zacatek in range(0, pocet_variant, velikost_bloku):
+                konec = min(zacatek + velikost_bloku, pocet_variant)
+                rozdil_smernic = smernice[zacatek:konec, None] - smernice[None, :]
+                rozdil_useku = usek[None, :] - usek[zacatek:konec, None]
+                t = np.divide(rozdil_useku, rozdil_smernic,
+                              out=np.full(rozdil_smernic.shape, np.nan), where=rozdil_smernic != 0)
+                horni_troj = np.arange(zacatek, konec)[:, None] < np.arange(pocet_variant)[None, :]
+                platne = horni_troj & (t > 0) & (t < 1)
+                radky, sloupce = np.nonzero(platne)
+                body_t.append(t[radky, sloupce])
+                body_i.append(radky + zacatek)
+                body_l.append(sloupce)
+                pocet_bodu += radky.size
+                ulozeno += radky.size
+                if max_bodu is not None and ulozeno > 2 * max_bodu:
+                    body_t, body_i, body_l = _nejblizsi_body(body_t, body_i, body_l, t0, max_bodu)
+                    body_t, body_i, body_l = [body_t], [body_i], [body_l]
+                    ulozeno = max_bodu
+
+            body_t, body_i, body_l = _nejblizsi_body(body_t, body_i, body_l, t0, max_bodu)
+            serazene = np.argsort(body_t, kind="stable")
+
+            # Interval stability aktuálního vítěze: nejbližší průsečíky s ostatními přímkami
+            vitez = int(_poradi_z_skore(usek + t0 * smernice)[0])
+            d_smernice = smernice[vitez] - smernice
+            d_usek = usek[vitez] - usek
+            pruseciky = np.divide(-d_usek, d_smernice,
+                                  out=np.full(pocet_variant, np.nan), where=d_smernice != 0)
+            # Rostoucí rozdíl omezuje interval zdola, klesající shora
+            dolni = pruseciky[(d_smernice > 0) & (pruseciky <= t0)]
+            horni = pruseciky[(d_smernice < 0) & (pruseciky >= t0)]
+            od = max(0.0, float(dolni.max())) if dolni.size else 0.0
+            do = min(1.0, float(horni.min())) if horni.size else 1.0
+
+            vysledky.append({
+                'kriterium': kriteria[k],
+                'kriterium_index': k,
+                'aktualni_vaha': t0,
+                'nejlepsi_varianta': varianty[vitez],
+                'interval_stability': (od, do),
+                'body_zlomu': [
+                    {
+                        'vaha': float(body_t[idx]),
+                        'varianta_a': varianty[int(body_i[idx])],
+                        'varianta_b': varianty[int(body_l[idx])]
+                    }
+                    for idx in serazene.tolist()
+                ],
+                'pocet_bodu_zlomu': int(pocet_bodu)
+            })
+
+        return vysledky
+    except Exception as e:
+        raise ValueError(f"Chyba při výpočtu bodů zlomu: {str(e)}")
+
+def topsis_vypocet(norm_matice, vahy, varianty, kriteria, typy_kriterii=None, max_variant_detailu=None):
+    """
+    Vypočítá výsledky metodou TOPSIS (Technique for Order of Preference by Similarity to Ideal Solution).
+
+    Args:
+        norm_matice: 2D list nebo pole normalizovaných hodnot
+        vahy: List vah kritérií
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        typy_kriterii: List typů kritérií pro ideál podle směru (None = vše maximalizační)
+        max_variant_detailu: Pokud je zadán, normalizovaná a vážená matice jsou jen
+            v 'detail' pro tento počet nejlepších variant (viz detail_nejlepsich)
+
+    Returns:
+        dict: Výsledky analýzy metodou TOPSIS
+    """
+    try:
+        minimalizacni = None if typy_kriterii is None else maska_minimalizacnich(typy_kriterii)
+        blizkost, ideal, anti_ideal, vazena_matice, dist_ideal, dist_anti_ideal = skore_topsis(
+            norm_matice, vahy, minimalizacni)
+
+        results = sestav_vysledky(varianty, blizkost)
+
+        vysledek = {
+            'results': results,
+            'nejlepsi_varianta': results[0][0],
+            'nejlepsi_skore': results[0][2],
+            'nejhorsi_varianta': results[-1][0],
+            'nejhorsi_skore': results[-1][2],
+            'ideal': ideal.tolist(),
+            'anti_ideal': anti_ideal.tolist(),
+            'vzdalenost_ideal': dist_ideal.tolist(),
+            'vzdalenost_anti_ideal': dist_anti_ideal.tolist()
+        }
+        if max_variant_detailu is None:
+            vysledek['vazena_matice'] = vazena_matice.tolist()
+        else:
+            vysledek['detail'] = detail_nejlepsich(varianty, blizkost, max_variant_detailu, {
+                'normalizovana_matice': norm_matice,
+                'vazena_matice': vazena_matice
+            })
+        return vysledek
+    except Exception as e:
+        raise ValueError(f"Chyba při výpočtu TOPSIS: {str(e)}")
+
+def vypocitej_topsis(matice, typy_kriterii, vahy, varianty, kriteria, statistiky=None,
+                     max_variant_detailu=None):
+    """
+    Kompletní výpočet TOPSIS z původních hodnot: vektorová normalizace,
+    vážení, ideál a anti-ideál podle směru kritérií a vzdálenosti variant.
+
+    Args:
+        matice: 2D list nebo pole původních hodnot
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        vahy: List vah kritérií
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        statistiky: Předem spočtené statistiky sloupců (volitelné)
+        max_variant_detailu: Omezení matic na nejlepší varianty (viz topsis_vypocet)
+
+    Returns:
+        dict: Výsledky topsis_vypocet doplněné o 'normalizovana_matice'
+              (při max_variant_detailu je v 'detail')
+    """
+    norm = normalizuj_pole(matice, typy_kriterii, 'vektorova', statistiky)
+    vysledek = topsis_vypocet(norm, vahy, varianty, kriteria, typy_kriterii, max_variant_detailu)
+    if max_variant_detailu is None:
+        vysledek['normalizovana_matice'] = norm.tolist()
+    return vysledek
+
+def mabac_vypocet(norm_matice, vahy, varianty, kriteria, max_variant_detailu=None):
+    """
+    Vypočítá výsledky metodou MABAC (Multi-Attributive Border Approximation area Comparison).
+
+    Args:
+        norm_matice: 2D list nebo pole min-max normalizovaných hodnot
+        vahy: List vah kritérií
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        max_variant_detailu: Pokud je zadán, normalizovaná, vážená matice a matice
+            vzdáleností jsou jen v 'detail' pro tento počet nejlepších variant
+
+    Returns:
+        dict: Výsledky analýzy metodou MABAC
+    """
+    try:
+        skore, hranice, vazena_matice, vzdalenosti = skore_mabac(norm_matice, vahy)
+
+        results = sestav_vysledky(varianty, skore)
+
+        vysledek = {
+            'results': results,
+            'nejlepsi_varianta': results[0][0],
+            'nejlepsi_skore': results[0][2],
+            'nejhorsi_varianta': results[-1][0],
+            'nejhorsi_skore': results[-1][2],
+            'hranice': hranice.tolist()
+        }
+        if max_variant_detailu is None:
+            vysledek['vazena_matice'] = vazena_matice.tolist()
+            vysledek['vzdalenosti'] = vzdalenosti.tolist()
+        else:
+            vysledek['detail'] = detail_nejlepsich(varianty, skore, max_variant_detailu, {
+                'normalizovana_matice': norm_matice,
+                'vazena_matice': vazena_matice,
+                'vzdalenosti': vzdalenosti
+            })
+        return vysledek
+    except Exception as e:
+        raise ValueError(f"Chyba při výpočtu MABAC: {str(e)}")
+
+def vypocitej_mabac(matice, typy_kriterii, vahy, varianty, kriteria, statistiky=None,
+                    max_variant_detailu=None):
+    """
+    Kompletní výpočet MABAC z původních hodnot: min-max normalizace,
+    vážení, hranice aproximační oblasti a vzdálenosti variant od ní.
+
+    Args:
+        matice: 2D list nebo pole původních hodnot
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        vahy: List vah kritérií
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        statistiky: Předem spočtené statistiky sloupců (volitelné)
+        max_variant_detailu: Omezení matic na nejlepší varianty (viz mabac_vypocet)
+
+    Returns:
+        dict: Výsledky mabac_vypocet doplněné o 'normalizovana_matice'
+              (při max_variant_detailu je v 'detail')
+    """
+    norm = normalizuj_pole(matice, typy_kriterii, 'minmax', statistiky)
+    vysledek = mabac_vypocet(norm, vahy, varianty, kriteria, max_variant_detailu)
+    if max_variant_detailu is None:
+        vysledek['normalizovana_matice'] = norm.tolist()
+    return vysledek
+
+def wpm_vypocet(matice, vahy, typy_kriterii, varianty, kriteria,
+                nekladne_hodnoty=WPM_NEKLADNE_HODNOTY[0], nahradni_hodnota=WPM_NAHRADNI_HODNOTA):
+    """
+    Vypočítá výsledky metodou WPM (Weighted Product Model) v logaritmickém prostoru.
+
+    Args:
+        matice: 2D list nebo pole původních hodnot
+        vahy: List vah kritérií
+        typy_kriterii: List typů kritérií ("max" nebo "min")
+        varianty: List názvů variant
+        kriteria: List názvů kritérií
+        nekladne_hodnoty: Politika pro nekladné hodnoty (viz uprav_nekladne_hodnoty)
+        nahradni_hodnota: Kladná hodnota pro nahrazení nebo posun
+
+    Returns:
+        dict: Výsledky analýzy metodou WPM, 'results' s lineárním skóre
+              (None, pokud přeteče) a 'results_log' s logaritmickým skóre
+    """
+    try:
+        log_skore = skore_wpm_log(matice, vahy, maska_minimalizacnich(typy_kriterii),
+                                  nekladne_hodnoty, nahradni_hodnota)
+        # Pořadí určuje logaritmické skóre, lineární může podtéct ke shodným nulám
+        serazene = _poradi_z_skore(log_skore)
+        skore = linearni_skore_wpm(log_skore)
+
+        poradi = range(1, len(serazene) + 1)
+        nazvy = [varianty[i] for i in serazene.tolist()]
+        results = list(zip(nazvy, poradi, seznam_skore(skore[serazene])))
+        results_log = list(zip(nazvy, poradi, log_skore[serazene].tolist()))
+
+        return {
+            'results': results,
+            'results_log': results_log,
+            'nejlepsi_varianta': results[0][0],
+            'nejlepsi_skore': results[0][2],
+            'nejhorsi_varianta': results[-1][0],
+            'nejhorsi_skore': results[-1][2],
+            'rozdil_skore': (None if results[0][2] is None else
+                             results[0][2] - results[-1][2] if len(results) > 1 else 0)
+        }
+    except Exception as e:
+        raise ValueError(f"Chyba při výpočtu WPM: {str(e)}")
+
+# =============== Dávkový výpočet více metod ===============
+
+def _vypocet_skore_wsm(matice_metody, vahy, minimalizacni, nekladne_hodnoty):
+    """Skóre WSM/SAW nad min-max normalizovanou maticí."""
+    return skore_wsm(matice_metody, vahy), None
+
+def _vypocet_skore_topsis(matice_metody, vahy, minimalizacni, nekladne_hodnoty):
+    """Relativní blízkost TOPSIS nad vektorově normalizovanou maticí."""
+    return skore_topsis(matice_metody, vahy, minimalizacni)[0], None
+
+def _vypocet_skore_mabac(matice_metody, vahy, minimalizacni, nekladne_hodnoty):
+    """Skóre MABAC nad min-max normalizovanou maticí."""
+    return skore_mabac(matice_metody, vahy)[0], None
+
+def _vypocet_skore_wpm(matice_metody, vahy, minimalizacni, nekladne_hodnoty):
+    """Lineární skóre WPM z původních hodnot, pořadí podle logaritmického skóre."""
+    log_skore = skore_wpm_log(matice_metody, vahy, minimalizacni, nekladne_hodnoty)
+    return linearni_skore_wpm(log_skore), log_skore
+
+# Výpočty skóre podle klíče 'skore' v Registr_metod.METODY. Každý dostane matici
+# připravenou podle 'normalizace' metody (a politiku nekladných hodnot, kterou
+# používá jen WPM) a vrací (skore, skore_razeni nebo None).
+VYPOCTY_SKORE = {
+    'wsm': _vypocet_skore_wsm,
+    'topsis': _vypocet_skore_topsis,
+    'mabac': _vypocet_skore_mabac,
+    'wpm': _vypocet_skore_wpm
+}
+
+# Kódy metod podporované dávkovým výpočtem
+PODPOROVANE_METODY = Registr_metod.metody_se_schopnosti(Registr_metod.SCHOPNOST_DAVKOVY)
+
+def _kompaktni_vysledek(varianty, skore, skore_razeni=None):
+    """
+    Sestaví kompaktní výsledek metody - skóre a pořadí v původním pořadí variant.
+
+    Args:
+        varianty: List názvů variant
+        skore: 1D pole skóre variant
+        skore_razeni: Skóre určující pořadí, pokud se liší od skore (např. log skóre WPM)
+
+    Returns:
+        dict: Skóre (None u nevyjádřitelného skóre), pořadí a nejlepší/nejhorší varianta
+    """
+    if skore_razeni is None:
+        skore_razeni = skore
+    serazene = _poradi_z_skore(skore_razeni)
+    nejlepsi = int(serazene[0])
+    nejhorsi = int(serazene[-1])
+    hodnoty = seznam_skore(skore)
+    return {
+        'skore': hodnoty,
+        'poradi': poradi_ze_skore(skore_razeni).tolist(),
+        'nejlepsi_varianta': varianty[nejlepsi],
+        'nejlepsi_skore': hodnoty[nejlepsi],
+        'nejhorsi_varianta': varianty[nejhorsi],
+        'nejhorsi_skore': hodnoty[nejhorsi]
+    }
+
+def vypocitej_metody(analyza_data, metody, nekladne_hodnoty=WPM_NEKLADNE_HODNOTY[0]):
+    """
+    Vypočítá výsledky více metod nad jednou analýzou.
+    Data se parsují a statistiky sloupců počítají jen jednou, každá normalizace
+    se provede nejvýše jednou a metody se stejnou normalizací a výpočtem skóre
+    (podle Registr_metod) sdílí jeden výsledek.
+
+    Args:
+        analyza_data: Slovník s daty analýzy v novém formátu
+        metody: List kódů metod (např. ["saw", "wsm", "topsis", "wpm"])
+        nekladne_hodnoty: Politika pro nekladné hodnoty u WPM (viz uprav_nekladne_hodnoty)
+
+    Returns:
+        dict: {'varianty': [...], 'kriteria': [...], 'metody': {kod: kompaktní výsledek}}
+
+    Raises:
+        ValueError: Pokud analýza neobsahuje data, metoda není podporována
+                    nebo politika nekladných hodnot není známa
+    """
+    metody = [str(m).lower() for m in metody]
+    nepodporovane = [m for m in metody if m not in PODPOROVANE_METODY]
+    if nepodporovane:
+        raise ValueError(f"Nepodporované metody: {', '.join(nepodporovane)}")
+    if nekladne_hodnoty not in WPM_NEKLADNE_HODNOTY:
+        raise ValueError(f"Neznámá politika pro nekladné hodnoty: {nekladne_hodnoty}")
+
+    matice, typy_kriterii, varianty, kriteria, vahy = priprav_data_z_json(analyza_data)
+    if not varianty or not kriteria:
+        raise ValueError("Analýza neobsahuje žádné varianty nebo kritéria.")
+
+    minimalizacni = maska_minimalizacnich(typy_kriterii)
+    statistiky = vypocitej_statistiky_sloupcu(matice)
+    matice_podle_normalizace = {None: matice}
+    skore_podle_vypoctu = {}
+
+    vysledky_metod = {}
+    for kod in metody:
+        metoda = Registr_metod.ziskej_metodu(kod)
+        normalizace = metoda['normalizace']
+        klic = (normalizace, metoda['skore'])
+
+        if klic not in skore_podle_vypoctu:
+            if normalizace not in matice_podle_normalizace:
+                matice_podle_normalizace[normalizace] = normalizuj_pole(
+                    matice, typy_kriterii, normalizace, statistiky)
+            skore_podle_vypoctu[klic] = VYPOCTY_SKORE[metoda['skore']](
+                matice_podle_normalizace[normalizace], vahy, minimalizacni, nekladne_hodnoty)
+
+        skore, skore_razeni = skore_podle_vypoctu[klic]
+        vysledek = _kompaktni_vysledek(varianty, skore, skore_razeni)
+        if skore_razeni is not None:
+            # Např. WPM se řadí podle logaritmického skóre, lineární je jeho exponenciála
+            vysledek['log_skore'] = skore_razeni.tolist()
+        vysledky_metod[kod] = vysledek
+
+    return {
+        'varianty': varianty,
+        'kriteria': kriteria,
+        'metody': vysledky_metod
+    }
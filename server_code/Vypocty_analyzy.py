@@ -0,0 +1,458 @@
+# -------------------------------------------------------
+# Modul: Vypocty_analyzy
+#
+# Serverové výpočty výsledků analýz nad modulem Vypocetni_jadro:
+# - vypocitej_vysledky_metod: Výsledky více metod jedním voláním serveru (s cache)
+# - vypocitej_citlivost_kriterii: Analýza citlivosti vah pro zvolená nebo všechna kritéria
+# - vypocitej_body_zlomu: Přesné body změny pořadí a interval stability vítěze
+# - vypocitej_wsm: Kompletní výsledek WSM/SAW pro výstupní formuláře
+# - vypocitej_topsis: Kompletní výsledek TOPSIS pro výstupní formulář
+# - vypocitej_mabac: Kompletní výsledek MABAC pro výstupní formulář
+# - vypocitej_electre: Relace převyšování ELECTRE I/III, jádro a graf
+# - vypocitej_robustnost: Monte Carlo indexy akceptovatelnosti pořadí
+#
+# Callable ověří oprávnění a volá funkci spocitej_* nad řádkem analýzy,
+# kterou používají i úlohy na pozadí (Ulohy_vypoctu).
+#
+# Pomocné funkce:
+# - nacti_analyzu_pro_vypocet: Načtení řádku analýzy s kontrolou oprávnění
+# - over_indexy_kriterii: Kontrola indexů kritérií předaných klientem
+# -------------------------------------------------------
+from typing import Dict, List, Optional
+import anvil.server
+import anvil.users
+from anvil.tables import app_tables
+
+from . import Cache_vysledku, Electre, Registr_metod, Robustnost, Uloziste_analyz, Vypocetni_jadro
+from .CRUD_analyzy import handle_errors, zapsat_info
+
+# Horní mez počtu vzorků pro analýzu robustnosti v jednom požadavku
+MAX_POCET_VZORKU = 1000000
+
+# Horní mez počtu kroků váhy v analýze citlivosti
+MAX_POCET_KROKU_CITLIVOSTI = 1001
+
+# Horní mez velikosti výsledku analýzy citlivosti (kritéria × kroky × varianty)
+MAX_PRVKU_CITLIVOSTI = 2000000
+
+# Počet nejlepších variant, pro které se posílají celé matice k zobrazení
+MAX_VARIANT_DETAILU = 50
+
+# Maximální počet hran grafu převyšování ELECTRE, které se posílají klientovi
+MAX_HRAN_GRAFU = 100000
+
+# Maximální počet bodů zlomu na kritérium (nejbližší aktuální váze), které se posílají klientovi
+MAX_BODU_ZLOMU = 1000
+
+# Parametry, které klient smí předat jednotlivým variantám ELECTRE
+PARAMETRY_ELECTRE = {
+    'I': ('prah_souhlasu', 'prah_nesouhlasu'),
+    'III': ('prahy', 'prah_lambda')
+}
+
+# =============== Pomocné funkce ===============
+
+def nacti_analyzu_pro_vypocet(analyza_id: str):
+    """
+    Načte řádek analýzy a ověří, že k ní má přihlášený uživatel přístup.
+
+    Args:
+        analyza_id: ID analýzy
+
+    Returns:
+        Row: Řádek tabulky analyzy
+
+    Raises:
+        ValueError: Pokud analýza neexistuje nebo k ní uživatel nemá přístup
+    """
+    analyza = app_tables.analyzy.get_by_id(analyza_id)
+    if not analyza:
+        raise ValueError(f"Analýza s ID {analyza_id} neexistuje.")
+
+    aktualni_uzivatel = anvil.users.get_user()
+    if not aktualni_uzivatel:
+        raise ValueError("Pro výpočet analýzy musíte být přihlášen.")
+    if (aktualni_uzivatel != analyza["uzivatel"] and
+        aktualni_uzivatel.get("role") != "admin"):
+        raise ValueError("Nemáte oprávnění k této analýze.")
+
+    return analyza
+
+def over_indexy_kriterii(kriteria_indexy, pocet_kriterii: int) -> List[int]:
+    """
+    Ověří indexy kritérií předané klientem.
+
+    Args:
+        kriteria_indexy: Seznam indexů kritérií (None = všechna kritéria)
+        pocet_kriterii: Počet kritérií analýzy
+
+    Returns:
+        List[int]: Indexy kritérií (u None všechny)
+
+    Raises:
+        ValueError: Pokud index není celé číslo v rozsahu kritérií nebo se opakuje
+    """
+    if kriteria_indexy is None:
+        return list(range(pocet_kriterii))
+    if not isinstance(kriteria_indexy, (list, tuple)) or not kriteria_indexy:
+        raise ValueError("Indexy kritérií musí být neprázdný seznam.")
+    for index in kriteria_indexy:
+        if isinstance(index, bool) or not isinstance(index, int) or not 0 <= index < pocet_kriterii:
+            raise ValueError(f"Neplatný index kritéria: {index!r} (analýza má {pocet_kriterii} kritérií).")
+    if len(set(kriteria_indexy)) != len(kriteria_indexy):
+        raise ValueError("Indexy kritérií se nesmí opakovat.")
+    return list(kriteria_indexy)
+
+# =============== Výpočty ===============
+
+@anvil.server.callable
+@handle_errors
+def vypocitej_vysledky_metod(analyza_id: str, metody: List[str],
+                             nekladne_hodnoty: str = Vypocetni_jadro.WPM_NEKLADNE_HODNOTY[0]) -> Dict:
+    """
+    Vypočítá výsledky zvolených metod pro analýzu jedním voláním serveru.
+    Výsledky se nejprve hledají v cache (tabulka vysledky), chybějící metody
+    se spočítají společně - data se připraví a normalizují jen jednou.
+
+    Args:
+        analyza_id: ID analýzy
+        metody: Seznam kódů metod (např. ["saw", "wsm", "wpm", "topsis"])
+        nekladne_hodnoty: Politika pro nekladné hodnoty u WPM (Konstanty.WPM_NEKLADNE_HODNOTY)
+
+    Returns:
+        Dict: {'varianty': [...], 'kriteria': [...], 'metody': {kod: {'skore', 'poradi',
+              'nejlepsi_varianta', 'nejlepsi_skore', 'nejhorsi_varianta', 'nejhorsi_skore'}}};
+              WPM má navíc 'log_skore' a lineární skóre, které přeteče, je None
+    """
+    return spocitej_vysledky_metod(nacti_analyzu_pro_vypocet(analyza_id), metody, nekladne_hodnoty)
+
+def spocitej_vysledky_metod(analyza, metody: List[str],
+                            nekladne_hodnoty: str = Vypocetni_jadro.WPM_NEKLADNE_HODNOTY[0]) -> Dict:
+    """
+    Výpočet pro vypocitej_vysledky_metod nad řádkem analýzy
+    (oprávnění už ověřil volající, používají ho i úlohy na pozadí).
+    """
+    metody = list(dict.fromkeys(str(m).lower() for m in metody))
+    nepodporovane = [kod for kod in metody if kod not in Vypocetni_jadro.PODPOROVANE_METODY]
+    if nepodporovane:
+        raise ValueError(f"Nepodporované metody: {', '.join(nepodporovane)}")
+
+    # Politika nekladných hodnot mění jen skóre WPM, jen tam je součástí klíče cache
+    parametry = {kod: {'nekladne_hodnoty': nekladne_hodnoty}
+                 if Registr_metod.ziskej_metodu(kod)['skore'] == 'wpm' else None
+                 for kod in metody}
+
+    vysledky_metod = {}
+    for kod in metody:
+        ulozeny = Cache_vysledku.nacti_z_cache(analyza, kod, parametry[kod])
+        if ulozeny is not None:
+            vysledky_metod[kod] = ulozeny
+
+    chybejici = [kod for kod in metody if kod not in vysledky_metod]
+    if chybejici:
+        vypocet = Vypocetni_jadro.vypocitej_metody(Uloziste_analyz.nacti_matici(analyza), chybejici,
+                                                   nekladne_hodnoty)
+        for kod, vysledek in vypocet["metody"].items():
+            # Názvy variant a kritérií ukládáme s výsledkem, aby stačilo jedno čtení
+            zaznam = dict(vysledek, varianty=vypocet["varianty"], kriteria=vypocet["kriteria"])
+            Cache_vysledku.uloz_do_cache(analyza, kod, zaznam, parametry[kod])
+            vysledky_metod[kod] = zaznam
+        zapsat_info(f"Vypočteny metody {', '.join(chybejici)} pro analýzu {analyza.get_id()}")
+
+    prvni = vysledky_metod[metody[0]] if metody else {}
+    return {
+        'varianty': prvni.get('varianty', []),
+        'kriteria': prvni.get('kriteria', []),
+        'metody': {kod: {k: v for k, v in vysledky_metod[kod].items() if k not in ('varianty', 'kriteria')}
+                   for kod in metody}
+    }
+
+@anvil.server.callable
+@handle_errors
+def vypocitej_citlivost_kriterii(analyza_id: str, kriteria_indexy: Optional[List[int]] = None,
+                                 pocet_kroku: int = 101) -> Dict:
+    """
+    Vypočítá analýzu citlivosti WSM pro zvolená kritéria (nebo všechna) najednou.
+
+    Args:
+        analyza_id: ID analýzy
+        kriteria_indexy: Indexy kritérií, jejichž váha se mění (None = všechna)
+        pocet_kroku: Počet kroků váhy v intervalu 0.1 až 0.9 (max. MAX_POCET_KROKU_CITLIVOSTI)
+
+    Returns:
+        Dict: {'vahy_rozsah': [...], 'analyzy': [výsledek pro každé kritérium]}
+
+    Raises:
+        ValueError: Pokud jsou indexy kritérií neplatné nebo by výsledek
+                    přesáhl MAX_PRVKU_CITLIVOSTI hodnot
+    """
+    if isinstance(pocet_kroku, bool) or not isinstance(pocet_kroku, int) or \
+            not 2 <= pocet_kroku <= MAX_POCET_KROKU_CITLIVOSTI:
+        raise ValueError(f"Počet kroků musí být celé číslo od 2 do {MAX_POCET_KROKU_CITLIVOSTI}.")
+
+    analyza = nacti_analyzu_pro_vypocet(analyza_id)
+    parametry = {'kriteria': kriteria_indexy, 'pocet_kroku': pocet_kroku}
+
+    ulozeny = Cache_vysledku.nacti_z_cache(analyza, "citlivost_wsm", parametry)
+    if ulozeny is not None:
+        return ulozeny
+
+    matice, typy_kriterii, varianty, kriteria, vahy = Vypocetni_jadro.priprav_data_z_json(Uloziste_analyz.nacti_matici(analyza))
+    indexy = over_indexy_kriterii(kriteria_indexy, len(kriteria))
+    if len(indexy) * pocet_kroku * len(varianty) > MAX_PRVKU_CITLIVOSTI:
+        raise ValueError(f"Analýza citlivosti by měla přes {MAX_PRVKU_CITLIVOSTI} hodnot, "
+                         f"zvolte méně kritérií nebo kroků.")
+    norm = Vypocetni_jadro.normalizuj_pole(matice, typy_kriterii, 'minmax')
+
+    vysledek = Vypocetni_jadro.vypocitej_citlivost_kriterii(
+        norm, vahy, varianty, kriteria, indexy, pocet_kroku)
+    Cache_vysledku.uloz_do_cache(analyza, "citlivost_wsm", vysledek, parametry)
+
+    zapsat_info(f"Vypočtena citlivost {len(vysledek['analyzy'])} kritérií pro analýzu {analyza_id}")
+    return vysledek
+
+@anvil.server.callable
+@handle_errors
+def vypocitej_body_zlomu(analyza_id: str, kriteria_indexy: Optional[List[int]] = None) -> List[Dict]:
+    """
+    Vypočítá přesné váhy, při kterých se mění pořadí variant WSM/SAW,
+    a interval stability aktuálně nejlepší varianty pro každé zvolené kritérium.
+
+    Args:
+        analyza_id: ID analýzy
+        kriteria_indexy: Indexy kritérií (None = všechna)
+
+    Returns:
+        List[Dict]: Body zlomu (nejvýše MAX_BODU_ZLOMU nejbližších aktuální váze,
+                    celkový počet v 'pocet_bodu_zlomu') a interval stability pro každé kritérium
+    """
+    analyza = nacti_analyzu_pro_vypocet(analyza_id)
+    parametry = {'kriteria': kriteria_indexy}
+
+    ulozeny = Cache_vysledku.nacti_z_cache(analyza, "body_zlomu_wsm", parametry)
+    if ulozeny is not None:
+        return ulozeny
+
+    matice, typy_kriterii, varianty, kriteria, vahy = Vypocetni_jadro.priprav_data_z_json(Uloziste_analyz.nacti_matici(analyza))
+    norm = Vypocetni_jadro.normalizuj_pole(matice, typy_kriterii, 'minmax')
+
+    vysledek = Vypocetni_jadro.vypocitej_body_zlomu(norm, vahy, varianty, kriteria, kriteria_indexy,
+                                                    max_bodu=MAX_BODU_ZLOMU)
+    Cache_vysledku.uloz_do_cache(analyza, "body_zlomu_wsm", vysledek, parametry)
+    return vysledek
+
+@anvil.server.callable
+@handle_errors
+def vypocitej_wsm(analyza_id: str) -> Dict:
+    """
+    Vypočítá kompletní výsledek WSM pro zobrazení ve Vystup_wsm_komp a Vystup_saw_komp
+    (min-max normalizace, vážené hodnoty a skóre jako jejich součet).
+
+    Args:
+        analyza_id: ID analýzy
+
+    Returns:
+        Dict: Výsledek Vypocetni_jadro.vypocitej_wsm doplněný o 'varianty',
+              'kriteria', 'typy_kriterii' a 'vahy'; normalizovaná a vážená matice
+              jsou v 'detail' jen pro MAX_VARIANT_DETAILU nejlepších variant
+    """
+    return spocitej_wsm(nacti_analyzu_pro_vypocet(analyza_id))
+
+def spocitej_wsm(analyza) -> Dict:
+    """Výpočet pro vypocitej_wsm nad řádkem analýzy (oprávnění ověřil volající)."""
+    ulozeny = Cache_vysledku.nacti_z_cache(analyza, "wsm_detail")
+    if ulozeny is not None:
+        return ulozeny
+
+    matice, typy_kriterii, varianty, kriteria, vahy = Vypocetni_jadro.priprav_data_z_json(Uloziste_analyz.nacti_matici(analyza))
+    if not varianty or not kriteria:
+        raise ValueError("Analýza neobsahuje žádné varianty nebo kritéria.")
+
+    vysledek = Vypocetni_jadro.vypocitej_wsm(matice, typy_kriterii, vahy, varianty,
+                                             max_variant_detailu=MAX_VARIANT_DETAILU)
+    vysledek.update(varianty=varianty, kriteria=kriteria,
+                    typy_kriterii=typy_kriterii, vahy=vahy.tolist())
+    Cache_vysledku.uloz_do_cache(analyza, "wsm_detail", vysledek)
+
+    zapsat_info(f"Vypočten WSM pro analýzu {analyza.get_id()}")
+    return vysledek
+
+@anvil.server.callable
+@handle_errors
+def vypocitej_topsis(analyza_id: str) -> Dict:
+    """
+    Vypočítá kompletní výsledek TOPSIS pro zobrazení ve Vystup_topsis_komp
+    (vektorová normalizace, ideál a anti-ideál podle směru kritérií, vzdálenosti).
+
+    Args:
+        analyza_id: ID analýzy
+
+    Returns:
+        Dict: Výsledek Vypocetni_jadro.vypocitej_topsis doplněný o 'varianty',
+              'kriteria', 'typy_kriterii' a 'vahy'; normalizovaná a vážená matice
+              jsou v 'detail' jen pro MAX_VARIANT_DETAILU nejlepších variant
+    """
+    return spocitej_topsis(nacti_analyzu_pro_vypocet(analyza_id))
+
+def spocitej_topsis(analyza) -> Dict:
+    """Výpočet pro vypocitej_topsis nad řádkem analýzy (oprávnění ověřil volající)."""
+    ulozeny = Cache_vysledku.nacti_z_cache(analyza, "topsis_detail")
+    if ulozeny is not None:
+        return ulozeny
+
+    matice, typy_kriterii, varianty, kriteria, vahy = Vypocetni_jadro.priprav_data_z_json(Uloziste_analyz.nacti_matici(analyza))
+    if not varianty or not kriteria:
+        raise ValueError("Analýza neobsahuje žádné varianty nebo kritéria.")
+
+    vysledek = Vypocetni_jadro.vypocitej_topsis(matice, typy_kriterii, vahy, varianty, kriteria,
+                                                max_variant_detailu=MAX_VARIANT_DETAILU)
+    vysledek.update(varianty=varianty, kriteria=kriteria,
+                    typy_kriterii=typy_kriterii, vahy=vahy.tolist())
+    Cache_vysledku.uloz_do_cache(analyza, "topsis_detail", vysledek)
+
+    zapsat_info(f"Vypočten TOPSIS pro analýzu {analyza.get_id()}")
+    return vysledek
+
+@anvil.server.callable
+@handle_errors
+def vypocitej_mabac(analyza_id: str) -> Dict:
+    """
+    Vypočítá kompletní výsledek MABAC pro zobrazení ve Vystup_mabac_komp
+    (min-max normalizace, hranice aproximační oblasti, vzdálenosti variant).
+
+    Args:
+        analyza_id: ID analýzy
+
+    Returns:
+        Dict: Výsledek Vypocetni_jadro.vypocitej_mabac doplněný o 'varianty',
+              'kriteria', 'typy_kriterii' a 'vahy'; normalizovaná, vážená matice
+              a matice vzdáleností jsou v 'detail' jen pro nejlepší varianty
+    """
+    return spocitej_mabac(nacti_analyzu_pro_vypocet(analyza_id))
+
+def spocitej_mabac(analyza) -> Dict:
+    """Výpočet pro vypocitej_mabac nad řádkem analýzy (oprávnění ověřil volající)."""
+    ulozeny = Cache_vysledku.nacti_z_cache(analyza, "mabac_detail")
+    if ulozeny is not None:
+        return ulozeny
+
+    matice, typy_kriterii, varianty, kriteria, vahy = Vypocetni_jadro.priprav_data_z_json(Uloziste_analyz.nacti_matici(analyza))
+    if not varianty or not kriteria:
+        raise ValueError("Analýza neobsahuje žádné varianty nebo kritéria.")
+
+    vysledek = Vypocetni_jadro.vypocitej_mabac(matice, typy_kriterii, vahy, varianty, kriteria,
+                                               max_variant_detailu=MAX_VARIANT_DETAILU)
+    vysledek.update(varianty=varianty, kriteria=kriteria,
+                    typy_kriterii=typy_kriterii, vahy=vahy.tolist())
+    Cache_vysledku.uloz_do_cache(analyza, "mabac_detail", vysledek)
+
+    zapsat_info(f"Vypočten MABAC pro analýzu {analyza.get_id()}")
+    return vysledek
+
+@anvil.server.callable
+@handle_errors
+def vypocitej_electre(analyza_id: str, varianta_metody: str = "I",
+                      parametry: Optional[Dict] = None) -> Dict:
+    """
+    Vypočítá relaci převyšování metodou ELECTRE I nebo ELECTRE III.
+
+    Args:
+        analyza_id: ID analýzy
+        varianta_metody: "I" nebo "III"
+        parametry: Prahy metody - pro ELECTRE I 'prah_souhlasu' a 'prah_nesouhlasu',
+                   pro ELECTRE III 'prahy' a 'prah_lambda' (volitelné)
+
+    Returns:
+        Dict: Výsledek modulu Electre doplněný o 'typy_kriterii' a 'vahy'.
+              'detail' obsahuje matici převyšování mezi MAX_VARIANT_DETAILU
+              nejlepšími variantami. Graf (CSR) a jádro se vrací jen do
+              MAX_HRAN_GRAFU hran, jinak je jádro None.
+    """
+    return spocitej_electre(nacti_analyzu_pro_vypocet(analyza_id), varianta_metody, parametry)
+
+def spocitej_electre(analyza, varianta_metody: str = "I", parametry: Optional[Dict] = None) -> Dict:
+    """Výpočet pro vypocitej_electre nad řádkem analýzy (oprávnění ověřil volající)."""
+    varianta_metody = str(varianta_metody).upper()
+    if varianta_metody not in ("I", "III"):
+        raise ValueError(f"Neznámá varianta metody ELECTRE: {varianta_metody}")
+
+    parametry = dict(parametry or {})
+    nezname = set(parametry) - set(PARAMETRY_ELECTRE[varianta_metody])
+    if nezname:
+        raise ValueError(f"Neznámé parametry ELECTRE {varianta_metody}: {', '.join(sorted(nezname))}")
+
+    klic_cache = {'varianta': varianta_metody, 'parametry': parametry}
+
+    ulozeny = Cache_vysledku.nacti_z_cache(analyza, "electre", klic_cache)
+    if ulozeny is not None:
+        return ulozeny
+
+    matice, typy_kriterii, varianty, kriteria, vahy = Vypocetni_jadro.priprav_data_z_json(Uloziste_analyz.nacti_matici(analyza))
+    if not varianty or not kriteria:
+        raise ValueError("Analýza neobsahuje žádné varianty nebo kritéria.")
+
+    # Graf se ukládá jen do MAX_HRAN_GRAFU hran, detail jen pro nejlepší varianty
+    omezeni = {'max_hran': MAX_HRAN_GRAFU, 'max_variant_detailu': MAX_VARIANT_DETAILU}
+    if varianta_metody == "I":
+        vysledek = Electre.vypocitej_electre_i(matice, typy_kriterii, vahy, varianty, kriteria,
+                                               **parametry, **omezeni)
+    else:
+        vysledek = Electre.vypocitej_electre_iii(matice, typy_kriterii, vahy, varianty, kriteria,
+                                                 **parametry, **omezeni)
+    vysledek.update(typy_kriterii=typy_kriterii, vahy=vahy.tolist())
+
+    Cache_vysledku.uloz_do_cache(analyza, "electre", vysledek, klic_cache)
+    zapsat_info(f"Vypočten ELECTRE {varianta_metody} pro analýzu {analyza.get_id()} "
+                f"({vysledek['pocet_hran']} hran převyšování)")
+    return vysledek
+
+@anvil.server.callable
+@handle_errors
+def vypocitej_robustnost(analyza_id: str, metoda: str = "wsm", pocet_vzorku: int = 100000,
+                         koncentrace: float = 100.0, max_poradi: int = 10,
+                         pocet_procesu: int = 1, seed: Optional[int] = 0) -> Dict:
+    """
+    Vypočítá Monte Carlo indexy akceptovatelnosti pořadí při náhodné změně vah.
+
+    Args:
+        analyza_id: ID analýzy
+        metoda: Kód metody ("wsm", "saw" nebo "wpm")
+        pocet_vzorku: Počet vzorků vah (max. MAX_POCET_VZORKU)
+        koncentrace: Koncentrační parametr Dirichletova rozdělení kolem uložených vah
+        max_poradi: Počet sledovaných pořadí
+        pocet_procesu: Počet procesů pro paralelní výpočet (výsledek na něm nezávisí)
+        seed: Seed generátoru (stejné parametry dávají stejný, cachovatelný výsledek)
+
+    Returns:
+        Dict: Výsledek Robustnost.vypocitej_robustnost
+    """
+    return spocitej_robustnost(nacti_analyzu_pro_vypocet(analyza_id), metoda, pocet_vzorku,
+                               koncentrace, max_poradi, pocet_procesu, seed)
+
+def spocitej_robustnost(analyza, metoda: str = "wsm", pocet_vzorku: int = 100000,
+                        koncentrace: float = 100.0, max_poradi: int = 10,
+                        pocet_procesu: int = 1, seed: Optional[int] = 0, pri_prubehu=None) -> Dict:
+    """
+    Výpočet pro vypocitej_robustnost nad řádkem analýzy (oprávnění ověřil volající).
+    Úloha na pozadí předává pri_prubehu(zpracovano, celkem) pro hlášení průběhu.
+    """
+    if pocet_vzorku > MAX_POCET_VZORKU:
+        raise ValueError(f"Maximální počet vzorků je {MAX_POCET_VZORKU}.")
+
+    parametry = {'metoda': metoda, 'pocet_vzorku': pocet_vzorku, 'koncentrace': koncentrace,
+                 'max_poradi': max_poradi, 'seed': seed}
+
+    ulozeny = Cache_vysledku.nacti_z_cache(analyza, "robustnost", parametry) if seed is not None else None
+    if ulozeny is not None:
+        return ulozeny
+
+    matice, typy_kriterii, varianty, kriteria, vahy = Vypocetni_jadro.priprav_data_z_json(Uloziste_analyz.nacti_matici(analyza))
+    vysledek = Robustnost.vypocitej_robustnost(
+        matice, typy_kriterii, vahy, varianty, metoda, pocet_vzorku,
+        koncentrace, max_poradi, pocet_procesu, seed, pri_prubehu)
+
+    if seed is not None:
+        Cache_vysledku.uloz_do_cache(analyza, "robustnost", vysledek, parametry)
+
+    zapsat_info(f"Vypočtena robustnost ({pocet_vzorku} vzorků) pro analýzu {analyza.get_id()}")
+    return vysledek
@@ -0,0 +1,18 @@
+# -------------------------------------------------------
+# Testy serverových modulů mimo prostředí Anvilu.
+#
+# Anvil spojuje server_code a client_code do jednoho balíčku aplikace
+# (serverové moduly importují klientské přes "from . import X").
+# Balíček "aplikace" proto skládáme ze stejných dvou adresářů.
+# Vyžaduje numpy a anvil-uplink (moduly anvil, anvil.server, anvil.tables).
+# -------------------------------------------------------
+import pathlib
+import sys
+import types
+
+KOREN = pathlib.Path(__file__).resolve().parents[1]
+
+if "aplikace" not in sys.modules:
+    aplikace = types.ModuleType("aplikace")
+    aplikace.__path__ = [str(KOREN / "server_code"), str(KOREN / "client_code")]
+    sys.modules["aplikace"] = aplikace
@@ -0,0 +1,23 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("anvil.server")
+
+from aplikace import Vypocetni_jadro
+
+VAHY = [0.4, 0.3, 0.2, 0.1]
+KRITERIA = ["a", "b", "c", "d"]
+
+
+@pytest.mark.parametrize("max_prvku_bloku", [1, 1000, Vypocetni_jadro.MAX_PRVKU_BLOKU])
+def test_vysledek_nezavisi_na_velikosti_bloku(max_prvku_bloku):
+    norm = np.random.default_rng(3).random((300, len(VAHY)))
+    varianty = [f"V{i}" for i in range(len(norm))]
+
+    bez_bloku = Vypocetni_jadro.vypocitej_body_zlomu(norm, VAHY, varianty, KRITERIA, max_prvku_bloku=10 ** 9,
+                                                     max_bodu=200)
+    po_blocich = Vypocetni_jadro.vypocitej_body_zlomu(norm, VAHY, varianty, KRITERIA,
+                                                      max_prvku_bloku=max_prvku_bloku, max_bodu=200)
+
+    assert po_blocich == bez_bloku
+    assert all(len(kriterium['body_zlomu']) == 200 for kriterium in po_blocich)
@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("anvil.server")
+
+from aplikace import Vypocty_analyzy
+
+DATA = {
+    "popis_analyzy": "",
+    "kriteria": {"cena": {"typ": "min", "vaha": 0.6}, "kvalita": {"typ": "max", "vaha": 0.4}},
+    "varianty": {f"V{i}": {"popis_varianty": "", "cena": 100 + i, "kvalita": i % 10} for i in range(50)}
+}
+
+
+@pytest.fixture
+def analyza(monkeypatch):
+    analyza = {"id": "[1]"}
+    monkeypatch.setattr(Vypocty_analyzy, "nacti_analyzu_pro_vypocet", lambda analyza_id: analyza)
+    monkeypatch.setattr(Vypocty_analyzy.Cache_vysledku, "nacti_z_cache", lambda *args: None)
+    monkeypatch.setattr(Vypocty_analyzy.Cache_vysledku, "uloz_do_cache", lambda *args: None)
+    monkeypatch.setattr(Vypocty_analyzy.Uloziste_analyz, "nacti_matici", lambda radek: DATA)
+    return analyza
+
+
+@pytest.mark.parametrize("kriteria_indexy", [[2], [-1], [0, 0], ["0"], [True], []])
+def test_neplatne_indexy_kriterii(analyza, kriteria_indexy):
+    with pytest.raises(ValueError, match="kritéri"):
+        Vypocty_analyzy.vypocitej_citlivost_kriterii("[1]", kriteria_indexy, 11)
+
+
+@pytest.mark.parametrize("pocet_kroku", [0, 1, 1.5, Vypocty_analyzy.MAX_POCET_KROKU_CITLIVOSTI + 1])
+def test_neplatny_pocet_kroku(analyza, pocet_kroku):
+    with pytest.raises(ValueError, match="Počet kroků"):
+        Vypocty_analyzy.vypocitej_citlivost_kriterii("[1]", [0], pocet_kroku)
+
+
+def test_velikost_vysledku_je_omezena(analyza, monkeypatch):
+    monkeypatch.setattr(Vypocty_analyzy, "MAX_PRVKU_CITLIVOSTI", 2 * 11 * 50 - 1)
+    assert len(Vypocty_analyzy.vypocitej_citlivost_kriterii("[1]", [1], 11)["analyzy"]) == 1
+    with pytest.raises(ValueError, match="hodnot"):
+        Vypocty_analyzy.vypocitej_citlivost_kriterii("[1]", None, 11)
@@ -0,0 +1,74 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("anvil.server")
+
+from aplikace import Electre
+
+KRITERIA = ["K1", "K2"]
+
+
+def _nahodna_analyza(pocet_variant=60, pocet_kriterii=4, seed=1):
+    generator = np.random.default_rng(seed)
+    matice = generator.random((pocet_variant, pocet_kriterii))
+    typy = ["max", "min"] * (pocet_kriterii // 2)
+    vahy = generator.random(pocet_kriterii) + 0.1
+    varianty = [f"V{i}" for i in range(pocet_variant)]
+    kriteria = [f"K{j}" for j in range(pocet_kriterii)]
+    return matice, typy, vahy, varianty, kriteria
+
+
+def test_electre_iii_ostry_prah_souhlasu():
+    # q == p: dílčí souhlas je 1 do převahy q a nad ní 0, ne lineární rampa
+    vysledek = Electre.vypocitej_electre_iii(
+        [[0.0], [0.95], [1.0]], ["max"], [1.0], ["A", "B", "C"], ["K1"],
+        prahy={'indiference': 0.1, 'preference': 0.1, 'veto': 1.0})
+
+    assert vysledek['detail']['varianty'] == ["B", "C", "A"]
+    assert vysledek['detail']['prevysovani'] == [[0, 1, 1],
+                                                 [1, 0, 1],
+                                                 [0, 0, 0]]
+    assert vysledek['sila'] == [0.0, 2.0, 2.0]
+    assert vysledek['slabost'] == [2.0, 1.0, 1.0]
+
+
+def test_electre_iii_ostre_veto():
+    # v == p: převaha nad v je úplné veto, pod ní žádný nesouhlas
+    vysledek = Electre.vypocitej_electre_iii(
+        [[1.0, 0.0], [0.0, 1.0]], ["max", "max"], [0.9, 0.1], ["A", "B"], KRITERIA,
+        prahy={'indiference': 0.5, 'preference': 0.5, 'veto': 0.5})
+
+    assert vysledek['pocet_hran'] == 0
+    assert vysledek['sila'] == [0.0, 0.0]
+
+
+def test_electre_omezeni_hran_zachova_pocty_a_detail():
+    matice, typy, vahy, varianty, kriteria = _nahodna_analyza()
+    for vypocet, parametry in ((Electre.vypocitej_electre_i, {'prah_souhlasu': 0.5}),
+                               (Electre.vypocitej_electre_iii, {'prah_lambda': 0.5})):
+        uplny = vypocet(matice, typy, vahy, varianty, kriteria, max_variant_detailu=10,
+                        max_prvku_bloku=500, **parametry)
+        omezeny = vypocet(matice, typy, vahy, varianty, kriteria, max_hran=5,
+                          max_variant_detailu=10, max_prvku_bloku=500, **parametry)
+
+        assert uplny['pocet_hran'] > 5
+        assert 'graf' in uplny and 'graf' not in omezeny
+        assert omezeny['jadro'] is None and omezeny['v_cyklu'] is None
+        for klic in ('pocet_hran', 'pocet_prevysovanych', 'pocet_prevysujicich', 'results', 'detail'):
+            assert omezeny[klic] == uplny[klic]
+
+
+def test_electre_detail_odpovida_grafu():
+    matice, typy, vahy, varianty, kriteria = _nahodna_analyza()
+    vysledek = Electre.vypocitej_electre_i(matice, typy, vahy, varianty, kriteria,
+                                           prah_souhlasu=0.5, max_variant_detailu=10,
+                                           max_prvku_bloku=500)
+
+    odkazy, cile = vysledek['graf']['odkazy'], vysledek['graf']['cile']
+    assert len(cile) == vysledek['pocet_hran']
+    index_variant = {nazev: i for i, nazev in enumerate(varianty)}
+    indexy = [index_variant[nazev] for nazev in vysledek['detail']['varianty']]
+    assert indexy == [index_variant[r[0]] for r in vysledek['results'][:10]]
+    for k, i in enumerate(indexy):
+        hrany = set(cile[odkazy[i]:odkazy[i + 1]])
+        assert vysledek['detail']['prevysovani'][k] == [int(j in hrany) for j in indexy]
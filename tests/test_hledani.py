@@ -0,0 +1,31 @@
+import re
+
+import pytest
+
+pytest.importorskip("anvil.server")
+pytest.importorskip("anvil.users")
+
+from aplikace import Sprava_uzivatelu
+
+
+def _odpovida(vzor, text):
+    """ILIKE se zpětným lomítkem jako escape znakem (výchozí chování PostgreSQL)."""
+    regex = ""
+    for escapovany, znak in re.findall(r"\\(.)|(.)", vzor, re.S):
+        if escapovany:
+            regex += re.escape(escapovany)
+        else:
+            regex += {"%": ".*", "_": "."}.get(znak, re.escape(znak))
+    return re.fullmatch(regex, text, re.S | re.I) is not None
+
+
+@pytest.mark.parametrize("hledany, nazev, nalezen", [
+    ("50%", "Sleva 50% na vše", True),
+    ("50%", "Sleva 500 Kč", False),
+    ("a_b", "Projekt A_B", True),
+    ("a_b", "Projekt AxB", False),
+    ("c:\\data", "Import C:\\DATA", True),
+    ("dodavatel", "Výběr dodavatele", True),
+])
+def test_zastupne_znaky_se_hledaji_doslova(hledany, nazev, nalezen):
+    assert _odpovida(Sprava_uzivatelu.vzor_hledani_nazvu(hledany), nazev) is nalezen
@@ -0,0 +1,209 @@
+import itertools
+
+import pytest
+
+pytest.importorskip("anvil.server")
+pytest.importorskip("anvil.users")
+
+import anvil.tables
+import anvil.users
+
+from aplikace import Cache_vysledku, CRUD_analyzy, Matice_analyzy, Uloziste_analyz
+
+DATA = {
+    "popis_analyzy": "Výběr dodavatele",
+    "kriteria": {
+        "cena": {"typ": "min", "vaha": 0.6},
+        "kvalita": {"typ": "max", "vaha": 0.4}
+    },
+    "varianty": {
+        "A": {"popis_varianty": "", "cena": 100, "kvalita": 7},
+        "B": {"popis_varianty": "", "cena": 120, "kvalita": 9}
+    }
+}
+
+
+class _Transakce:
+    """Náhrada anvil.tables.Transaction, počítá vnoření transakcí."""
+    hloubka = 0
+
+    def __init__(self, relaxed=None):
+        pass
+
+    def __enter__(self):
+        _Transakce.hloubka += 1
+        return self
+
+    def __exit__(self, *exc):
+        _Transakce.hloubka -= 1
+        return False
+
+
+def _v_transakci():
+    assert _Transakce.hloubka > 0, "zápis do tabulky mimo transakci"
+
+
+class _Radek:
+    """Řádek tabulky v paměti, rovnost podle identity jako u řádků Anvilu."""
+    _id = itertools.count(1)
+
+    def __init__(self, tabulka, sloupce):
+        self._tabulka = tabulka
+        self._sloupce = dict(sloupce)
+        self._id_radku = f"[{next(self._id)}]"
+
+    def get_id(self):
+        return self._id_radku
+
+    def __getitem__(self, sloupec):
+        return self._sloupce.get(sloupec)
+
+    def get(self, sloupec, vychozi=None):
+        return self._sloupce.get(sloupec, vychozi)
+
+    def refresh(self):
+        pass
+
+    def __setitem__(self, sloupec, hodnota):
+        self.update(**{sloupec: hodnota})
+
+    def update(self, **sloupce):
+        _v_transakci()
+        self._sloupce.update(sloupce)
+
+    def delete(self):
+        _v_transakci()
+        self._tabulka.radky.remove(self)
+
+
+class _Tabulka:
+    """Tabulka v paměti s podmnožinou API app_tables, kterou moduly používají."""
+
+    def __init__(self):
+        self.radky = []
+
+    def add_row(self, **sloupce):
+        _v_transakci()
+        radek = _Radek(self, sloupce)
+        self.radky.append(radek)
+        return radek
+
+    def get_by_id(self, id_radku, *fetch):
+        return next((r for r in self.radky if r.get_id() == id_radku), None)
+
+    def search(self, *fetch, **podminky):
+        return [r for r in self.radky
+                if all(r[sloupec] == hodnota for sloupec, hodnota in podminky.items())]
+
+    def get(self, **podminky):
+        return next(iter(self.search(**podminky)), None)
+
+
+@pytest.fixture
+def tabulky(monkeypatch):
+    app_tables = type("AppTables", (), {})()
+    app_tables.analyzy = _Tabulka()
+    app_tables.sdilena_data = _Tabulka()
+    app_tables.vysledky = _Tabulka()
+    for modul in (CRUD_analyzy, Uloziste_analyz, Cache_vysledku):
+        monkeypatch.setattr(modul, "app_tables", app_tables)
+
+    uzivatel = _Radek(_Tabulka(), {"email": "uzivatel@example.com", "role": "user"})
+    monkeypatch.setattr(anvil.users, "get_user", lambda: uzivatel)
+    monkeypatch.setattr(anvil.tables, "Transaction", _Transakce)
+    return app_tables
+
+
+def test_klon_po_smazani_puvodni_analyzy(tabulky):
+    puvodni_id = CRUD_analyzy.vytvor_analyzu_s_daty("Dodavatelé", DATA)["id"]
+    upraveny_id = CRUD_analyzy.klonuj_analyzu(puvodni_id)
+    nezmeneny_id = CRUD_analyzy.klonuj_analyzu(puvodni_id)
+    assert len(tabulky.sdilena_data.radky) == 1
+
+    # Úprava klonu mu vytvoří vlastní kopii dat, ostatní analýzy dál sdílí původní
+    novy_hash = CRUD_analyzy.uprav_analyzu_zmenami(upraveny_id, [
+        {"operace": "nastav_hodnotu", "varianta": "A", "kriterium": "cena", "hodnota": 90}
+    ])
+    assert novy_hash == tabulky.analyzy.get_by_id(upraveny_id)["hash_dat"]
+    assert tabulky.analyzy.get_by_id(upraveny_id)["sdilena_data"] is None
+
+    assert CRUD_analyzy.smaz_analyzu(puvodni_id) is True
+
+    upraveny = CRUD_analyzy.nacti_analyzu(upraveny_id)
+    assert upraveny["varianty"]["A"]["cena"] == 90
+    nezmeneny = CRUD_analyzy.nacti_analyzu(nezmeneny_id)
+    assert nezmeneny["varianty"]["A"]["cena"] == 100
+    assert nezmeneny["kriteria"] == DATA["kriteria"]
+
+    # Po smazání posledního klonu se sdílená data uvolní
+    CRUD_analyzy.smaz_analyzu(nezmeneny_id)
+    assert tabulky.sdilena_data.radky == []
+
+
+def test_uprava_a_mazani_bezi_v_transakci(tabulky):
+    analyza_id = CRUD_analyzy.vytvor_analyzu_s_daty("Dodavatelé", DATA)["id"]
+    CRUD_analyzy.uprav_analyzu(analyza_id, "Dodavatelé 2026", DATA)
+    CRUD_analyzy.smaz_analyzu(analyza_id)
+    assert tabulky.analyzy.radky == []
+
+
+def test_cache_snese_duplicitni_zaznamy(tabulky):
+    analyza_id = CRUD_analyzy.vytvor_analyzu_s_daty("Dodavatelé", DATA)["id"]
+    analyza = tabulky.analyzy.get_by_id(analyza_id)
+
+    # Dva souběžné zápisy starší verze mohly vložit stejný klíč dvakrát
+    Cache_vysledku.uloz_do_cache(analyza, "wsm", {"nejlepsi_varianta": "A"})
+    with _Transakce():
+        tabulky.vysledky.add_row(**dict(tabulky.vysledky.radky[0]._sloupce))
+    assert Cache_vysledku.nacti_z_cache(analyza, "wsm") == {"nejlepsi_varianta": "A"}
+
+    Cache_vysledku.uloz_do_cache(analyza, "wsm", {"nejlepsi_varianta": "B"})
+    assert len(tabulky.vysledky.radky) == 1
+    assert Cache_vysledku.nacti_z_cache(analyza, "wsm") == {"nejlepsi_varianta": "B"}
+    assert analyza["posledni_vitez"] == "B"
+
+
+def test_nacteni_prevede_stara_data_v_transakci(tabulky, monkeypatch):
+    vlastnik = anvil.users.get_user()
+    with _Transakce():
+        analyza = tabulky.analyzy.add_row(nazev="Stará", uzivatel=vlastnik, data_json=DATA, hash_dat=None)
+
+    # Cizí uživatel analýzu nenačte a převod nespustí
+    cizi = _Radek(_Tabulka(), {"email": "cizi@example.com", "role": "user"})
+    monkeypatch.setattr(anvil.users, "get_user", lambda: cizi)
+    with pytest.raises(ValueError, match="oprávnění"):
+        CRUD_analyzy.nacti_analyzu(analyza.get_id())
+    assert analyza["data_json"] == DATA
+
+    monkeypatch.setattr(anvil.users, "get_user", lambda: vlastnik)
+    nacti_matici = Uloziste_analyz.nacti_matici
+    hloubky = []
+
+    def nacti_matici_v_transakci(radek):
+        hloubky.append(_Transakce.hloubka)
+        return nacti_matici(radek)
+
+    monkeypatch.setattr(Uloziste_analyz, "nacti_matici", nacti_matici_v_transakci)
+    nactena = CRUD_analyzy.nacti_analyzu(analyza.get_id())
+    assert hloubky == [1]
+    assert nactena["varianty"]["B"]["kvalita"] == 9
+    assert Uloziste_analyz.je_sloupcovy_format(analyza["data_json"])
+    assert analyza["hash_dat"] == Cache_vysledku.vypocitej_hash_dat(analyza["data_json"])
+
+
+def test_matice_eviduje_chybejici_hodnoty():
+    matice = Matice_analyzy.Matice_analyzy.z_json({
+        "kriteria": DATA["kriteria"],
+        "varianty": {"A": {"popis_varianty": "", "cena": 100}, "B": {"popis_varianty": ""}}
+    })
+    assert matice.chybejici == ((0, 1), (1, 0), (1, 1))
+
+    matice.nastav_hodnotu(1, 0, 90)
+    matice.pridej_variantu("C")
+    matice.odeber_kriterium(0)
+    assert matice.chybejici == ((0, 0), (1, 0), (2, 0))
+    assert not matice.je_chybejici(0, 1)
+
+    matice.nastav_hodnotu(1, 0, 8)
+    assert matice.do_json()["varianty"]["B"] == {"popis_varianty": "", "kvalita": 8}
+    assert Matice_analyzy.Matice_analyzy.z_json(matice.do_json()).chybejici == ((0, 0), (2, 0))
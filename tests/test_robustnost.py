@@ -0,0 +1,53 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("anvil.server")
+
+from aplikace import Robustnost
+
+MATICE = [[7.0, 100.0, 3.0], [9.0, 120.0, 2.0], [6.0, 90.0, 4.0], [8.0, 110.0, 3.0]]
+TYPY = ["max", "min", "max"]
+VAHY = [0.5, 0.3, 0.2]
+VARIANTY = ["A", "B", "C", "D"]
+
+
+@pytest.mark.parametrize("metoda", ["wsm", "wpm"])
+def test_vysledek_nezavisi_na_poctu_procesu(monkeypatch, metoda):
+    # I na jednojádrovém stroji chceme projít větev s procesovým poolem
+    monkeypatch.setattr(Robustnost.os, "cpu_count", lambda: 4)
+    pocet_vzorku = 2 * Robustnost.VELIKOST_DAVKY + 500
+
+    vysledky = [Robustnost.vypocitej_robustnost(MATICE, TYPY, VAHY, VARIANTY, metoda, pocet_vzorku,
+                                                koncentrace=20.0, pocet_procesu=pocet_procesu, seed=7)
+                for pocet_procesu in (1, 2, 3)]
+
+    assert vysledky[0]['akceptovatelnost_poradi'] == vysledky[1]['akceptovatelnost_poradi']
+    assert vysledky[0]['akceptovatelnost_poradi'] == vysledky[2]['akceptovatelnost_poradi']
+    assert sum(vysledky[0]['prvni_misto']) == pytest.approx(1.0)
+
+
+def test_prubeh_hlasi_vsechny_vzorky():
+    hlaseni = []
+    pocet_vzorku = Robustnost.VELIKOST_DAVKY + 1
+    Robustnost.vypocitej_robustnost(MATICE, TYPY, VAHY, VARIANTY, pocet_vzorku=pocet_vzorku, seed=1,
+                                    pri_prubehu=lambda zpracovano, celkem: hlaseni.append((zpracovano, celkem)))
+    assert hlaseni == [(Robustnost.VELIKOST_DAVKY, pocet_vzorku), (pocet_vzorku, pocet_vzorku)]
+
+
+def test_velikost_davky_podle_poctu_variant(monkeypatch):
+    monkeypatch.setattr(Robustnost, "MAX_PRVKU_DAVKY", 1000)
+    assert Robustnost._velikost_davky(4) == 250
+    assert Robustnost._velikost_davky(5000) == 1
+
+    hlaseni = []
+    Robustnost.vypocitej_robustnost(MATICE, TYPY, VAHY, VARIANTY, pocet_vzorku=600, seed=1,
+                                    pri_prubehu=lambda zpracovano, celkem: hlaseni.append(zpracovano))
+    assert hlaseni == [250, 500, 600]
+
+
+def test_nejlepsi_varianty_shodne_s_celym_poradim():
+    # Opakované hodnoty vytváří shody i na hranici výběru
+    skore = np.random.default_rng(5).integers(0, 4, size=(2000, 9)).astype(float)
+    for pocet in (1, 3, 8, 9):
+        assert np.array_equal(Robustnost._nejlepsi_varianty(skore, pocet),
+                              np.argsort(-skore, axis=1, kind="stable")[:, :pocet])
@@ -0,0 +1,78 @@
+import pytest
+
+pytest.importorskip("anvil.server")
+pytest.importorskip("anvil.users")
+
+import anvil.server
+import anvil.users
+
+from aplikace import Ulohy_vypoctu
+
+
+class _Uzivatel(dict):
+    def __init__(self, id_uzivatele, role="user"):
+        super().__init__(role=role)
+        self._id = id_uzivatele
+
+    def get_id(self):
+        return self._id
+
+
+class _Uloha:
+    def __init__(self):
+        self.ukonceni = None
+
+    def get_id(self):
+        return "uloha-1"
+
+    def get_state(self):
+        return {'faze': Ulohy_vypoctu.FAZE_VYPOCET}
+
+    def get_termination_status(self):
+        return self.ukonceni
+
+    def get_return_value(self):
+        return {'hotovo': True}
+
+
+@pytest.fixture
+def uloha(monkeypatch):
+    uloha = _Uloha()
+    dotazy = []
+    vlastnik = _Uzivatel("[1]")
+    monkeypatch.setattr(anvil.server, "session", {}, raising=False)
+    monkeypatch.setattr(anvil.server, "launch_background_task", lambda nazev, *args: uloha, raising=False)
+    monkeypatch.setattr(anvil.server, "get_background_task",
+                        lambda id_ulohy: dotazy.append(id_ulohy) or uloha, raising=False)
+    monkeypatch.setattr(anvil.users, "get_user", lambda: vlastnik)
+    monkeypatch.setattr(Ulohy_vypoctu, "ULOHY_VE_VLAKNECH", False)
+    monkeypatch.setattr(Ulohy_vypoctu.Vypocty_analyzy, "nacti_analyzu_pro_vypocet",
+                        lambda analyza_id: {"pocet_variant": 10 ** 6, "pocet_kriterii": 10})
+
+    assert Ulohy_vypoctu.spust_ulohu_vypoctu('topsis', "[5]")['id'] == "uloha-1"
+    uloha.dotazy = dotazy
+    return uloha
+
+
+def test_stav_vidi_jen_vlastnik(uloha, monkeypatch):
+    assert Ulohy_vypoctu.stav_ulohy_vypoctu("uloha-1")['stav'] == Ulohy_vypoctu.STAV_BEZI
+
+    # Cizí uživatel ani s platným ID úlohy (jiná relace) stav nedostane
+    monkeypatch.setattr(anvil.server, "session", {}, raising=False)
+    monkeypatch.setattr(anvil.users, "get_user", lambda: _Uzivatel("[2]"))
+    with pytest.raises(ValueError, match="oprávnění"):
+        Ulohy_vypoctu.stav_ulohy_vypoctu("uloha-1")
+    assert uloha.dotazy == ["uloha-1"]
+
+
+def test_neznama_uloha_se_neotevre(uloha):
+    with pytest.raises(ValueError, match="oprávnění"):
+        Ulohy_vypoctu.stav_ulohy_vypoctu("cizi-uloha")
+    assert "cizi-uloha" not in uloha.dotazy
+
+
+def test_dokoncena_uloha_se_z_relace_odebere(uloha):
+    uloha.ukonceni = 'completed'
+    assert Ulohy_vypoctu.stav_ulohy_vypoctu("uloha-1") == {'stav': Ulohy_vypoctu.STAV_HOTOVO,
+                                                            'vysledek': {'hotovo': True}}
+    assert anvil.server.session[Ulohy_vypoctu.KLIC_ULOH_RELACE] == {}
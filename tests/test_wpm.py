@@ -0,0 +1,46 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("anvil.server")
+
+from aplikace import Vypocetni_jadro
+
+
+def _analyza(varianty, kriteria):
+    return {
+        "popis_analyzy": "",
+        "kriteria": kriteria,
+        "varianty": {nazev: dict(hodnoty, popis_varianty="") for nazev, hodnoty in varianty.items()}
+    }
+
+
+def test_preteceni_skore_radi_podle_logaritmu():
+    # Nejmenší kladné číslo u minimalizačního kritéria dá skóre nad rozsahem float64
+    analyza = _analyza({"A": {"cena": 5e-324}, "B": {"cena": 1.0}, "C": {"cena": 2.0}},
+                       {"cena": {"typ": "min", "vaha": 1.0}})
+
+    wpm = Vypocetni_jadro.vypocitej_metody(analyza, ["wpm"])["metody"]["wpm"]
+
+    assert wpm["skore"] == [None, 1.0, 0.5]
+    assert wpm["poradi"] == [1, 2, 3]
+    assert wpm["nejlepsi_varianta"] == "A"
+    assert wpm["nejlepsi_skore"] is None
+    assert wpm["nejhorsi_skore"] == pytest.approx(0.5)
+    assert all(math.isfinite(hodnota) for hodnota in wpm["log_skore"])
+
+
+def test_politika_nekladnych_hodnot():
+    analyza = _analyza({"A": {"zisk": 0, "cena": 100}, "B": {"zisk": 5, "cena": 120}},
+                       {"zisk": {"typ": "max", "vaha": 0.5}, "cena": {"typ": "min", "vaha": 0.5}})
+
+    nahradit = Vypocetni_jadro.vypocitej_metody(analyza, ["wpm", "wsm"], "nahradit")["metody"]
+    posunout = Vypocetni_jadro.vypocitej_metody(analyza, ["wpm", "wsm"], "posunout")["metody"]
+
+    assert nahradit["wpm"]["log_skore"] != posunout["wpm"]["log_skore"]
+    assert nahradit["wsm"] == posunout["wsm"]
+    with pytest.raises(ValueError):
+        Vypocetni_jadro.vypocitej_metody(analyza, ["wpm"], "chyba")
+    with pytest.raises(ValueError):
+        Vypocetni_jadro.vypocitej_metody(analyza, ["wpm"], "neznama")